@@ -712,6 +712,8 @@ class BrowserUseAgent:
         Uses real timestamps from on_step_start/on_step_end callbacks when available,
         falling back to approximation. Records mixed outcomes for H_C2 improvement.
         """
+        harvested: list[tuple[str, float]] = []
+        outcomes: list[str] = []
         try:
             history = agent.history if hasattr(agent, "history") else None
             if not history:
@@ -742,7 +744,7 @@ class BrowserUseAgent:
                                     action_name = next(iter(d.keys()), "unknown")
                             elif isinstance(act, dict):
                                 action_name = next(iter(act.keys()), "unknown")
-                tracker.record_action(action_name, timestamp=ts)
+                harvested.append((action_name, ts))
 
                 # Extract page visit data from result
                 if hasattr(item, "result") and item.result:
@@ -773,15 +775,22 @@ class BrowserUseAgent:
 
                         # Mixed outcomes for H_C2 (outcome distribution)
                         if has_error:
-                            tracker.record_outcome("failure")
+                            outcomes.append("failure")
                         elif action_name in ("go_to_url", "open_tab"):
-                            tracker.record_outcome("navigation")
+                            outcomes.append("navigation")
                         elif action_name in ("extract_content", "get_text"):
-                            tracker.record_outcome("partial")
+                            outcomes.append("partial")
                         else:
-                            tracker.record_outcome("success")
+                            outcomes.append("success")
         except Exception as e:
             logger.debug(f"History harvest: {e}")
+        finally:
+            # Whatever was harvested before a failure is still recorded
+            try:
+                tracker.record_actions(harvested)
+                tracker.record_outcomes(outcomes)
+            except Exception as e:
+                logger.debug(f"History harvest: {e}")
 
     async def run_parallel(self, tasks: list[str], max_concurrent: int = 5) -> list[dict]:
         """
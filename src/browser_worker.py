@@ -164,21 +164,50 @@ class BrowserWorker:
         self._context = await self._browser.new_context(**context_options)
         self._page = await self._context.new_page()
 
-    async def stop(self) -> None:
-        """Clean up browser resources"""
-        logger.info(f"Worker {self.worker_id}: Stopping browser")
+    async def new_context(
+        self,
+        profile: Optional[BrowserProfile] = None,
+        proxy: Optional[ProxyConfig] = None,
+    ) -> None:
+        """Replace context and page with a fresh one, keeping the browser process"""
+        if not self._browser:
+            raise RuntimeError("Browser not started")
 
+        await self._close_context()
+        self.profile = profile
+        self.proxy = proxy
+
+        context_options = {}
+        if profile:
+            context_options = profile.to_playwright_context()
+        if proxy:
+            context_options["proxy"] = {"server": proxy.get_url()}
+            logger.debug(f"Worker {self.worker_id}: Using proxy {proxy.country}")
+
+        self._context = await self._browser.new_context(**context_options)
+        self._page = await self._context.new_page()
+
+    async def _close_context(self) -> None:
+        """Close current page and context, ignoring errors"""
         try:
             if self._page:
                 await self._page.close()
         except Exception as e:
             logger.debug(f"Worker {self.worker_id}: Page close error (ignored): {e}")
+        self._page = None
 
         try:
             if self._context:
                 await self._context.close()
         except Exception as e:
             logger.debug(f"Worker {self.worker_id}: Context close error (ignored): {e}")
+        self._context = None
+
+    async def stop(self) -> None:
+        """Clean up browser resources"""
+        logger.info(f"Worker {self.worker_id}: Stopping browser")
+
+        await self._close_context()
 
         try:
             if self._browser:
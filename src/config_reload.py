@@ -1,17 +1,25 @@
 """
 Config Hot Reload - Watches .env file for changes and triggers reload actions.
 
-Uses mtime polling (no external dependencies like watchdog).
+Uses OS file notifications (inotify/FSEvents/ReadDirectoryChangesW) through
+watchfiles when it is installed, and mtime polling otherwise.
 """
 from __future__ import annotations
 
 import asyncio
 import os
+import re
 from dataclasses import dataclass, field
 from typing import Any, Callable, Coroutine
 
 from loguru import logger
 
+try:
+    from watchfiles import awatch
+    HAS_WATCHFILES = True
+except ImportError:
+    HAS_WATCHFILES = False
+
 # Reload rules: key prefix -> action type
 RELOAD_RULES: dict[str, str] = {
     "slack": "reload_channels",
@@ -23,6 +31,10 @@ RELOAD_RULES: dict[str, str] = {
     "parallel": "restart_required",
 }
 
+# All prefixes as one anchored alternation; the regex engine tries them in
+# RELOAD_RULES order, so the first matching rule wins as before
+_RULE_PREFIX = re.compile("|".join(map(re.escape, RELOAD_RULES)))
+
 
 @dataclass
 class ReloadPlan:
@@ -38,14 +50,14 @@ def build_reload_plan(changed_keys: list[str]) -> ReloadPlan:
     plan = ReloadPlan(changed_keys=changed_keys)
 
     for key in changed_keys:
-        key_lower = key.lower()
-        for prefix, action in RELOAD_RULES.items():
-            if key_lower.startswith(prefix):
-                if action == "reload_channels":
-                    plan.reload_channels = True
-                elif action == "restart_required":
-                    plan.restart_required = True
-                break
+        match = _RULE_PREFIX.match(key.lower())
+        if match is None:
+            continue
+        action = RELOAD_RULES[match.group()]
+        if action == "reload_channels":
+            plan.reload_channels = True
+        elif action == "restart_required":
+            plan.restart_required = True
 
     return plan
 
@@ -55,9 +67,11 @@ ReloadCallback = Callable[[ReloadPlan], Coroutine[Any, Any, None]]
 
 class ConfigReloader:
     """
-    Watches .env file for changes via mtime polling.
+    Watches .env file for changes via OS file notifications, or mtime
+    polling when watchfiles is unavailable or the watch cannot be set up.
 
     Debounce: 300ms after detecting change before triggering reload.
+    ``poll_interval`` only applies to the polling fallback.
     """
 
     def __init__(
@@ -65,14 +79,18 @@ class ConfigReloader:
         env_path: str = ".env",
         poll_interval: float = 2.0,
         debounce: float = 0.3,
+        use_notify: bool = True,
     ):
         self._env_path = env_path
         self._poll_interval = poll_interval
         self._debounce = debounce
+        self._use_notify = use_notify and HAS_WATCHFILES
         self._last_mtime: float = 0.0
         self._last_values: dict[str, str] = {}
+        self._parse_cache: tuple[tuple[int, int, int], dict[str, str]] | None = None
         self._callbacks: list[ReloadCallback] = []
         self._task: asyncio.Task | None = None
+        self._stop_event: asyncio.Event | None = None
         self._running = False
 
     def on_reload(self, callback: ReloadCallback) -> None:
@@ -84,12 +102,16 @@ class ConfigReloader:
         self._running = True
         self._last_values = self._read_env()
         self._last_mtime = self._get_mtime()
-        self._task = asyncio.create_task(self._poll_loop())
+        self._stop_event = asyncio.Event()
+        loop = self._watch_loop() if self._use_notify else self._poll_loop()
+        self._task = asyncio.create_task(loop)
         logger.info(f"ConfigReloader started: {self._env_path}")
 
     async def stop(self) -> None:
         """Stop watching"""
         self._running = False
+        if self._stop_event:
+            self._stop_event.set()
         if self._task:
             self._task.cancel()
             try:
@@ -107,7 +129,15 @@ class ConfigReloader:
             return 0.0
 
     def _read_env(self) -> dict[str, str]:
-        """Read .env file into a dict"""
+        """Read .env file into a dict (cached by inode, mtime and size; do not mutate)"""
+        try:
+            st = os.stat(self._env_path)
+        except OSError:
+            return {}
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if self._parse_cache is not None and self._parse_cache[0] == stamp:
+            return self._parse_cache[1]
+
         values: dict[str, str] = {}
         try:
             with open(self._env_path, "r") as f:
@@ -119,26 +149,65 @@ class ConfigReloader:
                         key, _, value = line.partition("=")
                         values[key.strip()] = value.strip().strip("\"'")
         except OSError:
-            pass
+            return values
+        self._parse_cache = (stamp, values)
         return values
 
     def _detect_changes(self) -> list[str]:
         """Detect changed keys between old and new values"""
         new_values = self._read_env()
-        changed: list[str] = []
-
-        all_keys = set(self._last_values.keys()) | set(new_values.keys())
-        for key in all_keys:
-            old = self._last_values.get(key, "")
-            new = new_values.get(key, "")
-            if old != new:
-                changed.append(key)
+        old_values = self._last_values
+        if new_values is old_values:
+            return []
+
+        # The items symmetric difference (computed in C) holds every added,
+        # removed or changed pair; a missing key still counts as ""
+        candidates = {key for key, _ in new_values.items() ^ old_values.items()}
+        changed = [
+            key for key in candidates
+            if old_values.get(key, "") != new_values.get(key, "")
+        ]
 
         self._last_values = new_values
         return changed
 
+    async def _apply_changes(self) -> None:
+        """Re-read the env file and run callbacks if any key changed"""
+        self._last_mtime = self._get_mtime()
+        changed = self._detect_changes()
+        if not changed:
+            return
+
+        plan = build_reload_plan(changed)
+        logger.info(f"Config changed: {changed}")
+
+        for callback in self._callbacks:
+            try:
+                await callback(plan)
+            except Exception as e:
+                logger.error(f"Reload callback error: {e}")
+
+    async def _watch_loop(self) -> None:
+        """Wait for file notifications; falls back to polling if unavailable"""
+        target = os.path.abspath(self._env_path)
+        try:
+            # Watch the directory: editors often replace the file by rename
+            async for _ in awatch(
+                os.path.dirname(target),
+                watch_filter=lambda _change, path: path == target,
+                debounce=int(self._debounce * 1000),
+                stop_event=self._stop_event,
+            ):
+                try:
+                    await self._apply_changes()
+                except Exception as e:
+                    logger.error(f"ConfigReloader reload error: {e}")
+        except OSError as e:
+            logger.warning(f"ConfigReloader: file notifications unavailable ({e}), polling")
+            await self._poll_loop()
+
     async def _poll_loop(self) -> None:
-        """Main polling loop"""
+        """Polling fallback loop"""
         while self._running:
             try:
                 await asyncio.sleep(self._poll_interval)
@@ -149,20 +218,7 @@ class ConfigReloader:
 
                 # Debounce
                 await asyncio.sleep(self._debounce)
-                self._last_mtime = self._get_mtime()
-
-                changed = self._detect_changes()
-                if not changed:
-                    continue
-
-                plan = build_reload_plan(changed)
-                logger.info(f"Config changed: {changed}")
-
-                for callback in self._callbacks:
-                    try:
-                        await callback(plan)
-                    except Exception as e:
-                        logger.error(f"Reload callback error: {e}")
+                await self._apply_changes()
 
             except asyncio.CancelledError:
                 break
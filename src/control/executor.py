@@ -12,7 +12,7 @@ from .state_machine import TaskState, StateMachine, StateMachineRegistry
 from ..sense import EventBus, Event
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Task definition"""
     task_id: str
@@ -38,7 +38,7 @@ class Task:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Result of task execution"""
     task_id: str
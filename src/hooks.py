@@ -4,11 +4,17 @@ Hook System - Extension points for the CCP cycle.
 Supports two hook types:
 - Void hooks: fire-and-forget, parallel execution, error-isolated
 - Modifying hooks: sequential execution, payload modification
+
+Handlers may be async or plain functions; a result is only awaited when it
+is awaitable, so plain ones are called without a trip through the event loop.
 """
 from __future__ import annotations
 
 import asyncio
+import bisect
+import sys
 from dataclasses import dataclass, field
+from inspect import isawaitable
 from typing import Any, Callable, Coroutine
 
 from loguru import logger
@@ -26,10 +32,10 @@ BEFORE_CONTROL = "before_control"
 AFTER_CONTROL = "after_control"
 ON_ERROR = "on_error"
 
-HookHandler = Callable[[dict[str, Any]], Coroutine[Any, Any, Any]]
+HookHandler = Callable[[dict[str, Any]], Coroutine[Any, Any, Any] | Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class HookRegistration:
     """A registered hook handler"""
     hook_name: str
@@ -38,6 +44,10 @@ class HookRegistration:
     priority: int = 0
 
 
+def _descending_priority(reg: HookRegistration) -> int:
+    return -reg.priority
+
+
 class HookRunner:
     """
     Manages hook registration and execution.
@@ -58,17 +68,20 @@ class HookRunner:
         priority: int = 0,
     ) -> None:
         """Register a hook handler"""
+        # Interned keys let dispatch lookups with the (compiler-interned)
+        # name constants match by identity
+        hook_name = sys.intern(hook_name)
         reg = HookRegistration(
             hook_name=hook_name,
             handler=handler,
-            plugin_id=plugin_id,
+            plugin_id=sys.intern(plugin_id),
             priority=priority,
         )
-        if hook_name not in self._hooks:
-            self._hooks[hook_name] = []
-        self._hooks[hook_name].append(reg)
-        # Sort by priority (higher first)
-        self._hooks[hook_name].sort(key=lambda r: r.priority, reverse=True)
+        # Keep sorted by priority (higher first); equal priorities stay in
+        # registration order
+        bisect.insort(
+            self._hooks.setdefault(hook_name, []), reg, key=_descending_priority,
+        )
 
     def unregister(self, hook_name: str, handler: HookHandler) -> None:
         """Unregister a hook handler"""
@@ -89,19 +102,28 @@ class HookRunner:
         Run void hooks in parallel.
         Errors are logged but do not propagate.
         """
-        hooks = self._hooks.get(hook_name, [])
+        hooks = self._hooks.get(hook_name)
         if not hooks:
             return
+        if len(hooks) == 1:
+            # Nothing to run concurrently: skip gather's task/future bookkeeping
+            await self._run_void_one(hook_name, hooks[0], event)
+            return
 
-        async def _safe_run(reg: HookRegistration) -> None:
-            try:
-                await reg.handler(event)
-            except Exception as e:
-                logger.error(
-                    f"Hook error [{hook_name}] plugin={reg.plugin_id}: {e}"
-                )
+        await asyncio.gather(*[self._run_void_one(hook_name, r, event) for r in hooks])
 
-        await asyncio.gather(*[_safe_run(r) for r in hooks])
+    @staticmethod
+    async def _run_void_one(
+        hook_name: str, reg: HookRegistration, event: dict[str, Any],
+    ) -> None:
+        try:
+            result = reg.handler(event)
+            if isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(
+                f"Hook error [{hook_name}] plugin={reg.plugin_id}: {e}"
+            )
 
     async def run_modifying(
         self, hook_name: str, event: dict[str, Any],
@@ -114,7 +136,11 @@ class HookRunner:
         current = event
         for reg in hooks:
             try:
-                result = await reg.handler(current)
+                # Only suspend when the handler handed back an awaitable; a
+                # chain of plain functions runs straight through
+                result = reg.handler(current)
+                if isawaitable(result):
+                    result = await result
                 if isinstance(result, dict):
                     current = result
             except Exception as e:
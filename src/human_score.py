@@ -21,11 +21,19 @@ Metric definitions:
   H_C2  Outcome distribution        - Outcomes not concentrated on single type (<= 0.80)
   H_S0  Human score (composite)     - Weighted sum of all above (>= 70 = human)
 """
+import json
 import math
 import time
+from array import array
 from collections import Counter
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterable, Optional
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 
 @dataclass
@@ -49,15 +57,35 @@ class HumanScoreReport:
     max_score: int
     is_human: bool
 
+    # Reports are built once by compute() and not mutated afterwards, so the
+    # rendered forms are cached on first use
+    _summary_cache: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    _str_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
     def summary(self) -> dict:
-        return {
-            "score": self.total_score,
-            "max": self.max_score,
-            "is_human": self.is_human,
-            "metrics": {m.metric_id: {"value": round(m.value, 4), "pass": m.threshold_pass, "points": m.points} for m in self.metrics},
-        }
+        # Fresh dicts each call so callers cannot alter the cached summary
+        cached = self._cached_summary()
+        return {**cached, "metrics": {k: dict(v) for k, v in cached["metrics"].items()}}
+
+    def _cached_summary(self) -> dict:
+        if self._summary_cache is None:
+            self._summary_cache = {
+                "score": self.total_score,
+                "max": self.max_score,
+                "is_human": self.is_human,
+                "metrics": {m.metric_id: {"value": round(m.value, 4), "pass": m.threshold_pass, "points": m.points} for m in self.metrics},
+            }
+        return self._summary_cache
+
+    def to_json(self) -> bytes:
+        """Summary as UTF-8 JSON bytes (orjson when available)"""
+        if HAS_ORJSON:
+            return orjson.dumps(self._cached_summary())
+        return json.dumps(self._cached_summary(), separators=(",", ":")).encode("utf-8")
 
     def __str__(self) -> str:
+        if self._str_cache is not None:
+            return self._str_cache
         lines = [f"Human Score: {self.total_score}/{self.max_score} ({'PASS' if self.is_human else 'FAIL'})"]
         by_cat: dict[str, list[MetricResult]] = {}
         for m in self.metrics:
@@ -69,7 +97,8 @@ class HumanScoreReport:
                 lines.append(f"    {m.metric_id} {m.name}: {m.value:.4f} [{flag}] +{m.points}/{m.max_points}")
                 if m.note:
                     lines.append(f"      {m.note}")
-        return "\n".join(lines)
+        self._str_cache = "\n".join(lines)
+        return self._str_cache
 
 
 @dataclass
@@ -111,19 +140,42 @@ class HumanScoreTracker:
 
     def __init__(self, session_start: Optional[float] = None):
         self._start = session_start or time.time()
-        self._actions: list[_ActionEvent] = []
+        # Actions are stored column-wise: the metrics only ever scan one field
+        self._action_types: list[str] = []
+        self._action_ts = array("d")
         self._pages: list[_PageVisit] = []
         self._ips: list[_IPRecord] = []
         self._outcomes: list[str] = []
+        # Bumped by every record_* call; compute() reuses the event-derived
+        # metrics while it is unchanged
+        self._version = 0
+        self._cached_version = -1
+        self._cached_metrics: tuple[list[MetricResult], list[MetricResult]] = ([], [])
+        self._sorted_ts_version = -1
+        self._sorted_ts: list[float] = []
 
     # -- Recording methods --
 
     def record_action(self, action_type: str, timestamp: Optional[float] = None) -> None:
         """Record a browser action (click, scroll, type, navigate, search, save, etc.)"""
-        self._actions.append(_ActionEvent(
-            action_type=action_type,
-            timestamp=timestamp or time.time(),
-        ))
+        self._version += 1
+        self._action_types.append(action_type)
+        self._action_ts.append(timestamp or time.time())
+
+    def record_actions(self, actions: Iterable[tuple[str, Optional[float]]]) -> None:
+        """Record a batch of (action_type, timestamp) pairs; a None timestamp means now"""
+        actions = list(actions)
+        if not actions:
+            return
+        self._version += 1
+        now = time.time()
+        self._action_types.extend(t for t, _ in actions)
+        self._action_ts.extend(ts or now for _, ts in actions)
+
+    @property
+    def _actions(self) -> list[_ActionEvent]:
+        """Recorded actions as event objects (built on demand)"""
+        return [_ActionEvent(t, ts) for t, ts in zip(self._action_types, self._action_ts)]
 
     def record_page_visit(
         self,
@@ -134,42 +186,83 @@ class HumanScoreTracker:
         clicked: bool = False,
     ) -> None:
         """Record a page visit with engagement metrics"""
+        self._version += 1
         self._pages.append(_PageVisit(
             url=url, dwell_sec=dwell_sec, completed=completed,
             bounced=bounced, clicked=clicked,
         ))
 
-    def record_ip(self, ip: str, country: str = "", fingerprint_hash: str = "") -> None:
+    def record_ip(
+        self,
+        ip: str,
+        country: str = "",
+        fingerprint_hash: str = "",
+        timestamp: Optional[float] = None,
+    ) -> None:
         """Record IP address and fingerprint used for a request"""
+        self._version += 1
         self._ips.append(_IPRecord(
             ip=ip, country=country, fingerprint_hash=fingerprint_hash,
-            timestamp=time.time(),
+            timestamp=timestamp or time.time(),
         ))
 
+    def record_ips(self, records: Iterable[tuple]) -> None:
+        """Record a batch of IPs; each item holds record_ip's positional arguments"""
+        now = time.time()
+        defaults = ("", "", "", None)
+        before = len(self._ips)
+        for r in records:
+            ip, country, fingerprint_hash, timestamp = (*r, *defaults[len(r):])
+            self._ips.append(_IPRecord(ip, country, fingerprint_hash, timestamp or now))
+        if len(self._ips) != before:
+            self._version += 1
+
     def record_outcome(self, outcome_type: str) -> None:
         """Record a task outcome (success, failure, partial, skip, etc.)"""
+        self._version += 1
         self._outcomes.append(outcome_type)
 
+    def record_outcomes(self, outcome_types: Iterable[str]) -> None:
+        """Record a batch of task outcomes"""
+        before = len(self._outcomes)
+        self._outcomes.extend(outcome_types)
+        if len(self._outcomes) != before:
+            self._version += 1
+
     # -- Computation --
 
-    def compute(self) -> HumanScoreReport:
-        """Compute all metrics and return a HumanScoreReport"""
-        results = [
-            self._h_t1(),
-            self._h_t2(),
-            self._h_t3(),
-            self._h_e1(),
-            self._h_e2(),
-            self._h_e3(),
-            self._h_n1(),
-            self._h_n2(),
-            self._h_n3(),
-            self._h_g1(),
-            self._h_g2(),
-            self._h_g3(),
-            self._h_c1(),
-            self._h_c2(),
-        ]
+    def compute(self, now: Optional[float] = None) -> HumanScoreReport:
+        """
+        Compute all metrics and return a HumanScoreReport.
+
+        Args:
+            now: Reference time for time-dependent metrics (default: current time).
+                 Pass explicitly when replaying recorded events.
+        """
+        if now is None:
+            now = time.time()
+        if self._cached_version != self._version:
+            self._cached_metrics = (
+                [self._h_t1()],
+                [
+                    self._h_t3(),
+                    self._h_e1(),
+                    self._h_e2(),
+                    self._h_e3(),
+                    self._h_n1(),
+                    self._h_n2(),
+                    self._h_n3(),
+                    self._h_g1(),
+                    self._h_g2(),
+                    self._h_g3(),
+                    self._h_c1(),
+                    self._h_c2(),
+                ],
+            )
+            self._cached_version = self._version
+        # H_T2 depends on `now`, so it is always recomputed
+        head, tail = self._cached_metrics
+        results = [*head, self._h_t2(now), *tail]
         total = sum(r.points for r in results)
         max_score = sum(r.max_points for r in results)
         return HumanScoreReport(
@@ -195,23 +288,19 @@ class HumanScoreTracker:
         return MetricResult("H_T1", "Event Interval CV", "Time", cv, passed, 10 if passed else 0, 10,
                             "CV 0.2-1.5 is natural range")
 
-    def _h_t2(self) -> MetricResult:
+    def _h_t2(self, now: float) -> MetricResult:
         """H_T2: Continuous operation time (<= 180 min)"""
-        duration_min = (time.time() - self._start) / 60.0
+        duration_min = (now - self._start) / 60.0
         passed = duration_min <= 180
         return MetricResult("H_T2", "Continuous Operation", "Time", duration_min, passed, 6 if passed else 0, 6)
 
     def _h_t3(self) -> MetricResult:
         """H_T3: Night-time activity ratio (<= 0.50)"""
-        if not self._actions:
+        if not self._action_ts:
             return MetricResult("H_T3", "Night Ratio", "Time", 0.0, True, 5, 5, "No actions recorded")
-        night_count = 0
-        for a in self._actions:
-            import datetime
-            hour = datetime.datetime.fromtimestamp(a.timestamp).hour
-            if 0 <= hour < 6:
-                night_count += 1
-        ratio = night_count / len(self._actions) if self._actions else 0
+        localtime = time.localtime
+        night_count = sum(1 for ts in self._action_ts if localtime(ts).tm_hour < 6)
+        ratio = night_count / len(self._action_ts)
         passed = ratio <= 0.50
         return MetricResult("H_T3", "Night Ratio", "Time", ratio, passed, 5 if passed else 0, 5,
                             "Target region dependent")
@@ -300,24 +389,24 @@ class HumanScoreTracker:
 
     def _h_g1(self) -> MetricResult:
         """H_G1: Action speed (<= 20 actions per minute)"""
-        if not self._actions:
+        if not self._action_ts:
             return MetricResult("H_G1", "Action Speed", "Behavior", 0.0, True, 10, 10, "No actions")
-        sorted_actions = sorted(self._actions, key=lambda a: a.timestamp)
-        span = sorted_actions[-1].timestamp - sorted_actions[0].timestamp
+        timestamps = self._sorted_timestamps()
+        span = timestamps[-1] - timestamps[0]
         duration_min = span / 60.0 if span > 0 else 1 / 60  # minimum 1 second
-        apm = len(self._actions) / duration_min
+        apm = len(timestamps) / duration_min
         passed = apm <= 20
         return MetricResult("H_G1", "Action Speed", "Behavior", apm, passed, 10 if passed else 0, 10,
                             "Platform dependent")
 
     def _h_g2(self) -> MetricResult:
         """H_G2: Action diversity - unique action type ratio (>= 0.30)"""
-        if not self._actions:
+        if not self._action_types:
             return MetricResult("H_G2", "Action Diversity", "Behavior", 0.0, False, 0, 8, "No actions")
-        types = set(a.action_type for a in self._actions)
+        types = set(self._action_types)
         # Diversity = unique types / expected variety (cap at known action types count)
         # Use Shannon diversity index alternative: unique / total (capped)
-        diversity = len(types) / max(len(self._actions), 1)
+        diversity = len(types) / len(self._action_types)
         # Clamp to 1.0 max
         diversity = min(diversity, 1.0)
         passed = diversity >= 0.30
@@ -326,14 +415,12 @@ class HumanScoreTracker:
 
     def _h_g3(self) -> MetricResult:
         """H_G3: Transition entropy - Shannon entropy of action type transitions (>= 1.2)"""
-        if len(self._actions) < 2:
+        types = self._action_types
+        if len(types) < 2:
             return MetricResult("H_G3", "Transition Entropy", "Behavior", 0.0, False, 0, 8,
                                 "Not enough actions for transition analysis")
-        transitions: Counter = Counter()
-        for i in range(len(self._actions) - 1):
-            pair = (self._actions[i].action_type, self._actions[i + 1].action_type)
-            transitions[pair] += 1
-        total = sum(transitions.values())
+        transitions = Counter(zip(types, types[1:]))
+        total = len(types) - 1
         entropy = 0.0
         for count in transitions.values():
             p = count / total
@@ -381,11 +468,17 @@ class HumanScoreTracker:
 
     def _get_intervals(self) -> list[float]:
         """Get time intervals between consecutive actions"""
-        if len(self._actions) < 2:
+        if len(self._action_ts) < 2:
             return []
-        sorted_actions = sorted(self._actions, key=lambda a: a.timestamp)
-        return [sorted_actions[i].timestamp - sorted_actions[i - 1].timestamp
-                for i in range(1, len(sorted_actions))]
+        timestamps = self._sorted_timestamps()
+        return [b - a for a, b in zip(timestamps, timestamps[1:])]
+
+    def _sorted_timestamps(self) -> list[float]:
+        """Action timestamps in time order, sorted once per recorded state (H_T1, H_G1)"""
+        if self._sorted_ts_version != self._version:
+            self._sorted_ts = sorted(self._action_ts)
+            self._sorted_ts_version = self._version
+        return self._sorted_ts
 
     @staticmethod
     def _z_score_mean(values: list[float]) -> Optional[float]:
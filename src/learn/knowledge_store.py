@@ -67,20 +67,19 @@ class KnowledgeStore:
         Args:
             entry: Knowledge entry to store
         """
-        if entry.key in self._store:
-            existing = self._store[entry.key]
+        existing = self._store.get(entry.key)
+        if existing is not None:
             entry.created_at = existing.created_at
             entry.access_count = existing.access_count
             entry.updated_at = time.time()
             self._store.move_to_end(entry.key)
         else:
             if len(self._store) >= self._max_entries:
-                oldest_key = next(iter(self._store))
-                del self._store[oldest_key]
-                logger.debug(f"Evicted oldest entry: {oldest_key}")
+                oldest_key, _ = self._store.popitem(last=False)
+                logger.debug("Evicted oldest entry: {}", oldest_key)
 
         self._store[entry.key] = entry
-        logger.debug(f"Stored knowledge: {entry.key}")
+        logger.debug("Stored knowledge: {}", entry.key)
 
     def query(self, key: str) -> Optional[KnowledgeEntry]:
         """
@@ -92,10 +91,10 @@ class KnowledgeStore:
         Returns:
             KnowledgeEntry or None
         """
-        if key not in self._store:
+        entry = self._store.get(key)
+        if entry is None:
             return None
 
-        entry = self._store[key]
         entry.access_count += 1
         self._store.move_to_end(key)
         return entry
@@ -1,42 +1,262 @@
 """
 Logging Configuration - Structured logging with JSON support
 """
+import atexit
+import functools
+import io
+import os
 import sys
 import json
+import queue
+import threading
+import time
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
 from loguru import logger
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-def json_serializer(record: dict) -> str:
-    """Serialize log record to JSON format"""
-    subset = {
-        "timestamp": record["time"].strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
-        "level": record["level"].name,
-        "message": record["message"],
-        "module": record["name"],
-        "function": record["function"],
-        "line": record["line"],
-    }
 
-    # Add exception info if present
-    if record["exception"]:
+def _dumps(obj: dict) -> bytes:
+    """Encode a log payload as UTF-8 JSON bytes (orjson when available)"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def json_serializer(record: dict) -> bytes:
+    """Serialize log record to UTF-8 encoded JSON"""
+    # Local time rendered with a trailing "Z", matching the historical format
+    timestamp = record["time"].replace(tzinfo=None).isoformat(timespec="milliseconds") + "Z"
+    subset = dict(
+        timestamp=timestamp,
+        level=record["level"].name,
+        message=record["message"],
+        module=record["name"],
+        function=record["function"],
+        line=record["line"],
+    )
+
+    exception = record["exception"]
+    if exception:
+        exc_type, exc_value = exception.type, exception.value
         subset["exception"] = {
-            "type": record["exception"].type.__name__ if record["exception"].type else None,
-            "value": str(record["exception"].value) if record["exception"].value else None,
+            "type": exc_type.__name__ if exc_type else None,
+            "value": str(exc_value) if exc_value else None,
         }
 
-    # Add extra fields if present
-    if record["extra"]:
-        subset["extra"] = record["extra"]
+    extra = record["extra"]
+    if extra:
+        subset["extra"] = extra
+
+    return _dumps(subset)
+
+
+# JSON records are handed to a bounded queue and written to stderr by a
+# single writer thread, so a stalled stderr never blocks the event loop.
+_STDERR_BUFFER_SIZE = 64 * 1024
+_QUEUE_MAXSIZE = 10_000
+_MAX_BATCH = 512
+_STOP = object()
+
+
+class AsyncLogSink:
+    """
+    Bounded, non-blocking sink for serialized log records.
+
+    Callers enqueue bytes; a writer thread drains them in batches into a
+    buffered stream and flushes whenever the queue runs empty. When the queue
+    is full (or the sink is closed) the record is dropped and counted instead
+    of growing memory.
+    """
+
+    def __init__(self, stream: io.BufferedIOBase, maxsize: int = _QUEUE_MAXSIZE):
+        self._stream = stream
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._closed = False
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._drain, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, payload: bytes) -> bool:
+        """Enqueue a record without blocking. Returns False if dropped."""
+        if self._closed:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(payload)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self) -> None:
+        """Block until every record queued so far is written and flushed"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write out everything queued, then stop the writer thread (called at exit)"""
+        if self._closed:
+            return
+        self._closed = True
+        # Blocks while the queue is full; the writer keeps draining it
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _take_pending(self, batch: list) -> list:
+        get = self._queue.get_nowait
+        while len(batch) < _MAX_BATCH and batch[-1] is not _STOP:
+            try:
+                batch.append(get())
+            except queue.Empty:
+                break
+        return batch
 
-    return json.dumps(subset, ensure_ascii=False)
+    def _drain(self) -> None:
+        get = self._queue.get
+        while True:
+            batch = self._take_pending([get()])
+            stop = batch[-1] is _STOP
+            if stop:
+                batch.pop()
+            self._write(batch, flush=stop)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: list, flush: bool = False) -> None:
+        try:
+            if batch:
+                self._stream.write(b"".join(batch))
+            if flush or self._queue.empty():
+                self._stream.flush()
+        except (OSError, ValueError):
+            pass
+
+
+_json_sink_queue: Optional[AsyncLogSink] = None
+_json_sink_lock = threading.Lock()
+
+
+def _get_json_sink_queue() -> AsyncLogSink:
+    """Create the shared stderr sink queue on first use"""
+    global _json_sink_queue
+    if _json_sink_queue is not None:
+        return _json_sink_queue
+    with _json_sink_lock:
+        if _json_sink_queue is None:
+            try:
+                raw = io.FileIO(sys.stderr.fileno(), "wb", closefd=False)
+            except (AttributeError, OSError, ValueError):
+                # stderr replaced by a non-file stream (e.g. test capture)
+                raw = sys.stderr.buffer
+            stream = io.BufferedWriter(raw, buffer_size=_STDERR_BUFFER_SIZE)
+            _json_sink_queue = AsyncLogSink(stream)
+            atexit.register(_json_sink_queue.close)
+    return _json_sink_queue
 
 
 def json_sink(message):
     """Sink for JSON formatted logs"""
-    record = message.record
-    print(json_serializer(record), file=sys.stderr)
+    _get_json_sink_queue().put(json_serializer(message.record) + b"\n")
+
+
+_LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+_LOG_FILE_RETENTION_SEC = 7 * 24 * 3600
+
+
+class RotatingFileWriter:
+    """
+    Append-only binary log file, rotated by size with age-based retention.
+
+    Writes go through a large userspace buffer so a batch of records costs a
+    single write() syscall. Rotation renames the current file aside and
+    removes rotated files older than the retention window.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = _LOG_FILE_MAX_BYTES,
+        retention_sec: float = _LOG_FILE_RETENTION_SEC,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.retention_sec = retention_sec
+        self._open()
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab", buffering=_STDERR_BUFFER_SIZE)
+        self._size = self._file.tell()
+
+    def write(self, data: bytes) -> int:
+        if self._size and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        stamp = time.strftime("%Y-%m-%d_%H-%M-%S")
+        target = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        n = 1
+        while target.exists():
+            target = self.path.with_name(f"{self.path.stem}.{stamp}.{n}{self.path.suffix}")
+            n += 1
+        os.rename(self.path, target)
+        self._remove_expired()
+        self._open()
+
+    def _remove_expired(self) -> None:
+        cutoff = time.time() - self.retention_sec
+        for old in self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}"):
+            try:
+                if old.stat().st_mtime < cutoff:
+                    old.unlink()
+            except OSError:
+                pass
+
+
+class JsonFileSink:
+    """
+    Loguru sink writing JSON records to a rotating file from a writer thread.
+
+    logger.remove() calls stop(), which drains the queue, joins the writer
+    and closes the file, so reconfiguring never leaves an old writer behind.
+    There is deliberately no flush(): loguru would call it after every record.
+    """
+
+    def __init__(self, path: str):
+        self._file = RotatingFileWriter(path)
+        self._queue = AsyncLogSink(self._file)
+        atexit.register(self.stop)
+
+    def write(self, message) -> None:
+        self._queue.put(json_serializer(message.record) + b"\n")
+
+    def stop(self) -> None:
+        atexit.unregister(self.stop)
+        self._queue.close()
+        self._file.close()
+
+
+def json_file_sink(path: str) -> JsonFileSink:
+    """Create a JSON log file sink writing in batches from a background thread"""
+    return JsonFileSink(path)
 
 
 def configure_logging(
@@ -76,11 +296,10 @@ def configure_logging(
     if log_file:
         if json_format:
             logger.add(
-                log_file,
-                format=lambda m: json_serializer(m.record) + "\n",
+                json_file_sink(log_file),
                 level=level,
-                rotation="10 MB",
-                retention="7 days",
+                format="{message}",
+                colorize=False,
             )
         else:
             logger.add(
@@ -92,28 +311,43 @@ def configure_logging(
             )
 
 
+@functools.lru_cache(maxsize=256)
+def _bound_logger(name: str):
+    """Bound logger per name (bind() allocates a new Logger on every call)"""
+    return logger.bind(name=name)
+
+
 def get_logger(name: str = None):
     """Get a logger instance with optional name binding"""
     if name:
-        return logger.bind(name=name)
+        return _bound_logger(name)
     return logger
 
 
-# Convenience functions for structured logging
+def log_context(**fields):
+    """
+    Attach fields (request_id, task_id, ...) to every record logged inside
+    the block, including across awaits, via loguru's contextvars support.
+
+    Usage:
+        with log_context(request_id=rid):
+            await handle(request)
+    """
+    return logger.contextualize(**fields)
+
+
+# Convenience functions for structured logging.
+# Messages are loguru templates filled from the same keyword arguments that
+# land in record["extra"], so nothing is formatted when the level is filtered.
 def log_request(url: str, method: str = "GET", **kwargs):
     """Log an HTTP request"""
-    logger.info(
-        f"Request: {method} {url}",
-        method=method,
-        url=url,
-        **kwargs
-    )
+    logger.info("Request: {method} {url}", method=method, url=url, **kwargs)
 
 
 def log_response(url: str, status: int, duration: float, **kwargs):
     """Log an HTTP response"""
     logger.info(
-        f"Response: {status} {url} ({duration:.2f}s)",
+        "Response: {status} {url} ({duration:.2f}s)",
         url=url,
         status=status,
         duration=duration,
@@ -123,19 +357,9 @@ def log_response(url: str, status: int, duration: float, **kwargs):
 
 def log_error(error: str, error_type: str = None, **kwargs):
     """Log an error with structured data"""
-    logger.error(
-        f"Error: {error}",
-        error=error,
-        error_type=error_type,
-        **kwargs
-    )
+    logger.error("Error: {error}", error=error, error_type=error_type, **kwargs)
 
 
 def log_task(task_id: str, action: str, **kwargs):
     """Log a task event"""
-    logger.info(
-        f"Task {task_id}: {action}",
-        task_id=task_id,
-        action=action,
-        **kwargs
-    )
+    logger.info("Task {task_id}: {action}", task_id=task_id, action=action, **kwargs)
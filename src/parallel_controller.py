@@ -2,20 +2,25 @@
 Parallel Controller - Manages multiple browser workers with retry logic
 """
 import asyncio
+import random
+import re
 import time
-from typing import Optional, Callable, Any, Coroutine, TYPE_CHECKING
+from contextlib import aclosing, asynccontextmanager
+from operator import attrgetter
+from typing import Optional, Callable, Any, AsyncIterator, Coroutine, Iterable, Iterator, TYPE_CHECKING
 from dataclasses import dataclass
 from loguru import logger
 
-from .proxy_manager import ProxyManager, ProxyConfig
+from .proxy_manager import ProxyManager, ProxyConfig, ProxyOutcome
 from .ua_manager import UserAgentManager, BrowserProfile
 from .browser_worker import BrowserWorker, WorkerResult, ErrorType
+from .sense.event_bus import Event
 
 if TYPE_CHECKING:
     from .sense import EventBus, MetricsCollector
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TaskResult:
     """Result from parallel task execution"""
 
@@ -29,7 +34,13 @@ class TaskResult:
 
 
 class ParallelController:
-    """Manages parallel browser workers with proxy and UA rotation"""
+    """
+    Manages parallel browser workers with proxy and UA rotation.
+
+    All workers run on the caller's event loop. Browser work is awaited CDP
+    I/O, and Playwright objects are bound to the loop that created them, so
+    pooled browsers, the proxy manager and the event bus stay on one loop.
+    """
 
     # Retry settings
     MAX_RETRIES = 3
@@ -43,6 +54,36 @@ class ParallelController:
         ErrorType.PROXY,
     }
 
+    # Failures after which the browser is discarded instead of pooled.
+    # Proxy failures are not among them: the retry reuses the browser with a
+    # new context on a fresh proxy session (context-level proxy).
+    RECYCLE_ERRORS = {
+        ErrorType.BROWSER_CLOSED,
+        ErrorType.UNKNOWN,
+        None,  # untyped failure: state unknown
+    }
+
+    # Substrings that mark an untyped error message as proxy/network related
+    PROXY_ERROR_PATTERNS = (
+        "proxy",
+        "connection refused",
+        "connection reset",
+        "connection error",
+        "timeout",
+        "econnrefused",
+        "econnreset",
+        "etimedout",
+        "tunnel",
+        "network",
+        "socket",
+        "unreachable",
+        "502",
+        "503",
+        "504",
+        "407",
+    )
+    _PROXY_ERROR_RE = re.compile("|".join(map(re.escape, PROXY_ERROR_PATTERNS)), re.IGNORECASE)
+
     def __init__(
         self,
         proxy_manager: Optional[ProxyManager] = None,
@@ -63,12 +104,62 @@ class ParallelController:
         self.area = area
         self.timezone = timezone
         self._workers: dict[str, BrowserWorker] = {}
-        self._semaphore = asyncio.Semaphore(max_workers)
+        # Launched browsers kept between tasks; reused with a fresh context
+        self._idle: asyncio.LifoQueue[BrowserWorker] = asyncio.LifoQueue()
+        # Active-task counter guarded by a condition so max_workers can be
+        # changed at runtime (see set_max_workers)
+        self._active = 0
+        self._waiting = 0
+        self._slots = asyncio.Condition()
         self._event_bus = event_bus
         self._metrics = metrics_collector
 
-    async def _create_worker(self, worker_id: str) -> BrowserWorker:
-        """Create a new worker with fresh proxy and profile"""
+    @asynccontextmanager
+    async def _worker_slot(self):
+        """Hold one of max_workers concurrency slots for the duration of a task"""
+        # Fast path: a free slot and nobody queued ahead. The check and the
+        # increment run without an await in between, so no lock is needed.
+        if self._active < self.max_workers and not self._waiting:
+            self._active += 1
+        else:
+            self._waiting += 1
+            try:
+                async with self._slots:
+                    try:
+                        await self._slots.wait_for(lambda: self._active < self.max_workers)
+                    except asyncio.CancelledError:
+                        # A release may have woken this waiter with notify(1);
+                        # pass the wakeup on so a free slot is not stranded
+                        if self._active < self.max_workers:
+                            self._slots.notify(1)
+                        raise
+                    self._active += 1
+            finally:
+                self._waiting -= 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            if self._waiting:
+                async with self._slots:
+                    self._slots.notify(1)
+
+    async def set_max_workers(self, max_workers: int) -> None:
+        """
+        Change the concurrency limit at runtime.
+
+        Shrinking takes effect as running tasks finish; growing wakes waiting
+        tasks immediately. A run_parallel batch already in progress keeps its
+        consumer count, so it can shrink but not grow.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        async with self._slots:
+            self.max_workers = max_workers
+            self._slots.notify_all()
+
+    def _next_identity(self, worker_id: str) -> tuple[Optional[ProxyConfig], BrowserProfile]:
+        """Pick a fresh proxy session and browser profile for a worker"""
         proxy = None
         if self.proxy_manager:
             proxy = self.proxy_manager.get_proxy(new_session=True)
@@ -78,6 +169,11 @@ class ParallelController:
             timezone=self.timezone,
             session_id=worker_id,
         )
+        return proxy, profile
+
+    async def _create_worker(self, worker_id: str) -> BrowserWorker:
+        """Create a new worker with fresh proxy and profile"""
+        proxy, profile = self._next_identity(worker_id)
 
         worker = BrowserWorker(
             worker_id=worker_id,
@@ -90,6 +186,47 @@ class ParallelController:
         self._workers[worker_id] = worker
         return worker
 
+    async def _acquire_worker(self, worker_id: str) -> BrowserWorker:
+        """Reuse an idle browser with a fresh context, or launch a new one"""
+        try:
+            worker = self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            return await self._create_worker(worker_id)
+
+        proxy, profile = self._next_identity(worker_id)
+        try:
+            await worker.new_context(profile=profile, proxy=proxy)
+        except Exception as e:
+            logger.debug(f"Pooled worker reset failed, relaunching: {e}")
+            await self._stop_worker(worker)
+            return await self._create_worker(worker_id)
+
+        worker.worker_id = worker_id
+        self._workers[worker_id] = worker
+        return worker
+
+    async def _release_worker(self, worker_id: str, recycle: bool = False) -> None:
+        """
+        Return a worker to the idle pool, or stop it when recycle is set or the
+        pool is full. No-op if the worker was already released.
+        """
+        worker = self._workers.pop(worker_id, None)
+        if worker is None:
+            return
+        self.ua_manager.clear_session(worker_id)
+        if not recycle and self._idle.qsize() < self.max_workers:
+            self._idle.put_nowait(worker)
+        else:
+            await self._stop_worker(worker)
+
+    @staticmethod
+    async def _stop_worker(worker: BrowserWorker) -> None:
+        """Stop a browser, ignoring errors"""
+        try:
+            await worker.stop()
+        except Exception as e:
+            logger.debug(f"Worker cleanup error (ignored): {e}")
+
     async def _cleanup_worker(self, worker_id: str) -> None:
         """Clean up and remove worker"""
         if worker_id in self._workers:
@@ -102,9 +239,14 @@ class ParallelController:
                 self.ua_manager.clear_session(worker_id)
 
     def _calculate_delay(self, attempt: int) -> float:
-        """Calculate exponential backoff delay"""
-        delay = self.BASE_DELAY * (2 ** attempt)
-        return min(delay, self.MAX_DELAY)
+        """
+        Calculate exponential backoff delay with full jitter.
+
+        Drawn uniformly from [0, min(BASE_DELAY * 2**attempt, MAX_DELAY)], so
+        tasks failing together spread their retries over the whole interval.
+        """
+        cap = min(self.BASE_DELAY * (1 << attempt), self.MAX_DELAY)
+        return random.uniform(0, cap)
 
     def _is_retryable(self, result: WorkerResult) -> bool:
         """Check if error is retryable based on error type"""
@@ -120,34 +262,54 @@ class ParallelController:
 
     def _is_proxy_error_legacy(self, error: str) -> bool:
         """Legacy check for proxy-related errors (fallback)"""
-        proxy_errors = [
-            "proxy",
-            "connection refused",
-            "connection reset",
-            "connection error",
-            "timeout",
-            "econnrefused",
-            "econnreset",
-            "etimedout",
-            "tunnel",
-            "network",
-            "socket",
-            "unreachable",
-            "502",
-            "503",
-            "504",
-            "407",
-        ]
-        error_lower = error.lower()
-        return any(e in error_lower for e in proxy_errors)
+        return self._PROXY_ERROR_RE.search(error) is not None
 
     def _publish_event(self, event_type: str, data: dict) -> None:
         """Publish event to event bus if available (fire-and-forget)."""
         if self._event_bus:
-            from .sense import Event
             event = Event(event_type=event_type, source="parallel_controller", data=data)
             asyncio.create_task(self._safe_publish(event))
 
+    def _report_success(self, task_id: str, retries: int, duration: float) -> None:
+        """Record metrics and publish task.completed (no-op without observers)"""
+        if self._metrics:
+            self._metrics.record("task.duration", duration, {"task_id": task_id})
+            self._metrics.record("task.success", 1.0, {"task_id": task_id})
+            self._metrics.increment("task.total_success")
+        if self._event_bus:
+            self._publish_event("task.completed", {
+                "task_id": task_id,
+                "success": True,
+                "retries": retries,
+                "duration": duration,
+            })
+
+    def _report_failure(
+        self,
+        task_id: str,
+        error: Optional[str],
+        error_type_name: str,
+        retries: int,
+        duration: float,
+        metric_error_type: Optional[str] = None,
+    ) -> None:
+        """Record metrics and publish task.failed (no-op without observers)"""
+        if self._metrics:
+            self._metrics.record("task.duration", duration, {"task_id": task_id})
+            self._metrics.record(
+                "task.failure", 1.0,
+                {"task_id": task_id, "error_type": metric_error_type or error_type_name},
+            )
+            self._metrics.increment("task.total_failure")
+        if self._event_bus:
+            self._publish_event("task.failed", {
+                "task_id": task_id,
+                "error": error,
+                "error_type": error_type_name,
+                "retries": retries,
+                "duration": duration,
+            })
+
     async def _safe_publish(self, event) -> None:
         """Safely publish event, swallowing errors."""
         try:
@@ -161,193 +323,265 @@ class ParallelController:
         task_fn: Callable[[BrowserWorker], Coroutine[Any, Any, WorkerResult]],
     ) -> TaskResult:
         """Run a single task with automatic worker management and retry"""
+        async with self._worker_slot():
+            with logger.contextualize(task_id=task_id):
+                return await self._execute_task(task_id, task_fn)
+
+    async def _execute_task(
+        self,
+        task_id: str,
+        task_fn: Callable[[BrowserWorker], Coroutine[Any, Any, WorkerResult]],
+        proxy_outcomes: Optional[list[ProxyOutcome]] = None,
+    ) -> TaskResult:
+        """
+        Run a task with retries; concurrency is bounded by the caller.
+
+        If proxy_outcomes is given, proxy stats are appended there for the
+        caller to record in one batch instead of being recorded immediately.
+        """
         worker_id = f"worker_{task_id}"
         last_error = None
         last_error_type = None
         retries = 0
         start_time = time.time()
 
-        # Publish task started event
-        self._publish_event("task.started", {"task_id": task_id, "worker_id": worker_id})
+        proxy_manager = self.proxy_manager
+        # Releases are shielded so cancelling the task cannot interrupt a
+        # browser shutdown halfway and orphan the process. _release_worker is
+        # idempotent, so the finally below is a no-op after a retry release.
+        release = self._release_worker
 
-        async with self._semaphore:
-            for attempt in range(self.max_retries + 1):
-                current_worker_id = f"{worker_id}_attempt{attempt}"
-                worker = None
+        # Publish task started event
+        if self._event_bus:
+            self._publish_event("task.started", {"task_id": task_id, "worker_id": worker_id})
 
-                try:
-                    # Create worker with fresh proxy on retry
-                    worker = await self._create_worker(current_worker_id)
-                    task_start = time.time()
-                    result = await task_fn(worker)
-                    task_duration = time.time() - task_start
-
-                    # Record proxy stats with timing
-                    if self.proxy_manager and worker.proxy:
-                        session_id = worker.proxy.session_id or ""
-                        country = worker.proxy.country
-                        if result.success:
-                            self.proxy_manager.record_success(
-                                session_id,
-                                response_time=task_duration,
-                                country=country
-                            )
-                        else:
-                            self.proxy_manager.record_failure(session_id, country=country)
+        for attempt in range(self.max_retries + 1):
+            attempt_id = f"{worker_id}_attempt{attempt}"
+            worker = None
+            recycle = False
 
+            try:
+                # Pooled browser with a fresh context and proxy session;
+                # relaunched only after browser failures (RECYCLE_ERRORS)
+                worker = await self._acquire_worker(attempt_id)
+                task_start = time.time()
+                result = await task_fn(worker)
+                task_duration = time.time() - task_start
+
+                # Record proxy stats with timing
+                proxy = worker.proxy
+                if proxy_manager and proxy and proxy_outcomes is not None:
+                    proxy_outcomes.append(ProxyOutcome(
+                        session_id=proxy.session_id or "",
+                        success=result.success,
+                        response_time=task_duration if result.success else 0.0,
+                        country=proxy.country,
+                    ))
+                elif proxy_manager and proxy:
+                    session_id = proxy.session_id or ""
                     if result.success:
-                        duration = time.time() - start_time
-                        # Record metrics
-                        if self._metrics:
-                            self._metrics.record("task.duration", duration, {"task_id": task_id})
-                            self._metrics.record("task.success", 1.0, {"task_id": task_id})
-                            self._metrics.increment("task.total_success")
-                        # Publish success event
-                        self._publish_event("task.completed", {
-                            "task_id": task_id,
-                            "success": True,
-                            "retries": attempt,
-                            "duration": duration,
-                        })
-                        return TaskResult(
-                            worker_id=worker_id,
-                            success=True,
-                            data=result.data,
-                            retries=attempt,
-                            duration=duration,
+                        proxy_manager.record_success(
+                            session_id,
+                            response_time=task_duration,
+                            country=proxy.country
                         )
+                    else:
+                        proxy_manager.record_failure(session_id, country=proxy.country)
 
-                    # Check if we should retry
-                    last_error = result.error
-                    last_error_type = result.error_type
-
-                    if attempt < self.max_retries and self._is_retryable(result):
-                        delay = self._calculate_delay(attempt)
-                        logger.warning(
-                            f"Task {task_id} failed (attempt {attempt + 1}/{self.max_retries + 1}), "
-                            f"error_type={result.error_type.value if result.error_type else 'unknown'}, "
-                            f"retrying in {delay:.1f}s: {result.error}"
-                        )
-                        retries = attempt + 1
-                        # Publish retry event
-                        self._publish_event("task.retry", {
-                            "task_id": task_id,
-                            "attempt": attempt + 1,
-                            "error": result.error,
-                            "error_type": result.error_type.value if result.error_type else "unknown",
-                        })
-                        await self._cleanup_worker(current_worker_id)
-                        await asyncio.sleep(delay)
-                        continue
-
-                    # Non-retryable error or max retries reached
+                if result.success:
                     duration = time.time() - start_time
-                    # Record failure metrics
-                    if self._metrics:
-                        self._metrics.record("task.duration", duration, {"task_id": task_id})
-                        self._metrics.record("task.failure", 1.0, {"task_id": task_id, "error_type": result.error_type.value if result.error_type else "unknown"})
-                        self._metrics.increment("task.total_failure")
-                    # Publish failure event
-                    self._publish_event("task.failed", {
-                        "task_id": task_id,
-                        "error": result.error,
-                        "error_type": result.error_type.value if result.error_type else "unknown",
-                        "retries": attempt,
-                        "duration": duration,
-                    })
+                    self._report_success(task_id, attempt, duration)
                     return TaskResult(
                         worker_id=worker_id,
-                        success=False,
-                        error=result.error,
-                        error_type=result.error_type,
+                        success=True,
+                        data=result.data,
                         retries=attempt,
                         duration=duration,
                     )
 
-                except asyncio.CancelledError:
-                    logger.warning(f"Task {task_id} cancelled")
-                    raise
-
-                except Exception as e:
-                    last_error = str(e)
-                    last_error_type = ErrorType.UNKNOWN
-
-                    # Classify exception
-                    if isinstance(e, asyncio.TimeoutError):
-                        last_error_type = ErrorType.TIMEOUT
-                    elif isinstance(e, (ConnectionError, ConnectionRefusedError, ConnectionResetError)):
-                        last_error_type = ErrorType.CONNECTION
-
-                    logger.error(
-                        f"Task {task_id} exception (attempt {attempt + 1}): "
-                        f"type={last_error_type.value}, error={e}"
+                # Check if we should retry
+                last_error = result.error
+                last_error_type = result.error_type
+                recycle = result.error_type in self.RECYCLE_ERRORS
+                error_type_name = result.error_type.value if result.error_type else "unknown"
+
+                if attempt < self.max_retries and self._is_retryable(result):
+                    delay = self._calculate_delay(attempt)
+                    logger.warning(
+                        f"Task {task_id} failed (attempt {attempt + 1}/{self.max_retries + 1}), "
+                        f"error_type={error_type_name}, "
+                        f"retrying in {delay:.1f}s: {result.error}"
                     )
+                    retries = attempt + 1
+                    # Publish retry event
+                    if self._event_bus:
+                        self._publish_event("task.retry", {
+                            "task_id": task_id,
+                            "attempt": attempt + 1,
+                            "error": result.error,
+                            "error_type": error_type_name,
+                        })
+                    # Free the browser before backing off; the next attempt
+                    # reuses it with a fresh context unless it was recycled
+                    await asyncio.shield(release(attempt_id, recycle))
+                    await asyncio.sleep(delay)
+                    continue
+
+                # Non-retryable error or max retries reached
+                duration = time.time() - start_time
+                self._report_failure(task_id, result.error, error_type_name, attempt, duration)
+                return TaskResult(
+                    worker_id=worker_id,
+                    success=False,
+                    error=result.error,
+                    error_type=result.error_type,
+                    retries=attempt,
+                    duration=duration,
+                )
+
+            except asyncio.CancelledError:
+                logger.warning(f"Task {task_id} cancelled")
+                raise
 
-                    if attempt < self.max_retries and last_error_type in self.RETRYABLE_ERRORS:
-                        delay = self._calculate_delay(attempt)
-                        logger.warning(f"Retrying in {delay:.1f}s with new proxy")
-                        retries = attempt + 1
+            except Exception as e:
+                last_error = str(e)
+                last_error_type = ErrorType.UNKNOWN
+
+                # Classify exception
+                if isinstance(e, asyncio.TimeoutError):
+                    last_error_type = ErrorType.TIMEOUT
+                elif isinstance(e, (ConnectionError, ConnectionRefusedError, ConnectionResetError)):
+                    last_error_type = ErrorType.CONNECTION
+                recycle = last_error_type in self.RECYCLE_ERRORS
+
+                logger.error(
+                    f"Task {task_id} exception (attempt {attempt + 1}): "
+                    f"type={last_error_type.value}, error={e}"
+                )
+
+                if attempt < self.max_retries and last_error_type in self.RETRYABLE_ERRORS:
+                    delay = self._calculate_delay(attempt)
+                    logger.warning(f"Retrying in {delay:.1f}s with new proxy")
+                    retries = attempt + 1
+                    if self._event_bus:
                         self._publish_event("task.retry", {
                             "task_id": task_id,
                             "attempt": attempt + 1,
                             "error": str(e),
                             "error_type": last_error_type.value,
                         })
-                        await self._cleanup_worker(current_worker_id)
-                        await asyncio.sleep(delay)
-                        continue
+                    await asyncio.shield(release(attempt_id, recycle))
+                    await asyncio.sleep(delay)
+                    continue
+
+                duration = time.time() - start_time
+                self._report_failure(task_id, str(e), last_error_type.value, attempt, duration)
+                return TaskResult(
+                    worker_id=worker_id,
+                    success=False,
+                    error=str(e),
+                    error_type=last_error_type,
+                    retries=attempt,
+                    duration=duration,
+                )
 
-                    duration = time.time() - start_time
-                    if self._metrics:
-                        self._metrics.record("task.duration", duration, {"task_id": task_id})
-                        self._metrics.record("task.failure", 1.0, {"task_id": task_id, "error_type": last_error_type.value})
-                        self._metrics.increment("task.total_failure")
-                    self._publish_event("task.failed", {
-                        "task_id": task_id,
-                        "error": str(e),
-                        "error_type": last_error_type.value,
-                        "retries": attempt,
-                        "duration": duration,
-                    })
-                    return TaskResult(
-                        worker_id=worker_id,
-                        success=False,
-                        error=str(e),
-                        error_type=last_error_type,
-                        retries=attempt,
-                        duration=duration,
-                    )
+            finally:
+                await asyncio.shield(release(attempt_id, recycle))
+
+        # Max retries exceeded
+        duration = time.time() - start_time
+        error = f"Max retries exceeded: {last_error}"
+        self._report_failure(
+            task_id,
+            error,
+            last_error_type.value if last_error_type else "unknown",
+            retries,
+            duration,
+            metric_error_type="max_retries",
+        )
+        return TaskResult(
+            worker_id=worker_id,
+            success=False,
+            error=error,
+            error_type=last_error_type,
+            retries=retries,
+            duration=duration,
+        )
 
-                finally:
-                    await self._cleanup_worker(current_worker_id)
+    @staticmethod
+    def _exception_result(task_id: str, exc: BaseException) -> TaskResult:
+        """Build a failed TaskResult for an exception escaping run_task"""
+        error_type = ErrorType.TIMEOUT if isinstance(exc, asyncio.TimeoutError) else ErrorType.UNKNOWN
+        return TaskResult(
+            worker_id=f"worker_{task_id}",
+            success=False,
+            error=str(exc),
+            error_type=error_type,
+        )
 
-            # Max retries exceeded
-            duration = time.time() - start_time
-            if self._metrics:
-                self._metrics.record("task.duration", duration, {"task_id": task_id})
-                self._metrics.record("task.failure", 1.0, {"task_id": task_id, "error_type": "max_retries"})
-                self._metrics.increment("task.total_failure")
-            self._publish_event("task.failed", {
-                "task_id": task_id,
-                "error": f"Max retries exceeded: {last_error}",
-                "error_type": last_error_type.value if last_error_type else "unknown",
-                "retries": retries,
-                "duration": duration,
-            })
-            return TaskResult(
-                worker_id=worker_id,
-                success=False,
-                error=f"Max retries exceeded: {last_error}",
-                error_type=last_error_type,
-                retries=retries,
-                duration=duration,
-            )
+    async def _consume(
+        self,
+        pending: Iterator[tuple[int, tuple[str, Callable[[BrowserWorker], Coroutine[Any, Any, WorkerResult]]]]],
+        completed: asyncio.Queue,
+        proxy_outcomes: list[ProxyOutcome],
+    ) -> None:
+        """Pool consumer: pull tasks from the shared iterator until it is exhausted"""
+        try:
+            for index, (task_id, task_fn) in pending:
+                try:
+                    async with self._worker_slot():
+                        with logger.contextualize(task_id=task_id):
+                            result = await self._execute_task(task_id, task_fn, proxy_outcomes)
+                except Exception as e:
+                    result = self._exception_result(task_id, e)
+                completed.put_nowait((index, result))
+        finally:
+            completed.put_nowait(None)  # this consumer is done
+
+    async def iter_parallel(
+        self,
+        tasks: Iterable[tuple[str, Callable[[BrowserWorker], Coroutine[Any, Any, WorkerResult]]]],
+    ) -> AsyncIterator[tuple[int, TaskResult]]:
+        """
+        Run tasks in parallel, yielding (index, result) as each task finishes.
+
+        At most max_workers tasks are in flight and tasks are pulled from the
+        iterable lazily, so memory does not grow with the number of tasks.
+        Leaving the loop early cancels the remaining tasks; wrap the call in
+        contextlib.aclosing() to make that happen immediately.
+        """
+        # A fixed pool of consumers shares one iterator over the tasks; each
+        # task also holds a worker slot so set_max_workers() can shrink a
+        # running batch.
+        pending = iter(enumerate(tasks))
+        completed: asyncio.Queue = asyncio.Queue()
+        proxy_outcomes: list[ProxyOutcome] = []
+        consumers = [
+            asyncio.create_task(self._consume(pending, completed, proxy_outcomes))
+            for _ in range(self.max_workers)
+        ]
+        try:
+            running = len(consumers)
+            while running:
+                item = await completed.get()
+                if item is None:
+                    running -= 1
+                else:
+                    yield item
+            # Surface cancellation or unexpected consumer failures
+            await asyncio.gather(*consumers)
+        finally:
+            for consumer in consumers:
+                if not consumer.done():
+                    consumer.cancel()
+            if self.proxy_manager and proxy_outcomes:
+                self.proxy_manager.record_batch(proxy_outcomes)
 
     async def run_parallel(
         self,
         tasks: list[tuple[str, Callable[[BrowserWorker], Coroutine[Any, Any, WorkerResult]]]],
     ) -> list[TaskResult]:
-        """Run multiple tasks in parallel"""
+        """Run multiple tasks in parallel; results are returned in task order"""
         if not tasks:
             logger.warning("No tasks provided to run_parallel")
             return []
@@ -355,33 +589,14 @@ class ParallelController:
         logger.info(f"Running {len(tasks)} tasks with max {self.max_workers} workers")
         start_time = time.time()
 
-        coroutines = [self.run_task(task_id, task_fn) for task_id, task_fn in tasks]
-        results = await asyncio.gather(*coroutines, return_exceptions=True)
-
-        # Handle exceptions
-        final_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                error_type = ErrorType.UNKNOWN
-                if isinstance(result, asyncio.TimeoutError):
-                    error_type = ErrorType.TIMEOUT
-                elif isinstance(result, asyncio.CancelledError):
-                    error_type = ErrorType.UNKNOWN
-
-                final_results.append(
-                    TaskResult(
-                        worker_id=f"worker_{tasks[i][0]}",
-                        success=False,
-                        error=str(result),
-                        error_type=error_type,
-                    )
-                )
-            else:
-                final_results.append(result)
+        final_results: list[TaskResult] = [None] * len(tasks)  # type: ignore[list-item]
+        async with aclosing(self.iter_parallel(tasks)) as completed:
+            async for index, result in completed:
+                final_results[index] = result
 
         total_duration = time.time() - start_time
-        success_count = sum(1 for r in final_results if r.success)
-        retry_count = sum(r.retries for r in final_results)
+        success_count = sum(map(attrgetter("success"), final_results))
+        retry_count = sum(map(attrgetter("retries"), final_results))
 
         logger.info(
             f"Completed: {success_count}/{len(tasks)} successful, "
@@ -391,14 +606,18 @@ class ParallelController:
         return final_results
 
     async def cleanup_all(self) -> None:
-        """Clean up all workers"""
+        """Clean up all workers, including idle pooled browsers"""
         for worker_id in list(self._workers.keys()):
             await self._cleanup_worker(worker_id)
+        while not self._idle.empty():
+            await self._stop_worker(self._idle.get_nowait())
 
     def get_stats(self) -> dict:
         """Get controller statistics"""
         return {
             "active_workers": len(self._workers),
+            "idle_workers": self._idle.qsize(),
             "max_workers": self.max_workers,
+            "running_tasks": self._active,
             "max_retries": self.max_retries,
         }
@@ -4,8 +4,9 @@ Proxy Manager - SmartProxy ISP rotation with health checking
 import asyncio
 import random
 import time
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Optional, TYPE_CHECKING
+from typing import Iterable, Optional, TYPE_CHECKING
 from loguru import logger
 
 try:
@@ -68,6 +69,15 @@ class ProxyStats:
         return success_score + time_score
 
 
+@dataclass
+class ProxyOutcome:
+    """Outcome of one request through a proxy session, for batched recording"""
+    session_id: str
+    success: bool
+    response_time: float = 0.0
+    country: Optional[str] = None
+
+
 class ProxyManager:
     """Manages SmartProxy ISP rotation with health checking"""
 
@@ -90,7 +100,7 @@ class ProxyManager:
         self._backend = backend
         self.area = area
         self._session_counter = 0
-        self._stats: dict[str, ProxyStats] = {}
+        self._stats: defaultdict[str, ProxyStats] = defaultdict(ProxyStats)
         self._event_bus = event_bus
         self._metrics = metrics_collector
 
@@ -106,8 +116,6 @@ class ProxyManager:
 
     def _get_or_create_stats(self, key: str) -> ProxyStats:
         """Get or create stats for a proxy configuration"""
-        if key not in self._stats:
-            self._stats[key] = ProxyStats()
         return self._stats[key]
 
     def get_proxy(
@@ -148,9 +156,6 @@ class ProxyManager:
 
     def record_success(self, session_id: str, response_time: float = 0.0, country: Optional[str] = None) -> None:
         """Record successful request with response time"""
-        if session_id not in self._stats:
-            self._stats[session_id] = ProxyStats()
-
         stats = self._stats[session_id]
         stats.total_requests += 1
         stats.successful_requests += 1
@@ -190,9 +195,6 @@ class ProxyManager:
 
     def record_failure(self, session_id: str, country: Optional[str] = None, error: Optional[str] = None) -> None:
         """Record failed request"""
-        if session_id not in self._stats:
-            self._stats[session_id] = ProxyStats()
-
         stats = self._stats[session_id]
         stats.total_requests += 1
         stats.failed_requests += 1
@@ -234,6 +236,18 @@ class ProxyManager:
             except RuntimeError:
                 pass
 
+    def record_batch(self, outcomes: Iterable[ProxyOutcome]) -> None:
+        """Record many request outcomes at once, in order"""
+        for outcome in outcomes:
+            if outcome.success:
+                self.record_success(
+                    outcome.session_id,
+                    response_time=outcome.response_time,
+                    country=outcome.country,
+                )
+            else:
+                self.record_failure(outcome.session_id, country=outcome.country)
+
     async def health_check(self, proxy_config: Optional[ProxyConfig] = None) -> bool:
         """Perform health check on a proxy configuration"""
         if not HAS_AIOHTTP:
@@ -301,7 +315,7 @@ class ProxyManager:
 
     def get_stats(self) -> dict[str, ProxyStats]:
         """Get all proxy stats"""
-        return self._stats.copy()
+        return dict(self._stats)
 
     def get_health_summary(self) -> dict:
         """Get summary of proxy health status"""
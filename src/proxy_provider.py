@@ -17,9 +17,9 @@ class ProxyProvider(str, Enum):
     SMARTPROXY = "smartproxy"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProxyConfig:
-    """Proxy configuration"""
+    """Proxy configuration (immutable and hashable, usable as a pool key)"""
     provider: ProxyProvider
     url: str
     country: str | None = None
@@ -97,10 +97,6 @@ class SmartProxyISPBackend:
         session_duration: int = 30,
     ) -> str:
         """Build SmartProxy auth username string"""
-        user = f"user-{self.username}"
-        if country:
-            user = f"{user}-country-{country}"
-        if session_id:
-            user = f"{user}-session-{session_id}"
-        user = f"{user}-sessionduration-{session_duration}"
-        return user
+        country_part = f"-country-{country}" if country else ""
+        session_part = f"-session-{session_id}" if session_id else ""
+        return f"user-{self.username}{country_part}{session_part}-sessionduration-{session_duration}"
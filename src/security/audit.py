@@ -3,21 +3,48 @@ Signed Audit Logger
 
 Tamper-proof audit trail for LLM calls and decisions.
 Entries are signed with PQC (or Ed25519 fallback) when a PQCEngine is provided.
+With batch_size > 1, entries are signed in groups: one signature over the
+Merkle root of the batch, plus a per-entry inclusion proof.
 """
+import atexit
+import bisect
 import hashlib
+import itertools
 import json
+import math
+import mmap
 import os
 import time
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional
 
 from loguru import logger
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-@dataclass
+
+# Fields covered by the signature; assigning any of them drops the cached bytes
+_SIGNED_FIELDS = frozenset({
+    "entry_id", "timestamp", "event_type", "input_hash", "output_hash", "metadata",
+})
+
+
+@dataclass(slots=True)
 class AuditEntry:
-    """Single audit log entry"""
+    """
+    Single audit log entry.
+
+    signable_bytes() is cached after the first call. Reassigning a signed
+    field invalidates the cache; mutating metadata in place does not, so
+    treat metadata as read-only once the entry is logged.
+    """
     entry_id: str
     timestamp: float
     event_type: str
@@ -25,6 +52,14 @@ class AuditEntry:
     output_hash: str
     metadata: dict[str, Any] = field(default_factory=dict)
     signature: Optional[Any] = None  # Signature dataclass or None
+    # Merkle inclusion proof when signed as part of a batch: [(side, hex_hash), ...]
+    merkle_proof: Optional[list[tuple[str, str]]] = None
+    _signable_cache: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _SIGNED_FIELDS:
+            object.__setattr__(self, "_signable_cache", None)
+        object.__setattr__(self, name, value)
 
     def to_dict(self) -> dict:
         d = {
@@ -37,6 +72,8 @@ class AuditEntry:
         }
         if self.signature is not None:
             d["signature"] = self.signature.to_dict()
+        if self.merkle_proof is not None:
+            d["merkle_proof"] = [list(step) for step in self.merkle_proof]
         return d
 
     @classmethod
@@ -45,6 +82,7 @@ class AuditEntry:
         if data.get("signature"):
             from .pqc import Signature
             sig = Signature.from_dict(data["signature"])
+        proof = data.get("merkle_proof")
         return cls(
             entry_id=data["entry_id"],
             timestamp=data["timestamp"],
@@ -53,10 +91,13 @@ class AuditEntry:
             output_hash=data["output_hash"],
             metadata=data.get("metadata", {}),
             signature=sig,
+            merkle_proof=[(side, h) for side, h in proof] if proof is not None else None,
         )
 
     def signable_bytes(self) -> bytes:
         """Deterministic bytes for signing"""
+        if self._signable_cache is not None:
+            return self._signable_cache
         payload = {
             "entry_id": self.entry_id,
             "timestamp": self.timestamp,
@@ -65,7 +106,71 @@ class AuditEntry:
             "output_hash": self.output_hash,
             "metadata": self.metadata,
         }
-        return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+        self._signable_cache = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+        return self._signable_cache
+
+
+_WRITE_BUFFER_SIZE = 64 * 1024
+
+
+def _content_hash(obj: Any) -> str:
+    """SHA-256 hex digest of obj as key-sorted stdlib JSON.
+
+    The serialization is fixed (json.dumps defaults plus sort_keys) so hashes
+    match older logs and do not depend on whether orjson is installed.
+    """
+    return hashlib.sha256(json.dumps(obj, sort_keys=True).encode()).hexdigest()
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """True if obj holds a NaN or infinite float anywhere inside it"""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    return False
+
+
+# ---- Merkle batch signing ----
+# Leaves and inner nodes use distinct prefixes so a leaf can never be
+# reinterpreted as an inner node (second-preimage protection).
+
+def _merkle_leaf(data: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + data).digest()
+
+
+def _merkle_node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _merkle_tree(leaves: list[bytes]) -> tuple[bytes, list[list[tuple[str, str]]]]:
+    """Compute the Merkle root and an inclusion proof for every leaf"""
+    proofs: list[list[tuple[str, str]]] = [[] for _ in leaves]
+    # Each level holds (hash, indices of leaves under that node)
+    level = [(h, [i]) for i, h in enumerate(leaves)]
+    while len(level) > 1:
+        next_level = []
+        for j in range(0, len(level) - 1, 2):
+            (lh, li), (rh, ri) = level[j], level[j + 1]
+            for i in li:
+                proofs[i].append(("R", rh.hex()))
+            for i in ri:
+                proofs[i].append(("L", lh.hex()))
+            next_level.append((_merkle_node(lh, rh), li + ri))
+        if len(level) % 2:
+            next_level.append(level[-1])  # odd node is promoted unchanged
+        level = next_level
+    return level[0][0], proofs
+
+
+def _merkle_root_from_proof(leaf: bytes, proof: list[tuple[str, str]]) -> bytes:
+    node = leaf
+    for side, sibling_hex in proof:
+        sibling = bytes.fromhex(sibling_hex)
+        node = _merkle_node(sibling, node) if side == "L" else _merkle_node(node, sibling)
+    return node
 
 
 class AuditLogger:
@@ -73,22 +178,56 @@ class AuditLogger:
     Audit logger with optional PQC signing and file persistence.
 
     Works in unsigned mode when no PQC engine is provided.
+
+    With batch_size > 1, entries are held until the batch fills (or flush()
+    is called); the batch is then signed once over its Merkle root, each
+    entry gets its inclusion proof, and all lines are written and fsynced
+    together. Entries are unsigned until their batch is flushed. Used as a
+    context manager, the final partial batch is flushed on exit.
+
+    With max_entries set, only the most recent entries are kept in memory
+    (and only the tail of an existing log is loaded at startup). Older
+    entries stay on disk: get_entries() and verify_all() fall back to a
+    scan of the log file when they need them, while entries returns just
+    the in-memory window. Without a log_file, evicted entries are dropped.
     """
 
+    # Entries per verify_all work unit; logs shorter than one chunk verify inline
+    _VERIFY_CHUNK = 256
+
     def __init__(
         self,
         pqc_engine=None,
         signing_keypair=None,
         log_file: Optional[str] = None,
+        batch_size: int = 1,
+        max_entries: Optional[int] = None,
     ):
         self._pqc = pqc_engine
         self._signing_keypair = signing_keypair
+        self._verify_key = None
         self._log_file = log_file
+        self._batch_size = max(1, batch_size)
+        self._max_entries = max_entries
+        # True once entries older than the in-memory window exist on disk
+        self._evicted = False
         self._entries: list[AuditEntry] = []
+        self._pending: list[AuditEntry] = []
+        # Query indexes: parallel timestamp list for bisecting time ranges and
+        # per-event-type entry indices. Falls back to a scan if the clock ever
+        # steps backwards and timestamps stop being ordered.
+        self._timestamps: list[float] = []
+        self._by_type: dict[str, list[int]] = {}
+        self._time_ordered = True
 
         if log_file and os.path.exists(log_file):
             self._load_from_file()
 
+        # One long-lived append handle ("ab" opens with O_APPEND, so lines from
+        # several writer processes never interleave mid-record)
+        self._fh = None
+        self._open_handle()
+
     def log_llm_call(
         self,
         session_id: str,
@@ -119,13 +258,10 @@ class AuditLogger:
     ) -> AuditEntry:
         """Log a decision"""
         decision_dict = decision.to_dict() if hasattr(decision, "to_dict") else {"action": str(decision)}
-        decision_hash = hashlib.sha256(
-            json.dumps(decision_dict, sort_keys=True).encode()
-        ).hexdigest()
         return self.log_event(
             event_type="decision",
             input_hash=state_hash,
-            output_hash=decision_hash,
+            output_hash=_content_hash(decision_dict),
             metadata={
                 "session_id": session_id,
                 "decision": decision_dict,
@@ -140,14 +276,15 @@ class AuditLogger:
         metadata: Optional[dict] = None,
     ) -> AuditEntry:
         """Log a generic event"""
-        entry = AuditEntry(
-            entry_id=uuid.uuid4().hex[:16],
-            timestamp=time.time(),
-            event_type=event_type,
-            input_hash=input_hash,
-            output_hash=output_hash,
-            metadata=metadata or {},
-        )
+        entry = self._new_entry(event_type, input_hash, output_hash, metadata)
+
+        self._append_entry(entry)
+
+        if self._batch_size > 1:
+            self._pending.append(entry)
+            if len(self._pending) >= self._batch_size:
+                self.flush()
+            return entry
 
         # Sign if PQC engine available
         if self._pqc and self._signing_keypair:
@@ -155,14 +292,59 @@ class AuditLogger:
                 entry.signable_bytes(), self._signing_keypair,
             )
 
-        self._entries.append(entry)
-
         # Persist
-        if self._log_file:
+        if self._open_handle():
             self._append_to_file(entry)
 
         return entry
 
+    def log_events(self, events: Iterable[dict[str, Any]]) -> list[AuditEntry]:
+        """
+        Log several events at once, each given as log_event keyword arguments.
+
+        The events (plus any pending batch) are signed together over one
+        Merkle root and written in a single write, regardless of batch_size.
+        """
+        entries = [self._new_entry(**kw) for kw in events]
+        for entry in entries:
+            self._append_entry(entry)
+        self._pending.extend(entries)
+        self.flush()
+        return entries
+
+    @staticmethod
+    def _new_entry(
+        event_type: str,
+        input_hash: str,
+        output_hash: str,
+        metadata: Optional[dict] = None,
+    ) -> AuditEntry:
+        return AuditEntry(
+            entry_id=uuid.uuid4().hex[:16],
+            timestamp=time.time(),
+            event_type=event_type,
+            input_hash=input_hash,
+            output_hash=output_hash,
+            metadata=metadata or {},
+        )
+
+    def flush(self) -> None:
+        """Sign and persist entries held for the current batch"""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        if self._pqc and self._signing_keypair:
+            leaves = [_merkle_leaf(e.signable_bytes()) for e in batch]
+            root, proofs = _merkle_tree(leaves)
+            signature = self._pqc.sign(root, self._signing_keypair)
+            for entry, proof in zip(batch, proofs):
+                entry.signature = signature
+                entry.merkle_proof = proof
+
+        if self._open_handle():
+            self._append_batch_to_file(batch)
+
     def verify_entry(self, entry: AuditEntry) -> bool:
         """Verify a single entry's signature"""
         if entry.signature is None:
@@ -172,25 +354,58 @@ class AuditLogger:
             logger.warning("Cannot verify: no PQC engine or keypair")
             return False
 
-        from .pqc import PQCKeyPair
-        verify_key = PQCKeyPair(
-            algorithm=self._signing_keypair.algorithm,
-            public_key=self._signing_keypair.public_key,
-            secret_key=b"",
-            key_id=self._signing_keypair.key_id,
-        )
+        verify_key = self._verify_key
+        if verify_key is None:
+            # Public half only, built once; the secret key never reaches verify
+            from .pqc import PQCKeyPair
+            verify_key = self._verify_key = PQCKeyPair(
+                algorithm=self._signing_keypair.algorithm,
+                public_key=self._signing_keypair.public_key,
+                secret_key=b"",
+                key_id=self._signing_keypair.key_id,
+            )
+        if entry.merkle_proof is not None:
+            root = _merkle_root_from_proof(_merkle_leaf(entry.signable_bytes()), entry.merkle_proof)
+            return self._pqc.verify(root, entry.signature, verify_key)
         return self._pqc.verify(entry.signable_bytes(), entry.signature, verify_key)
 
     def verify_all(self) -> tuple[int, int]:
         """Verify all entries. Returns (valid_count, invalid_count)."""
-        valid = 0
-        invalid = 0
-        for entry in self._entries:
-            if self.verify_entry(entry):
-                valid += 1
-            else:
-                invalid += 1
-        return valid, invalid
+        self.flush()
+        chunks = self._chunked(self._iter_all(), self._VERIFY_CHUNK)
+        first = next(chunks, [])
+        workers = os.cpu_count() or 1
+        if len(first) < self._VERIFY_CHUNK or workers == 1 or not (self._pqc and self._signing_keypair):
+            # Small log (or nothing to verify cryptographically): not worth a pool
+            valid = total = 0
+            for chunk in itertools.chain([first], chunks):
+                valid += self._count_valid(chunk)
+                total += len(chunk)
+            return valid, total - valid
+
+        # Signature checks are independent and liboqs runs them outside the
+        # GIL. Only a bounded number of chunks is in flight at once, so an
+        # evicted log streamed from disk is never fully held in memory.
+        valid = total = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            inflight: deque = deque()
+            for chunk in itertools.chain([first], chunks):
+                inflight.append(pool.submit(self._count_valid, chunk))
+                total += len(chunk)
+                if len(inflight) >= 2 * workers:
+                    valid += inflight.popleft().result()
+            for future in inflight:
+                valid += future.result()
+        return valid, total - valid
+
+    def _count_valid(self, entries: list[AuditEntry]) -> int:
+        return sum(1 for entry in entries if self.verify_entry(entry))
+
+    @staticmethod
+    def _chunked(entries: Iterable[AuditEntry], size: int) -> Iterator[list[AuditEntry]]:
+        it = iter(entries)
+        while chunk := list(itertools.islice(it, size)):
+            yield chunk
 
     def get_entries(
         self,
@@ -199,6 +414,23 @@ class AuditLogger:
         until: Optional[float] = None,
     ) -> list[AuditEntry]:
         """Query entries with optional filters"""
+        if self._evicted and (
+            since is None or not self._timestamps or not self._time_ordered
+            or since < self._timestamps[0]
+        ):
+            # Range reaches past the in-memory window: scan the log file
+            return [e for e in self._iter_all() if self._matches(e, event_type, since, until)]
+
+        if self._time_ordered:
+            lo = bisect.bisect_left(self._timestamps, since) if since is not None else 0
+            hi = bisect.bisect_right(self._timestamps, until) if until is not None else len(self._entries)
+            if event_type:
+                indices = self._by_type.get(event_type, [])
+                start = bisect.bisect_left(indices, lo)
+                stop = bisect.bisect_left(indices, hi)
+                return [self._entries[i] for i in indices[start:stop]]
+            return self._entries[lo:hi]
+
         results = self._entries
         if event_type:
             results = [e for e in results if e.event_type == event_type]
@@ -212,19 +444,153 @@ class AuditLogger:
     def entries(self) -> list[AuditEntry]:
         return list(self._entries)
 
-    def _append_to_file(self, entry: AuditEntry) -> None:
+    @staticmethod
+    def _matches(
+        entry: AuditEntry,
+        event_type: Optional[str],
+        since: Optional[float],
+        until: Optional[float],
+    ) -> bool:
+        return (
+            (not event_type or entry.event_type == event_type)
+            and (since is None or entry.timestamp >= since)
+            and (until is None or entry.timestamp <= until)
+        )
+
+    def _append_entry(self, entry: AuditEntry) -> None:
+        self._index_entry(entry)
+        self._entries.append(entry)
+        # Trim in chunks so eviction (and the index rebuild) is amortized
+        if self._max_entries and len(self._entries) >= 2 * self._max_entries:
+            self._evict()
+
+    def _index_entry(self, entry: AuditEntry) -> None:
+        if self._timestamps and entry.timestamp < self._timestamps[-1]:
+            self._time_ordered = False
+        self._by_type.setdefault(entry.event_type, []).append(len(self._timestamps))
+        self._timestamps.append(entry.timestamp)
+
+    def _evict(self) -> None:
+        """Drop the oldest entries beyond max_entries (never unflushed ones)"""
+        excess = min(len(self._entries) - self._max_entries, len(self._entries) - len(self._pending))
+        if excess <= 0:
+            return
+        del self._entries[:excess]
+        self._evicted = True
+        self._timestamps = []
+        self._by_type = {}
+        self._time_ordered = True
+        for entry in self._entries:
+            self._index_entry(entry)
+
+    def _iter_all(self) -> Iterator[AuditEntry]:
+        """All entries: evicted ones read back from the log file, then memory"""
+        if self._evicted and self._log_file:
+            yield from self._scan_file({e.entry_id for e in self._entries})
+        yield from self._entries
+
+    def _scan_file(self, skip_ids: set[str]) -> Iterator[AuditEntry]:
+        """Parse entries from the log file via mmap, skipping ids in skip_ids"""
+        if self._fh is not None:
+            self._fh.flush()
         try:
-            with open(self._log_file, "a") as f:
-                f.write(json.dumps(entry.to_dict(), default=str) + "\n")
+            f = open(self._log_file, "rb")
         except OSError as e:
+            logger.error(f"Failed to scan audit log: {e}")
+            return
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b""):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = AuditEntry.from_dict(json.loads(line))
+                    except (ValueError, KeyError) as e:
+                        logger.error(f"Skipping corrupt audit log line: {e}")
+                        continue
+                    if entry.entry_id not in skip_ids:
+                        yield entry
+
+    def __enter__(self) -> "AuditLogger":
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit: flush the pending batch and close the log"""
+        self.close()
+        return None
+
+    def close(self) -> None:
+        """Flush pending batch entries and close the log file"""
+        self.flush()
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except OSError as e:
+                logger.error(f"Failed to close audit log: {e}")
+            self._fh = None
+            atexit.unregister(self.close)
+
+    def _open_handle(self) -> bool:
+        """Open the append handle if needed (also after close()); False if unwritable"""
+        if self._fh is None and self._log_file:
+            try:
+                self._fh = open(self._log_file, "ab", buffering=_WRITE_BUFFER_SIZE)
+            except OSError as e:
+                logger.error(f"Failed to open audit log: {e}")
+                return False
+            atexit.register(self.close)
+        return self._fh is not None
+
+    @staticmethod
+    def _encode(entry: AuditEntry) -> bytes:
+        data = entry.to_dict()
+        if HAS_ORJSON:
+            try:
+                line = orjson.dumps(
+                    data, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+                )
+            except TypeError:
+                pass  # e.g. integers beyond 64 bits; stdlib json handles them
+            else:
+                # orjson writes NaN/Infinity as null, which would not read back
+                # to the signed value; stdlib json keeps them
+                if b"null" not in line or not _has_non_finite(data):
+                    return line
+        return json.dumps(data, default=str).encode() + b"\n"
+
+    def _append_to_file(self, entry: AuditEntry) -> None:
+        # Flushed per entry so the line is visible to readers immediately;
+        # still a single write() with no open/close per entry
+        try:
+            self._fh.write(self._encode(entry))
+            self._fh.flush()
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to write audit log: {e}")
+
+    def _append_batch_to_file(self, batch: list[AuditEntry]) -> None:
+        try:
+            self._fh.write(b"".join(self._encode(e) for e in batch))
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+        except (OSError, ValueError) as e:
             logger.error(f"Failed to write audit log: {e}")
 
     def _load_from_file(self) -> None:
         try:
-            with open(self._log_file, "r") as f:
+            # Only the last max_entries lines are parsed into entries
+            lines: deque[bytes] = deque(maxlen=self._max_entries)
+            total = 0
+            with open(self._log_file, "rb") as f:
                 for line in f:
-                    line = line.strip()
-                    if line:
-                        self._entries.append(AuditEntry.from_dict(json.loads(line)))
-        except (OSError, json.JSONDecodeError) as e:
+                    if line.strip():
+                        lines.append(line)
+                        total += 1
+            self._evicted = len(lines) < total
+            for line in lines:
+                self._append_entry(AuditEntry.from_dict(json.loads(line)))
+        except (OSError, ValueError) as e:
             logger.error(f"Failed to load audit log: {e}")
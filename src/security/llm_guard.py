@@ -4,15 +4,29 @@ LLM Security Guard
 Input sanitization, output validation, injection detection, and token budget
 management for LLM interactions in the Think layer.
 """
+import bisect
 import hashlib
 import json
 import re
-import unicodedata
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
 from loguru import logger
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
 
 @dataclass
 class GuardConfig:
@@ -28,24 +42,83 @@ class GuardConfig:
     require_json_schema: bool = True
 
 
-# Injection detection patterns
+# Injection detection patterns, written in lower case and matched
+# case-insensitively. The re fallback uses re.IGNORECASE on the original text:
+# casefold() is not equivalent (it leaves dotless "\u0131" alone and turns
+# "\u0130" into "i" plus a combining dot; IGNORECASE equates both with "i").
+# Only the presence of a match matters, so patterns stop at the shortest text
+# that proves it (no trailing optional or unbounded parts): every search is
+# linear and ends as soon as the evidence is found.
 _INJECTION_PATTERNS: list[tuple[str, float, str]] = [
-    (r"ignore\s+(all\s+)?previous\s+instructions", 0.9, "role_override"),
-    (r"ignore\s+(all\s+)?above", 0.85, "role_override"),
-    (r"you\s+are\s+now\s+", 0.85, "role_override"),
-    (r"act\s+as\s+(a\s+)?", 0.6, "role_override"),
+    (r"ignore\s+(?:all\s+)?previous\s+instructions", 0.9, "role_override"),
+    (r"ignore\s+(?:all\s+)?above", 0.85, "role_override"),
+    (r"you\s+are\s+now\s", 0.85, "role_override"),
+    (r"act\s+as\s", 0.6, "role_override"),
     (r"new\s+instructions?\s*:", 0.8, "role_override"),
-    (r"system\s*:\s*", 0.7, "system_prompt_leak"),
-    (r"<\|?(system|im_start|endoftext)\|?>", 0.9, "system_prompt_leak"),
-    (r"\[INST\]|\[/INST\]|<<SYS>>", 0.9, "system_prompt_leak"),
-    (r"reveal\s+(your\s+)?(system\s+)?prompt", 0.8, "system_prompt_leak"),
-    (r"print\s+(your\s+)?(system\s+)?prompt", 0.8, "system_prompt_leak"),
-    (r"output\s+(your\s+)?instructions", 0.75, "system_prompt_leak"),
-    (r"base64\s*[:\-]\s*[A-Za-z0-9+/=]{20,}", 0.7, "encoded_payload"),
+    (r"system\s*:", 0.7, "system_prompt_leak"),
+    (r"<\|?(?:system|im_start|endoftext)\|?>", 0.9, "system_prompt_leak"),
+    (r"\[inst\]|\[/inst\]|<<sys>>", 0.9, "system_prompt_leak"),
+    (r"reveal\s+(?:your\s+)?(?:system\s+)?prompt", 0.8, "system_prompt_leak"),
+    (r"print\s+(?:your\s+)?(?:system\s+)?prompt", 0.8, "system_prompt_leak"),
+    (r"output\s+(?:your\s+)?instructions", 0.75, "system_prompt_leak"),
+    (r"base64\s*[:\-]\s*[a-z0-9+/=]{20}", 0.7, "encoded_payload"),
 ]
 
 _COMPILED_PATTERNS = [(re.compile(p, re.IGNORECASE), s, n) for p, s, n in _INJECTION_PATTERNS]
 
+# Hyperscan scans casefolded text, which still differs from re.IGNORECASE on
+# the Turkish i's: map dotless i to "i" and drop the combining dot that
+# casefold leaves after "\u0130"
+_TURKIC_I_FOLD = {0x0131: "i", 0x0307: None}
+
+
+def _build_hyperscan_db():
+    """Compile all injection patterns into one Hyperscan block-mode database"""
+    if not HAS_HYPERSCAN:
+        return None
+    flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+    try:
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(
+            expressions=[p.encode() for p, _, _ in _INJECTION_PATTERNS],
+            ids=list(range(len(_INJECTION_PATTERNS))),
+            elements=len(_INJECTION_PATTERNS),
+            flags=[flags] * len(_INJECTION_PATTERNS),
+        )
+    except Exception as e:
+        logger.warning(f"Hyperscan compile failed, using re: {e}")
+        return None
+    return db
+
+
+# Single-pass multi-pattern scanner when Hyperscan is installed
+_HYPERSCAN_DB = _build_hyperscan_db()
+# A Hyperscan scratch serves one scan at a time, so each thread gets its own
+_hyperscan_local = threading.local()
+
+
+def _hyperscan_scratch():
+    """This thread's scratch space for _HYPERSCAN_DB"""
+    scratch = getattr(_hyperscan_local, "scratch", None)
+    if scratch is None:
+        scratch = _hyperscan_local.scratch = hyperscan.Scratch(_HYPERSCAN_DB)
+    return scratch
+
+
+def _hyperscan_hits(folded: str) -> list[int]:
+    """Indices of patterns matching folded text, in pattern order"""
+    hits: set[int] = set()
+
+    def on_match(pattern_id, start, end, flags, context):
+        hits.add(pattern_id)
+
+    _HYPERSCAN_DB.scan(
+        folded.encode("utf-8", "replace"),
+        match_event_handler=on_match,
+        scratch=_hyperscan_scratch(),
+    )
+    return sorted(hits)
+
 # Zero-width and control characters to strip
 _CONTROL_CHARS = re.compile(
     r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f"
@@ -54,6 +127,141 @@ _CONTROL_CHARS = re.compile(
     r"\ufeff\ufffe\uffff]"
 )
 
+# Markdown/prompt delimiters; each occurrence becomes " ___ " in one pass
+_DELIMITERS = re.compile(r"```|---|===|###")
+
+# ASCII subset of _CONTROL_CHARS as a str.translate deletion table. For ASCII
+# text translate runs a C fast path several times quicker than re.sub; for
+# non-ASCII text it is far slower, so the regex stays for that case.
+_ASCII_CONTROL_DELETE = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), 0x7f]
+)
+
+
+# ASCII bytes that are alphanumeric or whitespace; deleting them from an ASCII
+# buffer leaves exactly the "special" characters counted by detect()
+_ASCII_ALNUM_SPACE = bytes(
+    i for i in range(128) if chr(i).isalnum() or chr(i).isspace()
+)
+
+
+def _special_char_count(text: str) -> int:
+    """Number of characters that are neither alphanumeric nor whitespace"""
+    if text.isascii():
+        return len(text.encode("ascii").translate(None, _ASCII_ALNUM_SPACE))
+    return sum(1 for c in text if not c.isalnum() and not c.isspace())
+
+
+# Code-point ranges of the scripts the mixed-scripts heuristic distinguishes,
+# sorted by start. Letters outside these ranges are not counted.
+_SCRIPT_RANGES: tuple[tuple[int, int, str], ...] = (
+    (0x0000, 0x02AF, "Latin"),
+    (0x0370, 0x03FF, "Greek"),
+    (0x0400, 0x052F, "Cyrillic"),
+    (0x0530, 0x058F, "Armenian"),
+    (0x0590, 0x05FF, "Hebrew"),
+    (0x0600, 0x06FF, "Arabic"),
+    (0x0700, 0x074F, "Syriac"),
+    (0x0750, 0x077F, "Arabic"),
+    (0x0900, 0x097F, "Devanagari"),
+    (0x0980, 0x09FF, "Bengali"),
+    (0x0A00, 0x0A7F, "Gurmukhi"),
+    (0x0A80, 0x0AFF, "Gujarati"),
+    (0x0B80, 0x0BFF, "Tamil"),
+    (0x0C00, 0x0C7F, "Telugu"),
+    (0x0C80, 0x0CFF, "Kannada"),
+    (0x0D00, 0x0D7F, "Malayalam"),
+    (0x0E00, 0x0E7F, "Thai"),
+    (0x0E80, 0x0EFF, "Lao"),
+    (0x10A0, 0x10FF, "Georgian"),
+    (0x1100, 0x11FF, "Hangul"),
+    (0x1E00, 0x1EFF, "Latin"),
+    (0x1F00, 0x1FFF, "Greek"),
+    (0x3040, 0x309F, "Hiragana"),
+    (0x30A0, 0x30FF, "Katakana"),
+    (0x3130, 0x318F, "Hangul"),
+    (0x3400, 0x4DBF, "Han"),
+    (0x4E00, 0x9FFF, "Han"),
+    (0xAC00, 0xD7AF, "Hangul"),
+    (0xF900, 0xFAFF, "Han"),
+    (0xFF21, 0xFF5A, "Latin"),
+    (0xFF66, 0xFF9F, "Katakana"),
+    (0x20000, 0x2FA1F, "Han"),
+)
+_SCRIPT_STARTS = [start for start, _, _ in _SCRIPT_RANGES]
+
+
+def _script_of(c: str) -> Optional[str]:
+    cp = ord(c)
+    i = bisect.bisect_right(_SCRIPT_STARTS, cp) - 1
+    if i >= 0:
+        _, end, script = _SCRIPT_RANGES[i]
+        if cp <= end:
+            return script
+    return None
+
+
+def _strip_control_chars(text: str) -> str:
+    if text.isascii():
+        # Printable ASCII (no tabs or newlines either) has nothing to strip
+        return text if text.isprintable() else text.translate(_ASCII_CONTROL_DELETE)
+    return _CONTROL_CHARS.sub("", text)
+
+
+def _loads(text: str) -> Any:
+    """Parse JSON (orjson when available; its decode error subclasses json's)"""
+    if HAS_ORJSON:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _dumps(obj: Any) -> str:
+    """Compact JSON text, stringifying unknown types (orjson when available)"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # e.g. integers beyond 64 bits
+            pass
+    return json.dumps(obj, default=str, separators=(",", ":"), ensure_ascii=False)
+
+
+# Only braces, quotes and backslashes affect brace balancing
+_JSON_STRUCTURAL = re.compile(r'[{}"\\]')
+
+
+def _balanced_end(text: str, start: int, matches: dict[int, int]) -> int:
+    """
+    Index of the brace closing the one at ``start``, or -1 if unbalanced.
+
+    Every brace pair closed along the way is recorded in ``matches``: an inner
+    '{' outside any string scans identically from its own position, so later
+    candidates can reuse the result instead of rescanning.
+    """
+    opened = []
+    in_string = False
+    skip_to = start
+    for m in _JSON_STRUCTURAL.finditer(text, start):
+        i = m.start()
+        if i < skip_to:
+            # Character escaped by a preceding backslash inside a string
+            continue
+        c = m.group()
+        if c == "\\":
+            if in_string:
+                skip_to = i + 2
+        elif c == '"':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif c == "{":
+            opened.append(i)
+        else:
+            matches[opened.pop()] = i
+            if not opened:
+                return i
+    return -1
+
 
 class InjectionDetector:
     """Detects prompt injection attempts using pattern matching and heuristics"""
@@ -72,14 +280,20 @@ class InjectionDetector:
         max_score = 0.0
 
         # Pattern-based detection
-        for pattern, score, name in _COMPILED_PATTERNS:
-            if pattern.search(text):
+        if _HYPERSCAN_DB is not None:
+            for i in _hyperscan_hits(text.casefold().translate(_TURKIC_I_FOLD)):
+                _, score, name = _INJECTION_PATTERNS[i]
                 matched.append(name)
                 max_score = max(max_score, score)
+        else:
+            for pattern, score, name in _COMPILED_PATTERNS:
+                if pattern.search(text):
+                    matched.append(name)
+                    max_score = max(max_score, score)
 
         # Heuristic: special character ratio
         if len(text) > 20:
-            special_count = sum(1 for c in text if not c.isalnum() and not c.isspace())
+            special_count = _special_char_count(text)
             special_ratio = special_count / len(text)
             if special_ratio > 0.4:
                 heuristic_score = min(special_ratio, 0.6)
@@ -87,19 +301,21 @@ class InjectionDetector:
                 if heuristic_score > 0.3:
                     matched.append("high_special_char_ratio")
 
-        # Heuristic: encoding anomalies (mixed scripts)
-        categories = set()
-        for c in text[:200]:
-            cat = unicodedata.category(c)
-            if cat.startswith("L"):
-                try:
-                    script = unicodedata.name(c, "").split()[0]
-                    categories.add(script)
-                except ValueError:
-                    pass
-        if len(categories) > 4:
-            max_score = max(max_score, 0.5)
-            matched.append("mixed_scripts")
+        # Heuristic: encoding anomalies (mixed scripts); ASCII is all Latin
+        head = text[:200]
+        if head.isascii():
+            return max_score >= 0.7, max_score, matched
+        scripts = set()
+        # Distinct characters only: repeats cannot add a script
+        for c in set(head):
+            if c.isalpha():
+                script = _script_of(c)
+                if script:
+                    scripts.add(script)
+                    if len(scripts) > 4:
+                        max_score = max(max_score, 0.5)
+                        matched.append("mixed_scripts")
+                        break
 
         return max_score >= 0.7, max_score, matched
 
@@ -141,6 +357,14 @@ class TokenBudget:
         return max(0, self.budget - self.used)
 
 
+# Untrusted state fields sanitized into the prompt, with their labels
+_PROMPT_STATE_FIELDS = (
+    ("task_id", "Task ID"),
+    ("task_type", "Task Type"),
+    ("target", "Target"),
+)
+
+
 class LLMGuard:
     """
     Security layer for LLM interactions.
@@ -149,17 +373,50 @@ class LLMGuard:
     and builds safe prompts for the Think layer.
     """
 
+    # Sanitization results memoized per input (stable state fields repeat every tick)
+    _SANITIZE_CACHE_SIZE = 512
+    _SANITIZE_CACHE_MAX_LEN = 64 * 1024
+
     def __init__(self, config: Optional[GuardConfig] = None):
         self.config = config or GuardConfig()
         self._detector = InjectionDetector()
         self._budgets: dict[str, TokenBudget] = {}
+        self._sanitize_cache: OrderedDict[tuple[str, int], tuple] = OrderedDict()
 
     def sanitize_input(self, text: str) -> SanitizationResult:
         """Sanitize user input before sending to LLM"""
+        if len(text) > self._SANITIZE_CACHE_MAX_LEN:
+            return self._sanitize(text)
+
+        key = (text, self.config.max_input_length)
+        cached = self._sanitize_cache.get(key)
+        if cached is None:
+            result = self._sanitize(text)
+            self._sanitize_cache[key] = (
+                result.sanitized_text,
+                tuple(result.removed_patterns),
+                result.is_safe,
+                result.injection_score,
+            )
+            if len(self._sanitize_cache) > self._SANITIZE_CACHE_SIZE:
+                self._sanitize_cache.popitem(last=False)
+            return result
+
+        self._sanitize_cache.move_to_end(key)
+        cleaned, removed, is_safe, score = cached
+        # Fresh result each call: removed_patterns is a mutable list
+        return SanitizationResult(
+            sanitized_text=cleaned,
+            removed_patterns=list(removed),
+            is_safe=is_safe,
+            injection_score=score,
+        )
+
+    def _sanitize(self, text: str) -> SanitizationResult:
         removed = []
 
         # Strip control characters and zero-width
-        cleaned = _CONTROL_CHARS.sub("", text)
+        cleaned = _strip_control_chars(text)
         if cleaned != text:
             removed.append("control_chars")
 
@@ -169,9 +426,7 @@ class LLMGuard:
             removed.append("truncated")
 
         # Escape LLM delimiters
-        for delimiter in ["```", "---", "===", "###"]:
-            if delimiter in cleaned:
-                cleaned = cleaned.replace(delimiter, f" {delimiter.replace(delimiter[0], '_')} ")
+        cleaned = _DELIMITERS.sub(" ___ ", cleaned)
 
         # Detect injection
         is_injection, score, matched = self._detector.detect(cleaned)
@@ -235,17 +490,15 @@ class LLMGuard:
         """Get budget for session"""
         return self._get_or_create_budget(session_id)
 
+    def reset_budgets(self) -> None:
+        """Drop all session budgets; sessions start again from a full budget"""
+        self._budgets.clear()
+
     def build_safe_prompt(self, state: dict, context: Optional[dict] = None) -> str:
         """Build a safe prompt by sanitizing each state field individually"""
         parts = ["## Current System State"]
 
-        safe_fields = [
-            ("task_id", "Task ID"),
-            ("task_type", "Task Type"),
-            ("target", "Target"),
-        ]
-
-        for field_key, label in safe_fields:
+        for field_key, label in _PROMPT_STATE_FIELDS:
             value = state.get(field_key, "")
             if value:
                 sanitized = self.sanitize_input(str(value))
@@ -282,7 +535,7 @@ class LLMGuard:
                 parts.append(f"- {sanitized.sanitized_text}")
 
         if context:
-            ctx_sanitized = self.sanitize_input(json.dumps(context, default=str))
+            ctx_sanitized = self.sanitize_input(_dumps(context))
             if ctx_sanitized.is_safe:
                 parts.extend(["", "## Context", ctx_sanitized.sanitized_text])
 
@@ -306,42 +559,19 @@ class LLMGuard:
 
     def _extract_json_balanced(self, text: str) -> Optional[dict]:
         """Extract JSON using balanced brace matching"""
+        matches: dict[int, int] = {}
         start = text.find("{")
-        if start < 0:
-            return None
-
-        depth = 0
-        in_string = False
-        escape_next = False
-
-        for i in range(start, len(text)):
-            c = text[i]
-            if escape_next:
-                escape_next = False
-                continue
-            if c == "\\":
-                if in_string:
-                    escape_next = True
-                continue
-            if c == '"' and not escape_next:
-                in_string = not in_string
-                continue
-            if in_string:
-                continue
-            if c == "{":
-                depth += 1
-            elif c == "}":
-                depth -= 1
-                if depth == 0:
-                    try:
-                        return json.loads(text[start:i + 1])
-                    except json.JSONDecodeError:
-                        # Try next opening brace
-                        next_start = text.find("{", start + 1)
-                        if next_start >= 0:
-                            return self._extract_json_balanced(text[next_start:])
-                        return None
-
+        while start >= 0:
+            end = matches.get(start)
+            if end is None:
+                end = _balanced_end(text, start, matches)
+            if end < 0:
+                return None
+            try:
+                return _loads(text[start:end + 1])
+            except json.JSONDecodeError:
+                # Try next opening brace
+                start = text.find("{", start + 1)
         return None
 
     def _validate_schema(self, data: dict) -> list[str]:
@@ -4,14 +4,33 @@ Post-Quantum Cryptography Engine
 Provides hybrid PQC encryption (ML-KEM-768 / Kyber) and signing (ML-DSA-65 / Dilithium).
 Falls back to X25519 + Ed25519 + AES-256-GCM when liboqs-python is not installed.
 """
+import base64
 import hashlib
+import hmac
 import os
+import struct
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Optional
 
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey, X25519PublicKey
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from loguru import logger
 
+try:
+    import oqs
+    HAS_OQS = True
+except (ImportError, SystemExit):
+    # liboqs-python exits instead of raising when the native library is missing
+    HAS_OQS = False
+
+# EncryptedPayload.to_bytes header: lengths of algorithm, key_id,
+# kem_ciphertext, nonce and ciphertext (tag folded in), little-endian
+_PAYLOAD_HEADER = struct.Struct("<HHIII")
+
 
 @dataclass(frozen=True)
 class PQCKeyPair:
@@ -25,7 +44,13 @@ class PQCKeyPair:
 
 @dataclass(frozen=True)
 class EncryptedPayload:
-    """Immutable encrypted payload container"""
+    """
+    Immutable encrypted payload container.
+
+    ``ciphertext`` holds the full AES-GCM output (ciphertext || 16-byte tag)
+    and ``tag`` is empty. Payloads written before that split the tag out;
+    from_dict folds it back into ``ciphertext``.
+    """
     kem_ciphertext: bytes
     nonce: bytes
     ciphertext: bytes
@@ -34,7 +59,6 @@ class EncryptedPayload:
     key_id: str
 
     def to_dict(self) -> dict:
-        import base64
         return {
             "kem_ciphertext": base64.b64encode(self.kem_ciphertext).decode(),
             "nonce": base64.b64encode(self.nonce).decode(),
@@ -46,16 +70,55 @@ class EncryptedPayload:
 
     @classmethod
     def from_dict(cls, data: dict) -> "EncryptedPayload":
-        import base64
+        ciphertext = base64.b64decode(data["ciphertext"])
+        tag = base64.b64decode(data.get("tag", ""))
         return cls(
             kem_ciphertext=base64.b64decode(data["kem_ciphertext"]),
             nonce=base64.b64decode(data["nonce"]),
-            ciphertext=base64.b64decode(data["ciphertext"]),
-            tag=base64.b64decode(data["tag"]),
+            ciphertext=ciphertext + tag if tag else ciphertext,
+            tag=b"",
             algorithm=data["algorithm"],
             key_id=data["key_id"],
         )
 
+    def to_bytes(self) -> bytes:
+        """Serialize as a length-prefixed binary frame (no base64)"""
+        algorithm = self.algorithm.encode()
+        key_id = self.key_id.encode()
+        ciphertext = self.ciphertext + self.tag if self.tag else self.ciphertext
+        return b"".join((
+            _PAYLOAD_HEADER.pack(
+                len(algorithm), len(key_id), len(self.kem_ciphertext),
+                len(self.nonce), len(ciphertext),
+            ),
+            algorithm, key_id, self.kem_ciphertext, self.nonce, ciphertext,
+        ))
+
+    @classmethod
+    def from_bytes(cls, buf: bytes, offset: int = 0) -> tuple["EncryptedPayload", int]:
+        """Parse a frame written by to_bytes; returns (payload, end offset)"""
+        view = memoryview(buf)
+        if offset + _PAYLOAD_HEADER.size > len(view):
+            raise ValueError("Encrypted payload truncated")
+        sizes = _PAYLOAD_HEADER.unpack_from(view, offset)
+        offset += _PAYLOAD_HEADER.size
+        end = offset + sum(sizes)
+        if end > len(view):
+            raise ValueError("Encrypted payload truncated")
+        fields = []
+        for size in sizes:
+            fields.append(view[offset:offset + size].tobytes())
+            offset += size
+        algorithm, key_id, kem_ciphertext, nonce, ciphertext = fields
+        return cls(
+            kem_ciphertext=kem_ciphertext,
+            nonce=nonce,
+            ciphertext=ciphertext,
+            tag=b"",
+            algorithm=algorithm.decode(),
+            key_id=key_id.decode(),
+        ), end
+
 
 @dataclass(frozen=True)
 class Signature:
@@ -66,7 +129,6 @@ class Signature:
     signed_at: float = field(default_factory=time.time)
 
     def to_dict(self) -> dict:
-        import base64
         return {
             "signature": base64.b64encode(self.signature).decode(),
             "algorithm": self.algorithm,
@@ -76,7 +138,6 @@ class Signature:
 
     @classmethod
     def from_dict(cls, data: dict) -> "Signature":
-        import base64
         return cls(
             signature=base64.b64decode(data["signature"]),
             algorithm=data["algorithm"],
@@ -86,7 +147,27 @@ class Signature:
 
 
 def _key_id_from_public(public_key: bytes) -> str:
-    return hashlib.sha256(public_key).hexdigest()[:16]
+    # 64-bit identifier, same 16-hex-char shape as the former truncated SHA-256
+    return hashlib.blake2b(public_key, digest_size=8).hexdigest()
+
+
+# HKDF-SHA256 with no salt (RFC 5869: a hash-length string of zeros) and a
+# 32-byte output, which is a single expand block: T(1) = HMAC(PRK, info || 0x01)
+_HKDF_ZERO_SALT = bytes(32)
+_HKDF_INFO_PQC = b"ccp-pqc-kem\x01"
+_HKDF_INFO_X25519 = b"ccp-x25519-kem\x01"
+
+
+def _derive_aes_key(shared_secret: bytes, info_block: bytes) -> bytes:
+    prk = hmac.digest(_HKDF_ZERO_SALT, shared_secret, "sha256")
+    return hmac.digest(prk, info_block, "sha256")
+
+
+def _aead_input(payload: EncryptedPayload) -> bytes:
+    # Only legacy payloads built directly (not via from_dict) carry a tag
+    if payload.tag:
+        return payload.ciphertext + payload.tag
+    return payload.ciphertext
 
 
 class PQCEngine:
@@ -95,15 +176,34 @@ class PQCEngine:
 
     Uses ML-KEM-768 (Kyber) for key encapsulation and ML-DSA-65 (Dilithium) for signing.
     Falls back to X25519 + Ed25519 + AES-256-GCM when liboqs is not available.
+
+    liboqs KEM/signature objects are created once and reused: one keyless
+    instance each for encapsulation and verification, plus one per secret key
+    for decapsulation and signing. Ed25519 signing keys are likewise loaded
+    once per secret key, since loading costs as much as a signature.
+
+    Decryption keys derived from a (secret key, KEM ciphertext) pair are kept
+    in a small LRU, so repeated decrypts of payloads sharing one encapsulation
+    skip both the decapsulation/exchange and HKDF.
     """
 
+    # Secret-key bound liboqs objects kept per engine
+    _MAX_CACHED_KEYS = 64
+    # Derived AES-GCM keys kept per engine
+    _MAX_CACHED_DERIVED = 1024
+
     def __init__(self):
-        self._use_pqc = False
-        try:
-            import oqs  # noqa: F401
-            self._use_pqc = True
+        self._use_pqc = HAS_OQS
+        self._cache_lock = threading.Lock()
+        self._kem_public = None
+        self._sig_public = None
+        self._kem_by_secret: dict[bytes, "oqs.KeyEncapsulation"] = {}
+        self._sig_by_secret: dict[bytes, "oqs.Signature"] = {}
+        self._ed25519_by_secret: dict[bytes, Ed25519PrivateKey] = {}
+        self._derived: OrderedDict[tuple[bytes, bytes], AESGCM] = OrderedDict()
+        if HAS_OQS:
             logger.info("PQC: liboqs available, using ML-KEM-768 / ML-DSA-65")
-        except ImportError:
+        else:
             logger.warning("PQC: liboqs not available, falling back to X25519 + Ed25519")
 
     @property
@@ -134,6 +234,36 @@ class PQCEngine:
             return self._pqc_decrypt(payload, secret_key)
         return self._classical_decrypt(payload, secret_key)
 
+    # ---- Key Encapsulation ----
+
+    def encapsulate(self, public_key: PQCKeyPair) -> tuple[bytes, bytes]:
+        """
+        Run a single KEM encapsulation against public_key.
+
+        Returns (kem_ciphertext, shared_secret); derive symmetric keys from the
+        secret with derive_key() to encrypt many items under one encapsulation.
+        """
+        if self._use_pqc:
+            return self._oqs_kem().encap_secret(public_key.public_key)
+        ephemeral_private = X25519PrivateKey.generate()
+        peer_public = X25519PublicKey.from_public_bytes(public_key.public_key)
+        return (
+            ephemeral_private.public_key().public_bytes_raw(),
+            ephemeral_private.exchange(peer_public),
+        )
+
+    def decapsulate(self, kem_ciphertext: bytes, secret_key: PQCKeyPair) -> bytes:
+        """Recover the shared secret produced by encapsulate()"""
+        if self._use_pqc:
+            return self._oqs_kem(secret_key.secret_key).decap_secret(kem_ciphertext)
+        private = X25519PrivateKey.from_private_bytes(secret_key.secret_key)
+        return private.exchange(X25519PublicKey.from_public_bytes(kem_ciphertext))
+
+    @staticmethod
+    def derive_key(shared_secret: bytes, info: bytes) -> bytes:
+        """32-byte AES key from a shared secret (HKDF-SHA256, no salt) bound to info"""
+        return _derive_aes_key(shared_secret, info + b"\x01")
+
     # ---- Sign / Verify ----
 
     def sign(self, data: bytes, signing_keypair: PQCKeyPair) -> Signature:
@@ -146,10 +276,53 @@ class PQCEngine:
             return self._pqc_verify(data, signature, public_key)
         return self._classical_verify(data, signature, public_key)
 
+    def _cached_aead(self, secret_key: bytes, kem_ciphertext: bytes) -> Optional[AESGCM]:
+        with self._cache_lock:
+            aead = self._derived.get((secret_key, kem_ciphertext))
+            if aead is not None:
+                self._derived.move_to_end((secret_key, kem_ciphertext))
+            return aead
+
+    def _store_aead(self, secret_key: bytes, kem_ciphertext: bytes, aead: AESGCM) -> None:
+        with self._cache_lock:
+            self._derived[(secret_key, kem_ciphertext)] = aead
+            if len(self._derived) > self._MAX_CACHED_DERIVED:
+                self._derived.popitem(last=False)
+
     # ========== PQC Implementation (liboqs) ==========
 
+    def _oqs_kem(self, secret_key: Optional[bytes] = None) -> "oqs.KeyEncapsulation":
+        if secret_key is None:
+            if self._kem_public is None:
+                self._kem_public = oqs.KeyEncapsulation("Kyber768")
+            return self._kem_public
+        kem = self._kem_by_secret.get(secret_key)
+        if kem is None:
+            kem = oqs.KeyEncapsulation("Kyber768", secret_key=secret_key)
+            self._remember(self._kem_by_secret, secret_key, kem)
+        return kem
+
+    def _oqs_sig(self, secret_key: Optional[bytes] = None) -> "oqs.Signature":
+        if secret_key is None:
+            if self._sig_public is None:
+                self._sig_public = oqs.Signature("Dilithium3")
+            return self._sig_public
+        sig = self._sig_by_secret.get(secret_key)
+        if sig is None:
+            sig = oqs.Signature("Dilithium3", secret_key=secret_key)
+            self._remember(self._sig_by_secret, secret_key, sig)
+        return sig
+
+    def _remember(self, cache: dict, secret_key: bytes, obj) -> None:
+        with self._cache_lock:
+            if len(cache) >= self._MAX_CACHED_KEYS:
+                # Not freed here: another thread may still be using the object
+                # it got from the cache. Its native buffers are released when
+                # the last reference goes away.
+                del cache[next(iter(cache))]
+            cache[secret_key] = obj
+
     def _pqc_kem_keygen(self) -> PQCKeyPair:
-        import oqs
         kem = oqs.KeyEncapsulation("Kyber768")
         public_key = kem.generate_keypair()
         secret_key = kem.export_secret_key()
@@ -161,7 +334,6 @@ class PQCEngine:
         )
 
     def _pqc_signing_keygen(self) -> PQCKeyPair:
-        import oqs
         sig = oqs.Signature("Dilithium3")
         public_key = sig.generate_keypair()
         secret_key = sig.export_secret_key()
@@ -173,55 +345,39 @@ class PQCEngine:
         )
 
     def _pqc_encrypt(self, plaintext: bytes, public_key: PQCKeyPair) -> EncryptedPayload:
-        import oqs
-        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-        from cryptography.hazmat.primitives.kdf.hkdf import HKDF
-        from cryptography.hazmat.primitives import hashes
+        ciphertext_kem, shared_secret = self._oqs_kem().encap_secret(public_key.public_key)
 
-        kem = oqs.KeyEncapsulation("Kyber768")
-        ciphertext_kem, shared_secret = kem.encap_secret(public_key.public_key)
-
-        derived_key = HKDF(
-            algorithm=hashes.SHA256(), length=32, salt=None, info=b"ccp-pqc-kem",
-        ).derive(shared_secret)
+        derived_key = _derive_aes_key(shared_secret, _HKDF_INFO_PQC)
 
+        # Every message gets a fresh encapsulation and so a fresh key; only
+        # decrypt has AESGCM objects worth reusing (see _cached_aead)
         nonce = os.urandom(12)
         aesgcm = AESGCM(derived_key)
+        # AES-GCM appends the 16-byte tag; kept in place to avoid copies
         ct = aesgcm.encrypt(nonce, plaintext, None)
-        # AES-GCM appends 16-byte tag
-        ciphertext_data = ct[:-16]
-        tag = ct[-16:]
 
         return EncryptedPayload(
             kem_ciphertext=ciphertext_kem,
             nonce=nonce,
-            ciphertext=ciphertext_data,
-            tag=tag,
+            ciphertext=ct,
+            tag=b"",
             algorithm="ML-KEM-768+AES-256-GCM",
             key_id=public_key.key_id,
         )
 
     def _pqc_decrypt(self, payload: EncryptedPayload, secret_key: PQCKeyPair) -> bytes:
-        import oqs
-        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-        from cryptography.hazmat.primitives.kdf.hkdf import HKDF
-        from cryptography.hazmat.primitives import hashes
-
-        kem = oqs.KeyEncapsulation("Kyber768", secret_key=secret_key.secret_key)
-        shared_secret = kem.decap_secret(payload.kem_ciphertext)
+        aesgcm = self._cached_aead(secret_key.secret_key, payload.kem_ciphertext)
+        if aesgcm is None:
+            shared_secret = self._oqs_kem(secret_key.secret_key).decap_secret(payload.kem_ciphertext)
 
-        derived_key = HKDF(
-            algorithm=hashes.SHA256(), length=32, salt=None, info=b"ccp-pqc-kem",
-        ).derive(shared_secret)
+            derived_key = _derive_aes_key(shared_secret, _HKDF_INFO_PQC)
 
-        aesgcm = AESGCM(derived_key)
-        ct_with_tag = payload.ciphertext + payload.tag
-        return aesgcm.decrypt(payload.nonce, ct_with_tag, None)
+            aesgcm = AESGCM(derived_key)
+            self._store_aead(secret_key.secret_key, payload.kem_ciphertext, aesgcm)
+        return aesgcm.decrypt(payload.nonce, _aead_input(payload), None)
 
     def _pqc_sign(self, data: bytes, signing_keypair: PQCKeyPair) -> Signature:
-        import oqs
-        sig = oqs.Signature("Dilithium3", secret_key=signing_keypair.secret_key)
-        signature_bytes = sig.sign(data)
+        signature_bytes = self._oqs_sig(signing_keypair.secret_key).sign(data)
         return Signature(
             signature=signature_bytes,
             algorithm="ML-DSA-65",
@@ -229,15 +385,11 @@ class PQCEngine:
         )
 
     def _pqc_verify(self, data: bytes, signature: Signature, public_key: PQCKeyPair) -> bool:
-        import oqs
-        sig = oqs.Signature("Dilithium3")
-        return sig.verify(data, signature.signature, public_key.public_key)
+        return self._oqs_sig().verify(data, signature.signature, public_key.public_key)
 
     # ========== Classical Fallback (X25519 + Ed25519) ==========
 
     def _classical_kem_keygen(self) -> PQCKeyPair:
-        from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey
-
         private_key = X25519PrivateKey.generate()
         public_key_bytes = private_key.public_key().public_bytes_raw()
         secret_key_bytes = private_key.private_bytes_raw()
@@ -250,8 +402,6 @@ class PQCEngine:
         )
 
     def _classical_signing_keygen(self) -> PQCKeyPair:
-        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
-
         private_key = Ed25519PrivateKey.generate()
         public_key_bytes = private_key.public_key().public_bytes_raw()
         secret_key_bytes = private_key.private_bytes_raw()
@@ -264,62 +414,45 @@ class PQCEngine:
         )
 
     def _classical_encrypt(self, plaintext: bytes, public_key: PQCKeyPair) -> EncryptedPayload:
-        from cryptography.hazmat.primitives.asymmetric.x25519 import (
-            X25519PrivateKey, X25519PublicKey,
-        )
-        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-        from cryptography.hazmat.primitives.kdf.hkdf import HKDF
-        from cryptography.hazmat.primitives import hashes
-
         # Ephemeral key exchange
         ephemeral_private = X25519PrivateKey.generate()
         ephemeral_public = ephemeral_private.public_key().public_bytes_raw()
         peer_public = X25519PublicKey.from_public_bytes(public_key.public_key)
         shared_secret = ephemeral_private.exchange(peer_public)
 
-        derived_key = HKDF(
-            algorithm=hashes.SHA256(), length=32, salt=None, info=b"ccp-x25519-kem",
-        ).derive(shared_secret)
+        derived_key = _derive_aes_key(shared_secret, _HKDF_INFO_X25519)
 
         nonce = os.urandom(12)
         aesgcm = AESGCM(derived_key)
         ct = aesgcm.encrypt(nonce, plaintext, None)
-        ciphertext_data = ct[:-16]
-        tag = ct[-16:]
 
         return EncryptedPayload(
             kem_ciphertext=ephemeral_public,
             nonce=nonce,
-            ciphertext=ciphertext_data,
-            tag=tag,
+            ciphertext=ct,
+            tag=b"",
             algorithm="X25519+AES-256-GCM",
             key_id=public_key.key_id,
         )
 
     def _classical_decrypt(self, payload: EncryptedPayload, secret_key: PQCKeyPair) -> bytes:
-        from cryptography.hazmat.primitives.asymmetric.x25519 import (
-            X25519PrivateKey, X25519PublicKey,
-        )
-        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-        from cryptography.hazmat.primitives.kdf.hkdf import HKDF
-        from cryptography.hazmat.primitives import hashes
-
-        private = X25519PrivateKey.from_private_bytes(secret_key.secret_key)
-        ephemeral_public = X25519PublicKey.from_public_bytes(payload.kem_ciphertext)
-        shared_secret = private.exchange(ephemeral_public)
+        aesgcm = self._cached_aead(secret_key.secret_key, payload.kem_ciphertext)
+        if aesgcm is None:
+            private = X25519PrivateKey.from_private_bytes(secret_key.secret_key)
+            ephemeral_public = X25519PublicKey.from_public_bytes(payload.kem_ciphertext)
+            shared_secret = private.exchange(ephemeral_public)
 
-        derived_key = HKDF(
-            algorithm=hashes.SHA256(), length=32, salt=None, info=b"ccp-x25519-kem",
-        ).derive(shared_secret)
+            derived_key = _derive_aes_key(shared_secret, _HKDF_INFO_X25519)
 
-        aesgcm = AESGCM(derived_key)
-        ct_with_tag = payload.ciphertext + payload.tag
-        return aesgcm.decrypt(payload.nonce, ct_with_tag, None)
+            aesgcm = AESGCM(derived_key)
+            self._store_aead(secret_key.secret_key, payload.kem_ciphertext, aesgcm)
+        return aesgcm.decrypt(payload.nonce, _aead_input(payload), None)
 
     def _classical_sign(self, data: bytes, signing_keypair: PQCKeyPair) -> Signature:
-        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
-
-        private_key = Ed25519PrivateKey.from_private_bytes(signing_keypair.secret_key)
+        private_key = self._ed25519_by_secret.get(signing_keypair.secret_key)
+        if private_key is None:
+            private_key = Ed25519PrivateKey.from_private_bytes(signing_keypair.secret_key)
+            self._remember(self._ed25519_by_secret, signing_keypair.secret_key, private_key)
         signature_bytes = private_key.sign(data)
         return Signature(
             signature=signature_bytes,
@@ -328,8 +461,6 @@ class PQCEngine:
         )
 
     def _classical_verify(self, data: bytes, signature: Signature, public_key: PQCKeyPair) -> bool:
-        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
-
         pub = Ed25519PublicKey.from_public_bytes(public_key.public_key)
         try:
             pub.verify(signature.signature, data)
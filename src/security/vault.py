@@ -3,18 +3,114 @@ Encrypted Credential Vault
 
 PQC-encrypted key-value store for secrets.
 """
+import binascii
 import json
+import mmap
 import os
+import struct
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from loguru import logger
 
 from .pqc import PQCEngine, PQCKeyPair, EncryptedPayload
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-@dataclass
+_ENTRY_KEY_INFO = b"ccp-vault-entry:"
+
+# vault.enc is a binary frame: magic, then length-prefixed header fields
+# (algorithm, key_id, KEM ciphertext, entry count) and per entry: name,
+# created/updated timestamps, 12-byte nonce, AES-GCM ciphertext
+_VAULT_MAGIC = b"CCPV\x03"
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_TIMESTAMPS = struct.Struct("<dd")
+_NONCE_SIZE = 12
+# vault.enc files at least this large are memory-mapped rather than read
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+def _dumps(obj: Any) -> bytes:
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _loads(data: bytes) -> Any:
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _b64(data: bytes) -> str:
+    return binascii.b2a_base64(data, newline=False).decode("ascii")
+
+
+def _read_json(path: str) -> Any:
+    with open(path, "rb") as f:
+        return _loads(f.read())
+
+
+class _FrameReader:
+    """Sequential reader over a vault.enc binary frame"""
+
+    def __init__(self, buf: bytes | mmap.mmap, offset: int = 0):
+        self._buf = buf
+        self._offset = offset
+
+    def take(self, size: int) -> bytes:
+        end = self._offset + size
+        if end > len(self._buf):
+            raise ValueError("Vault file truncated")
+        data = self._buf[self._offset:end]
+        self._offset = end
+        return data
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        return fmt.unpack(self.take(fmt.size))
+
+    def blob16(self) -> bytes:
+        return self.take(self.unpack(_U16)[0])
+
+    def blob32(self) -> bytes:
+        return self.take(self.unpack(_U32)[0])
+
+
+_WRITE_FLAGS = (
+    os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+)
+
+
+def _write_atomic(path: str, payload: bytes, mode: Optional[int] = None) -> None:
+    """Write payload to a temp file, fsync it, then rename over path.
+
+    Set CCP_VAULT_NO_FSYNC=1 to skip the fsync (e.g. in tests).
+    """
+    tmp_path = path + ".tmp"
+    fd = os.open(tmp_path, _WRITE_FLAGS, 0o666 if mode is None else mode)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+        if os.getenv("CCP_VAULT_NO_FSYNC") != "1":
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+    if mode is not None:
+        os.chmod(tmp_path, mode)  # the create mode is ignored for a stale temp file
+    os.replace(tmp_path, path)
+
+
+@dataclass(slots=True)
 class VaultEntry:
     """Single vault entry"""
     key: str
@@ -27,15 +123,34 @@ class SecureVault:
     """
     PQC-encrypted credential vault.
 
-    Stores secrets encrypted with hybrid KEM + AES-256-GCM.
+    Stores secrets encrypted with hybrid KEM + AES-256-GCM. A single KEM
+    encapsulation per keypair yields the vault secret; each entry is sealed
+    with AES-256-GCM under a subkey derived from that secret and the entry
+    name, so writes and key rotation cost one KEM operation, not one per entry.
+
+    An existing PQCEngine and KEM keypair may be passed in. The keypair is
+    only used when vault_dir has no vault.keys yet (in place of generating
+    one); keys already on disk always win.
     """
 
-    def __init__(self, vault_dir: str = ".ccp_vault"):
+    def __init__(
+        self,
+        vault_dir: str = ".ccp_vault",
+        pqc_engine: Optional[PQCEngine] = None,
+        kem_keypair: Optional[PQCKeyPair] = None,
+    ):
         self._vault_dir = vault_dir
-        self._engine = PQCEngine()
+        self._vault_path = os.path.join(vault_dir, "vault.enc")
+        self._keys_path = os.path.join(vault_dir, "vault.keys")
+        self._engine = pqc_engine or PQCEngine()
+        self._initial_keypair = kem_keypair
         self._kem_keypair: Optional[PQCKeyPair] = None
         self._entries: dict[str, VaultEntry] = {}
         self._initialized = False
+        # Vault secret: KEM ciphertext (stored once in vault.enc) and shared secret
+        self._kem_ciphertext: Optional[bytes] = None
+        self._shared_secret: Optional[bytes] = None
+        self._entry_aead: dict[str, AESGCM] = {}
 
     @property
     def initialized(self) -> bool:
@@ -45,30 +160,35 @@ class SecureVault:
         """Initialize vault: create directory, generate keys"""
         os.makedirs(self._vault_dir, exist_ok=True)
 
-        keys_path = os.path.join(self._vault_dir, "vault.keys")
-        if os.path.exists(keys_path):
-            self._load_keys(keys_path)
+        if os.path.exists(self._keys_path):
+            self._load_keys(self._keys_path)
             logger.info("Vault: loaded existing keys")
+        elif self._initial_keypair is not None:
+            self._kem_keypair = self._initial_keypair
+            self._save_keys(self._keys_path)
+            logger.info("Vault: using provided keypair")
         else:
             self._kem_keypair = self._engine.generate_kem_keypair()
-            self._save_keys(keys_path)
+            self._save_keys(self._keys_path)
             logger.info("Vault: generated new keypair")
 
         # Load existing entries
-        vault_path = os.path.join(self._vault_dir, "vault.enc")
-        if os.path.exists(vault_path):
+        if os.path.exists(self._vault_path):
             self.load()
+        if self._shared_secret is None:
+            self._new_vault_secret()
 
         self._initialized = True
 
     def set(self, key: str, value: str) -> None:
         """Encrypt and store a value"""
         self._ensure_initialized()
-        encrypted = self._engine.encrypt(value.encode(), self._kem_keypair)
+        encrypted = self._seal(key, value.encode())
         now = time.time()
-        if key in self._entries:
-            self._entries[key].encrypted_value = encrypted
-            self._entries[key].updated_at = now
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.encrypted_value = encrypted
+            entry.updated_at = now
         else:
             self._entries[key] = VaultEntry(
                 key=key,
@@ -76,7 +196,7 @@ class SecureVault:
                 created_at=now,
                 updated_at=now,
             )
-        self.save()
+        self._write_vault()
 
     def get(self, key: str) -> Optional[str]:
         """Decrypt and return a value"""
@@ -84,15 +204,15 @@ class SecureVault:
         entry = self._entries.get(key)
         if entry is None:
             return None
-        plaintext = self._engine.decrypt(entry.encrypted_value, self._kem_keypair)
-        return plaintext.decode()
+        return self._open(key, entry.encrypted_value).decode()
 
     def delete(self, key: str) -> bool:
         """Delete a key"""
         self._ensure_initialized()
         if key in self._entries:
             del self._entries[key]
-            self.save()
+            self._entry_aead.pop(key, None)
+            self._write_vault()
             return True
         return False
 
@@ -101,6 +221,16 @@ class SecureVault:
         self._ensure_initialized()
         return list(self._entries.keys())
 
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Decrypt several values at once; missing keys are omitted"""
+        self._ensure_initialized()
+        entries = self._entries
+        return {
+            key: self._open(key, entries[key].encrypted_value).decode()
+            for key in keys
+            if key in entries
+        }
+
     def rotate_keys(self) -> None:
         """Generate new keypair and re-encrypt all entries"""
         self._ensure_initialized()
@@ -108,89 +238,173 @@ class SecureVault:
         # Decrypt all values with old key
         decrypted = {}
         for key, entry in self._entries.items():
-            plaintext = self._engine.decrypt(entry.encrypted_value, self._kem_keypair)
-            decrypted[key] = plaintext
+            decrypted[key] = self._open(key, entry.encrypted_value)
 
-        # Generate new keypair
+        # Generate new keypair and a vault secret under it (one encapsulation)
         self._kem_keypair = self._engine.generate_kem_keypair()
+        self._new_vault_secret()
 
         # Re-encrypt with new key
         now = time.time()
-        for key, plaintext in decrypted.items():
-            encrypted = self._engine.encrypt(plaintext, self._kem_keypair)
-            self._entries[key].encrypted_value = encrypted
-            self._entries[key].updated_at = now
+        for key, entry in self._entries.items():
+            entry.encrypted_value = self._seal(key, decrypted[key])
+            entry.updated_at = now
 
         # Save new keys and vault
-        keys_path = os.path.join(self._vault_dir, "vault.keys")
-        self._save_keys(keys_path)
-        self.save()
+        self._save_keys(self._keys_path)
+        self._write_vault()
         logger.info("Vault: key rotation complete")
 
     def save(self) -> None:
         """Persist vault to disk"""
         self._ensure_initialized()
-        vault_path = os.path.join(self._vault_dir, "vault.enc")
-        data = {}
+        self._write_vault()
+
+    def _write_vault(self) -> None:
+        # Callers have already checked initialization
+        algorithm = self._kem_keypair.algorithm.encode()
+        key_id = self._kem_keypair.key_id.encode()
+        parts = [
+            _VAULT_MAGIC,
+            _U16.pack(len(algorithm)), algorithm,
+            _U16.pack(len(key_id)), key_id,
+            _U32.pack(len(self._kem_ciphertext)), self._kem_ciphertext,
+            _U32.pack(len(self._entries)),
+        ]
         for key, entry in self._entries.items():
-            data[key] = {
-                "encrypted_value": entry.encrypted_value.to_dict(),
-                "created_at": entry.created_at,
-                "updated_at": entry.updated_at,
-            }
-        with open(vault_path, "w") as f:
-            json.dump(data, f)
+            name = key.encode()
+            payload = entry.encrypted_value
+            parts += (
+                _U16.pack(len(name)), name,
+                _TIMESTAMPS.pack(entry.created_at, entry.updated_at),
+                payload.nonce,
+                _U32.pack(len(payload.ciphertext)), payload.ciphertext,
+            )
+        _write_atomic(self._vault_path, b"".join(parts))
 
     def load(self) -> None:
         """Load vault from disk"""
-        vault_path = os.path.join(self._vault_dir, "vault.enc")
-        if not os.path.exists(vault_path):
+        if not os.path.exists(self._vault_path):
             return
-        with open(vault_path, "r") as f:
-            data = json.load(f)
-        for key, entry_data in data.items():
+        with open(self._vault_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+                self._load_buffer(f.read())
+                return
+            # Large vault: parse frames straight from the page cache instead
+            # of copying the whole file first (slices come out as bytes)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self._load_buffer(mm)
+
+    def _load_buffer(self, buf: bytes | mmap.mmap) -> None:
+        if buf[:len(_VAULT_MAGIC)] != _VAULT_MAGIC:
+            # JSON file from before the binary frame: per-entry KEM layout
+            self._load_legacy(_loads(buf[:]))
+            return
+
+        reader = _FrameReader(buf, len(_VAULT_MAGIC))
+        reader.blob16()  # algorithm, implied by the keypair
+        reader.blob16()  # key_id
+        self._open_vault_secret(reader.blob32())
+        (count,) = reader.unpack(_U32)
+        for _ in range(count):
+            key = reader.blob16().decode()
+            created_at, updated_at = reader.unpack(_TIMESTAMPS)
+            nonce = reader.take(_NONCE_SIZE)
             self._entries[key] = VaultEntry(
                 key=key,
-                encrypted_value=EncryptedPayload.from_dict(entry_data["encrypted_value"]),
-                created_at=entry_data["created_at"],
-                updated_at=entry_data["updated_at"],
+                encrypted_value=self._payload(nonce, reader.blob32()),
+                created_at=created_at,
+                updated_at=updated_at,
             )
 
     def get_for_settings(self) -> dict[str, str]:
         """Return all decrypted values as a dict for Settings integration"""
-        self._ensure_initialized()
-        result = {}
-        for key in self._entries:
-            val = self.get(key)
-            if val is not None:
-                result[key] = val
-        return result
+        return self.get_many(list(self._entries))
 
     def _ensure_initialized(self) -> None:
         if not self._initialized:
             raise RuntimeError("Vault not initialized. Call init() first.")
 
+    # ---- Vault secret / entry sealing ----
+
+    def _new_vault_secret(self) -> None:
+        kem_ciphertext, shared_secret = self._engine.encapsulate(self._kem_keypair)
+        self._set_vault_secret(kem_ciphertext, shared_secret)
+
+    def _open_vault_secret(self, kem_ciphertext: bytes) -> None:
+        shared_secret = self._engine.decapsulate(kem_ciphertext, self._kem_keypair)
+        self._set_vault_secret(kem_ciphertext, shared_secret)
+
+    def _set_vault_secret(self, kem_ciphertext: bytes, shared_secret: bytes) -> None:
+        self._kem_ciphertext = kem_ciphertext
+        self._shared_secret = shared_secret
+        self._entry_aead.clear()
+
+    def _aead(self, key: str) -> AESGCM:
+        aead = self._entry_aead.get(key)
+        if aead is None:
+            subkey = self._engine.derive_key(self._shared_secret, _ENTRY_KEY_INFO + key.encode())
+            aead = self._entry_aead[key] = AESGCM(subkey)
+        return aead
+
+    def _payload(self, nonce: bytes, ciphertext: bytes) -> EncryptedPayload:
+        return EncryptedPayload(
+            kem_ciphertext=self._kem_ciphertext,
+            nonce=nonce,
+            ciphertext=ciphertext,
+            tag=b"",
+            algorithm=f"{self._kem_keypair.algorithm}+AES-256-GCM",
+            key_id=self._kem_keypair.key_id,
+        )
+
+    def _seal(self, key: str, plaintext: bytes) -> EncryptedPayload:
+        nonce = os.urandom(12)
+        return self._payload(nonce, self._aead(key).encrypt(nonce, plaintext, None))
+
+    def _open(self, key: str, payload: EncryptedPayload) -> bytes:
+        return self._aead(key).decrypt(payload.nonce, payload.ciphertext, None)
+
+    def _load_legacy(self, data: dict[str, Any]) -> None:
+        """Migrate a per-entry-KEM vault file: decrypt each entry once, reseal"""
+        if self._shared_secret is None:
+            self._new_vault_secret()
+        payloads = [EncryptedPayload.from_dict(e["encrypted_value"]) for e in data.values()]
+
+        def decrypt(payload: EncryptedPayload) -> bytes:
+            return self._engine.decrypt(payload, self._kem_keypair)
+
+        # One KEM decapsulation per legacy entry; liboqs runs them outside the GIL
+        if len(payloads) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(payloads), os.cpu_count() or 1)) as pool:
+                plaintexts = list(pool.map(decrypt, payloads))
+        else:
+            plaintexts = [decrypt(p) for p in payloads]
+
+        for (key, entry_data), plaintext in zip(data.items(), plaintexts):
+            self._entries[key] = VaultEntry(
+                key=key,
+                encrypted_value=self._seal(key, plaintext),
+                created_at=entry_data["created_at"],
+                updated_at=entry_data["updated_at"],
+            )
+        logger.info(f"Vault: migrated {len(data)} entries to single-encapsulation format")
+
     def _save_keys(self, path: str) -> None:
-        import base64
         data = {
             "algorithm": self._kem_keypair.algorithm,
-            "public_key": base64.b64encode(self._kem_keypair.public_key).decode(),
-            "secret_key": base64.b64encode(self._kem_keypair.secret_key).decode(),
+            "public_key": _b64(self._kem_keypair.public_key),
+            "secret_key": _b64(self._kem_keypair.secret_key),
             "key_id": self._kem_keypair.key_id,
             "created_at": self._kem_keypair.created_at,
         }
-        with open(path, "w") as f:
-            json.dump(data, f)
-        os.chmod(path, 0o600)
+        _write_atomic(path, _dumps(data), mode=0o600)
 
     def _load_keys(self, path: str) -> None:
-        import base64
-        with open(path, "r") as f:
-            data = json.load(f)
+        data = _read_json(path)
         self._kem_keypair = PQCKeyPair(
             algorithm=data["algorithm"],
-            public_key=base64.b64decode(data["public_key"]),
-            secret_key=base64.b64decode(data["secret_key"]),
+            public_key=binascii.a2b_base64(data["public_key"]),
+            secret_key=binascii.a2b_base64(data["secret_key"]),
             key_id=data["key_id"],
             created_at=data["created_at"],
         )
@@ -9,7 +9,7 @@ from typing import Any, Callable, Coroutine, Optional
 from loguru import logger
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """Immutable event data"""
     event_type: str
@@ -41,12 +41,22 @@ class EventBus:
         await bus.publish(Event("proxy.failure", "proxy_manager", {"reason": "timeout"}))
     """
 
-    def __init__(self, max_history: int = 1000):
+    def __init__(self, max_history: int = 1000, max_concurrent_handlers: Optional[int] = None):
+        """
+        Args:
+            max_history: Number of recent events kept in memory
+            max_concurrent_handlers: Cap on handlers running at once across all
+                publishes (None = unbounded). Handlers that publish and await
+                nested events hold their slot meanwhile, so leave headroom.
+        """
         self._subscribers: dict[str, list[EventHandler]] = defaultdict(list)
         self._wildcard_subscribers: list[EventHandler] = []
         self._history: deque[Event] = deque(maxlen=max_history)
         self._max_history = max_history
         self._lock = asyncio.Lock()
+        self._handler_slots: Optional[asyncio.Semaphore] = (
+            asyncio.Semaphore(max_concurrent_handlers) if max_concurrent_handlers else None
+        )
 
     def subscribe(self, event_type: str, handler: EventHandler) -> None:
         """
@@ -74,8 +84,11 @@ class EventBus:
                 self._wildcard_subscribers.remove(handler)
                 return True
         else:
-            if handler in self._subscribers[event_type]:
-                self._subscribers[event_type].remove(handler)
+            handlers = self._subscribers.get(event_type)
+            if handlers and handler in handlers:
+                handlers.remove(handler)
+                if not handlers:
+                    del self._subscribers[event_type]
                 return True
         return False
 
@@ -91,20 +104,44 @@ class EventBus:
         """
         self._history.append(event)
 
-        handlers = list(self._subscribers.get(event.event_type, []))
-        handlers.extend(self._wildcard_subscribers)
-
+        count = await self._dispatch(event)
+        if count:
+            logger.debug("Published '{}' to {} handlers", event.event_type, count)
+        else:
+            logger.debug("No subscribers for '{}'", event.event_type)
+        return count
+
+    async def _dispatch(self, event: Event) -> int:
+        """Run the local handlers for an event; returns how many ran"""
+        # Exact subscribers and "*" subscribers are already indexed separately,
+        # so dispatch is one dict probe; only concatenate when both are present
+        exact = self._subscribers.get(event.event_type)
+        wildcard = self._wildcard_subscribers
+        handlers = exact + wildcard if exact and wildcard else exact or wildcard
         if not handlers:
-            logger.debug(f"No subscribers for '{event.event_type}'")
             return 0
 
-        tasks = [self._safe_call(handler, event) for handler in handlers]
-        await asyncio.gather(*tasks)
-        logger.debug(f"Published '{event.event_type}' to {len(handlers)} handlers")
-        return len(handlers)
+        # handlers may be a live subscriber list; count it before any handler
+        # runs, since a handler may (un)subscribe
+        count = len(handlers)
+        if count == 1:
+            await self._safe_call(handlers[0], event)
+        else:
+            # The coroutines are created before any handler runs, so handlers
+            # may (un)subscribe without affecting this dispatch
+            await asyncio.gather(*[self._safe_call(handler, event) for handler in handlers])
+        return count
 
     async def _safe_call(self, handler: EventHandler, event: Event) -> None:
         """Call handler with error handling"""
+        if self._handler_slots is not None:
+            async with self._handler_slots:
+                await self._call_handler(handler, event)
+        else:
+            await self._call_handler(handler, event)
+
+    @staticmethod
+    async def _call_handler(handler: EventHandler, event: Event) -> None:
         try:
             await handler(event)
         except Exception as e:
@@ -169,8 +206,9 @@ class RedisEventBus(EventBus):
         channel_prefix: str = "ccp:events:",
         max_history: int = 1000,
         history_ttl: int = 3600,  # 1 hour
+        max_concurrent_handlers: Optional[int] = None,
     ):
-        super().__init__(max_history)
+        super().__init__(max_history, max_concurrent_handlers)
 
         self._redis_url = redis_url
         self._channel_prefix = channel_prefix
@@ -228,14 +266,7 @@ class RedisEventBus(EventBus):
                 logger.error(f"Redis publish failed: {e}")
 
         # Call local handlers
-        handlers = list(self._subscribers.get(event.event_type, []))
-        handlers.extend(self._wildcard_subscribers)
-
-        if handlers:
-            tasks = [self._safe_call(handler, event) for handler in handlers]
-            await asyncio.gather(*tasks)
-
-        return len(handlers)
+        return await self._dispatch(event)
 
     async def start_listening(self) -> None:
         """Start listening for Redis events"""
@@ -292,12 +323,7 @@ class RedisEventBus(EventBus):
             )
 
             # Call local handlers (skip publish to avoid loop)
-            handlers = list(self._subscribers.get(event.event_type, []))
-            handlers.extend(self._wildcard_subscribers)
-
-            if handlers:
-                tasks = [self._safe_call(handler, event) for handler in handlers]
-                await asyncio.gather(*tasks)
+            await self._dispatch(event)
 
         except Exception as e:
             logger.error(f"Failed to handle Redis message: {e}")
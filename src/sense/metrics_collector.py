@@ -71,10 +71,16 @@ class MetricsCollector:
             tags: Optional key-value tags
         """
         metric = Metric(name=name, value=value, tags=tags or {})
-        if name not in self._metrics:
-            self._metrics[name] = deque(maxlen=self._max_points)
-        self._metrics[name].append(metric)
-        logger.debug(f"Recorded metric: {name}={value}")
+        points = self._metrics.get(name)
+        if points is None:
+            points = self._metrics[name] = deque(maxlen=self._max_points)
+        else:
+            # Points are appended in time order: drop expired ones from the left
+            cutoff = metric.timestamp - self._retention_seconds
+            while points and points[0].timestamp < cutoff:
+                points.popleft()
+        points.append(metric)
+        logger.debug("Recorded metric: {}={}", name, value)
 
     def increment(self, name: str, value: float = 1.0) -> float:
         """
@@ -115,35 +121,45 @@ class MetricsCollector:
         Returns:
             AggregatedMetric or None if no data
         """
-        if name not in self._metrics:
+        points = self._metrics.get(name)
+        if not points:
             return None
 
-        now = time.time()
-        cutoff = now - window.total_seconds()
-
-        points = [
-            m for m in self._metrics[name]
-            if m.timestamp >= cutoff
-        ]
-
-        if tags:
-            points = [
-                m for m in points
-                if all(m.tags.get(k) == v for k, v in tags.items())
-            ]
-
-        if not points:
+        window_seconds = window.total_seconds()
+        cutoff = time.time() - window_seconds
+        tag_items = tags.items() if tags else ()
+
+        # Walk back from the newest point and stop at the first one outside
+        # the window, so the cost tracks the window, not the whole series
+        count = 0
+        total = 0.0
+        lo = hi = 0.0
+        for m in reversed(points):
+            if m.timestamp < cutoff:
+                break
+            if tag_items and not all(m.tags.get(k) == v for k, v in tag_items):
+                continue
+            value = m.value
+            if count == 0:
+                lo = hi = value
+            elif value < lo:
+                lo = value
+            elif value > hi:
+                hi = value
+            count += 1
+            total += value
+
+        if count == 0:
             return None
 
-        values = [m.value for m in points]
         return AggregatedMetric(
             name=name,
-            count=len(values),
-            sum=sum(values),
-            min=min(values),
-            max=max(values),
-            avg=sum(values) / len(values),
-            window_seconds=window.total_seconds(),
+            count=count,
+            sum=total,
+            min=lo,
+            max=hi,
+            avg=total / count,
+            window_seconds=window_seconds,
         )
 
     def get_latest(self, name: str, count: int = 1) -> list[Metric]:
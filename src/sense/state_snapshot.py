@@ -2,6 +2,7 @@
 State Snapshot - System state capture
 """
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Any, Optional
 from datetime import timedelta
@@ -63,7 +64,7 @@ class StateSnapshot:
         self._event_bus = event_bus
         self._metrics = metrics_collector
         self._max_history = max_history
-        self._history: list[SystemState] = []
+        self._history: deque[SystemState] = deque(maxlen=max_history)
         self._current = SystemState()
 
     def update_proxy_stats(self, stats: dict[str, Any]) -> None:
@@ -129,12 +130,9 @@ class StateSnapshot:
             error_count=state.error_count,
             success_count=state.success_count,
         )
-        self._history.append(snapshot)
+        self._history.append(snapshot)  # deque drops the oldest past max_history
 
-        if len(self._history) > self._max_history:
-            self._history = self._history[-self._max_history:]
-
-        logger.debug(f"Saved state snapshot at {snapshot.timestamp}")
+        logger.debug("Saved state snapshot at {}", snapshot.timestamp)
         return snapshot
 
     def get_history(
@@ -149,11 +147,11 @@ class StateSnapshot:
             window: Optional time window filter
             limit: Maximum snapshots to return
         """
-        states = self._history
-
         if window:
             cutoff = time.time() - window.total_seconds()
-            states = [s for s in states if s.timestamp >= cutoff]
+            states = [s for s in self._history if s.timestamp >= cutoff]
+        else:
+            states = list(self._history)
 
         return states[-limit:]
 
@@ -211,4 +209,4 @@ class StateSnapshot:
 
     def clear_history(self) -> None:
         """Clear state history"""
-        self._history = []
+        self._history.clear()
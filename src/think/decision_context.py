@@ -6,7 +6,7 @@ from typing import Any, Optional
 from ..sense import SystemState, Event
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskContext:
     """Context for a specific task"""
     task_id: str
@@ -30,7 +30,7 @@ class TaskContext:
         return self.retry_count == 0
 
 
-@dataclass
+@dataclass(slots=True)
 class DecisionContext:
     """
     Complete context for decision making.
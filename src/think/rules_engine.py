@@ -1,6 +1,7 @@
 """
 Rules Engine - Rule-based decision making
 """
+import bisect
 from dataclasses import dataclass, field
 from typing import Callable, Optional, Any
 from loguru import logger
@@ -52,6 +53,10 @@ class Rule:
         return None
 
 
+def _descending_priority(rule: Rule) -> int:
+    return -rule.priority
+
+
 class RulesEngine:
     """
     Rule-based decision engine.
@@ -87,9 +92,10 @@ class RulesEngine:
 
     def add_rule(self, rule: Rule) -> None:
         """Add a rule to the engine"""
-        self._rules.append(rule)
-        self._rules.sort(key=lambda r: r.priority, reverse=True)
-        logger.debug(f"Added rule: {rule.name} (priority={rule.priority})")
+        # Keep sorted by priority (higher first); equal priorities stay in
+        # insertion order, so evaluate_first stops at the first match
+        bisect.insort(self._rules, rule, key=_descending_priority)
+        logger.debug("Added rule: {} (priority={})", rule.name, rule.priority)
 
     def remove_rule(self, name: str) -> bool:
         """
@@ -120,7 +126,7 @@ class RulesEngine:
             decision = rule.evaluate(context)
             if decision:
                 decisions.append(decision)
-                logger.debug(f"Rule '{rule.name}' triggered: {decision.action}")
+                logger.debug("Rule '{}' triggered: {}", rule.name, decision.action)
 
         return decisions
 
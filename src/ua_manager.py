@@ -4,6 +4,7 @@ User Agent Manager - Manages browser fingerprints and user agents with area-awar
 Supports GoLogin API for realistic browser fingerprints (UA, viewport, platform).
 Falls back to fake_useragent when GoLogin is not configured or API fails.
 """
+import functools
 import random
 from collections import OrderedDict
 from dataclasses import dataclass
@@ -14,7 +15,7 @@ from fake_useragent import UserAgent
 from loguru import logger
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BrowserProfile:
     """Browser profile with consistent fingerprint settings"""
 
@@ -149,28 +150,29 @@ class LRUCache:
 
     def get(self, key: str) -> Optional[any]:
         """Get item and move to end (most recently used)"""
-        if key in self._cache:
+        try:
+            # Raises KeyError for missing keys: one C call for lookup + reorder
             self._cache.move_to_end(key)
-            return self._cache[key]
-        return None
+        except KeyError:
+            return None
+        return self._cache[key]
 
     def set(self, key: str, value: any) -> None:
         """Set item, evicting oldest if at capacity"""
-        if key in self._cache:
-            self._cache.move_to_end(key)
-        else:
-            if len(self._cache) >= self._max_size:
-                oldest = next(iter(self._cache))
-                del self._cache[oldest]
-                logger.debug(f"LRU evicted: {oldest}")
-        self._cache[key] = value
+        cache = self._cache
+        if key in cache:
+            cache.move_to_end(key)
+        elif len(cache) >= self._max_size:
+            cache.popitem(last=False)
+        cache[key] = value
 
     def delete(self, key: str) -> bool:
         """Delete item if exists"""
-        if key in self._cache:
+        try:
             del self._cache[key]
-            return True
-        return False
+        except KeyError:
+            return False
+        return True
 
     def __contains__(self, key: str) -> bool:
         return key in self._cache
@@ -183,33 +185,47 @@ class LRUCache:
         self._cache.clear()
 
 
+# Browser names fake_useragent's UserAgent.chrome draws from
+_CHROME_BROWSERS = ("Chrome", "Chrome Mobile", "Chrome Mobile iOS")
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_user_agent() -> UserAgent:
+    """UserAgent() re-reads the bundled dataset (~40 ms); it is read-only, so share one"""
+    return UserAgent()
+
+
 class UserAgentManager:
     """Manages user agents and browser profiles with LRU caching"""
 
     MAX_CACHED_PROFILES = 100
 
-    VIEWPORTS = [
+    VIEWPORTS = (
         (1920, 1080),
         (1366, 768),
         (1536, 864),
         (1440, 900),
         (1280, 720),
         (2560, 1440),
-    ]
+    )
 
-    LOCALES = ["en-US", "en-GB", "de-DE", "fr-FR", "ja-JP", "es-ES"]
+    LOCALES = ("en-US", "en-GB", "de-DE", "fr-FR", "ja-JP", "es-ES")
 
-    TIMEZONES = [
+    TIMEZONES = (
         "America/New_York",
         "America/Los_Angeles",
         "Europe/London",
         "Europe/Berlin",
         "Asia/Tokyo",
         "Australia/Sydney",
-    ]
+    )
 
     def __init__(self, max_cached_profiles: int = MAX_CACHED_PROFILES, gologin_token: str = ""):
-        self._ua = UserAgent()
+        self._ua = _shared_user_agent()
+        self._rng = random.Random()
+        # fake_useragent re-filters its whole dataset on every .random/.chrome
+        # (~3.5 ms); the filtered UA strings are fixed per instance, so keep them
+        self._ua_candidates: dict[Optional[tuple[str, ...]], tuple[str, ...]] = {}
         self._profiles = LRUCache(max_size=max_cached_profiles)
         self._gologin: GoLoginClient | None = None
         if gologin_token:
@@ -234,6 +250,23 @@ class UserAgentManager:
             return "Linux x86_64"
         return "Windows"
 
+    def _random_ua(self, browsers: Optional[tuple[str, ...]] = None) -> str:
+        """Uniform pick from fake_useragent's filtered candidates (all browsers if None)"""
+        candidates = self._ua_candidates.get(browsers)
+        if candidates is None:
+            try:
+                filtered = self._ua._filter_useragents(list(browsers) if browsers else None)
+                candidates = tuple(entry["useragent"] for entry in filtered)
+            except (AttributeError, KeyError, TypeError):
+                # fake_useragent internals changed: use its public API per call
+                candidates = ()
+            self._ua_candidates[browsers] = candidates
+        if candidates:
+            return self._rng.choice(candidates)
+        if browsers:
+            return self._ua[list(browsers)]
+        return self._ua.random
+
     def _fetch_gologin_fingerprint(self) -> dict | None:
         """Fetch fingerprint from GoLogin if available."""
         if not self._gologin:
@@ -257,11 +290,11 @@ class UserAgentManager:
         if parsed:
             vw, vh = parsed
         else:
-            vw, vh = random.choice(self.VIEWPORTS)
+            vw, vh = self._rng.choice(self.VIEWPORTS)
 
         platform = nav.get("platform", "") or self._platform_from_ua(ua_string)
-        locale = locale_override or nav.get("language", "") or random.choice(self.LOCALES)
-        timezone = timezone_override or random.choice(self.TIMEZONES)
+        locale = locale_override or nav.get("language", "") or self._rng.choice(self.LOCALES)
+        timezone = timezone_override or self._rng.choice(self.TIMEZONES)
 
         return BrowserProfile(
             user_agent=ua_string,
@@ -272,6 +305,37 @@ class UserAgentManager:
             platform=platform,
         )
 
+    def _fallback_profile(
+        self,
+        ua_string: str,
+        locale: str = "",
+        timezone: str = "",
+        platform: str = "",
+    ) -> BrowserProfile:
+        """Build a profile around a fake_useragent UA, filling unset fields randomly"""
+        width, height = self._rng.choice(self.VIEWPORTS)
+        return BrowserProfile(
+            user_agent=ua_string,
+            viewport_width=width,
+            viewport_height=height,
+            locale=locale or self._rng.choice(self.LOCALES),
+            timezone=timezone or self._rng.choice(self.TIMEZONES),
+            platform=platform or self._platform_from_ua(ua_string),
+        )
+
+    def _gologin_profile(self, locale: str = "", timezone: str = "") -> BrowserProfile | None:
+        """Profile from a GoLogin fingerprint, or None when unavailable/unusable"""
+        fp = self._fetch_gologin_fingerprint()
+        if not fp:
+            return None
+        return self._build_profile_from_fingerprint(fp, locale_override=locale, timezone_override=timezone)
+
+    def _remember(self, session_id: Optional[str], profile: BrowserProfile, detail: str = "") -> None:
+        """Cache a profile as sticky for its session"""
+        if session_id:
+            self._profiles.set(session_id, profile)
+            logger.debug("Created browser profile for session {}{}", session_id, detail)
+
     def get_random_profile(self, session_id: Optional[str] = None) -> BrowserProfile:
         """Generate a random but consistent browser profile"""
         # If session_id provided and profile exists, return cached
@@ -280,37 +344,9 @@ class UserAgentManager:
             if cached:
                 return cached
 
-        # Try GoLogin fingerprint first
-        fp = self._fetch_gologin_fingerprint()
-        if fp:
-            profile = self._build_profile_from_fingerprint(fp)
-            if profile:
-                if session_id:
-                    self._profiles.set(session_id, profile)
-                    logger.debug(f"Created GoLogin profile for session {session_id}")
-                return profile
-
-        # Fallback: fake_useragent
-        ua_string = self._ua.random
-        viewport = random.choice(self.VIEWPORTS)
-        locale = random.choice(self.LOCALES)
-        timezone = random.choice(self.TIMEZONES)
-        platform = self._platform_from_ua(ua_string)
-
-        profile = BrowserProfile(
-            user_agent=ua_string,
-            viewport_width=viewport[0],
-            viewport_height=viewport[1],
-            locale=locale,
-            timezone=timezone,
-            platform=platform,
-        )
-
-        # Cache if session_id provided
-        if session_id:
-            self._profiles.set(session_id, profile)
-            logger.debug(f"Created browser profile for session {session_id}")
-
+        # Try GoLogin fingerprint first, fall back to fake_useragent
+        profile = self._gologin_profile() or self._fallback_profile(self._random_ua())
+        self._remember(session_id, profile)
         return profile
 
     def get_area_profile(
@@ -336,41 +372,19 @@ class UserAgentManager:
         area_data = AREA_PROFILES.get(area_lower)
 
         if area_data:
-            locale = random.choice(area_data["locales"])
-            tz = timezone or random.choice(area_data["timezones"])
+            locale = self._rng.choice(area_data["locales"])
+            tz = timezone or self._rng.choice(area_data["timezones"])
         else:
-            locale = random.choice(self.LOCALES)
-            tz = timezone or random.choice(self.TIMEZONES)
+            locale = self._rng.choice(self.LOCALES)
+            tz = timezone or self._rng.choice(self.TIMEZONES)
             logger.warning(f"Unknown area '{area}', using random locale/timezone")
 
-        # Try GoLogin fingerprint with area locale/timezone override
-        fp = self._fetch_gologin_fingerprint()
-        if fp:
-            profile = self._build_profile_from_fingerprint(fp, locale_override=locale, timezone_override=tz)
-            if profile:
-                if session_id:
-                    self._profiles.set(session_id, profile)
-                    logger.debug(f"Created GoLogin area profile for session {session_id}: area={area}, tz={tz}")
-                return profile
-
-        # Fallback: fake_useragent
-        ua_string = self._ua.random
-        viewport = random.choice(self.VIEWPORTS)
-        platform = self._platform_from_ua(ua_string)
-
-        profile = BrowserProfile(
-            user_agent=ua_string,
-            viewport_width=viewport[0],
-            viewport_height=viewport[1],
-            locale=locale,
-            timezone=tz,
-            platform=platform,
+        # GoLogin fingerprint with area locale/timezone override, else fake_useragent
+        profile = (
+            self._gologin_profile(locale=locale, timezone=tz)
+            or self._fallback_profile(self._random_ua(), locale=locale, timezone=tz)
         )
-
-        if session_id:
-            self._profiles.set(session_id, profile)
-            logger.debug(f"Created area profile for session {session_id}: area={area}, tz={tz}")
-
+        self._remember(session_id, profile, f": area={area}, tz={tz}")
         return profile
 
     def get_chrome_profile(self, session_id: Optional[str] = None) -> BrowserProfile:
@@ -380,33 +394,9 @@ class UserAgentManager:
             if cached:
                 return cached
 
-        # Try GoLogin fingerprint (already Chrome-like)
-        fp = self._fetch_gologin_fingerprint()
-        if fp:
-            profile = self._build_profile_from_fingerprint(fp)
-            if profile:
-                if session_id:
-                    self._profiles.set(session_id, profile)
-                return profile
-
-        # Fallback: fake_useragent Chrome
-        ua_string = self._ua.chrome
-        viewport = random.choice(self.VIEWPORTS)
-        locale = random.choice(self.LOCALES)
-        timezone = random.choice(self.TIMEZONES)
-
-        profile = BrowserProfile(
-            user_agent=ua_string,
-            viewport_width=viewport[0],
-            viewport_height=viewport[1],
-            locale=locale,
-            timezone=timezone,
-            platform="Windows",
-        )
-
-        if session_id:
-            self._profiles.set(session_id, profile)
-
+        # GoLogin fingerprint (already Chrome-like), else fake_useragent Chrome
+        profile = self._gologin_profile() or self._fallback_profile(self._random_ua(_CHROME_BROWSERS), platform="Windows")
+        self._remember(session_id, profile)
         return profile
 
     def clear_session(self, session_id: str) -> None:
@@ -2,6 +2,7 @@
 Web Agent - Main interface for web automation with proxy and UA rotation
 """
 import asyncio
+from functools import partial
 from typing import Optional, Any, TYPE_CHECKING
 from loguru import logger
 from pydantic import BaseModel, Field, ConfigDict
@@ -39,6 +40,17 @@ class AgentConfig(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
 
+async def _navigate_task(worker: BrowserWorker, url: str) -> WorkerResult:
+    """Navigate to url and merge the page content into the result data"""
+    result = await worker.navigate(url)
+    if result.success:
+        content = await worker.get_content()
+        if content.success:
+            # navigate() returns a fresh dict per call, safe to extend in place
+            result.data.update(content.data)
+    return result
+
+
 class WebAgent:
     """
     Web automation agent with proxy rotation and user agent management.
@@ -115,33 +127,12 @@ class WebAgent:
     async def navigate(self, url: str) -> TaskResult:
         """Navigate to URL with single worker"""
         self._check_closed()
-
-        async def task(worker: BrowserWorker) -> WorkerResult:
-            result = await worker.navigate(url)
-            if result.success:
-                content = await worker.get_content()
-                if content.success:
-                    result.data = {**result.data, **content.data}
-            return result
-
-        return await self.controller.run_task("single", task)
+        return await self.controller.run_task("single", partial(_navigate_task, url=url))
 
     async def parallel_navigate(self, urls: list[str]) -> list[TaskResult]:
         """Navigate to multiple URLs in parallel"""
         self._check_closed()
-
-        def make_task(url: str):
-            async def task(worker: BrowserWorker) -> WorkerResult:
-                result = await worker.navigate(url)
-                if result.success:
-                    content = await worker.get_content()
-                    if content.success:
-                        result.data = {**result.data, **content.data}
-                return result
-
-            return task
-
-        tasks = [(f"nav_{i}", make_task(url)) for i, url in enumerate(urls)]
+        tasks = [(f"nav_{i}", partial(_navigate_task, url=url)) for i, url in enumerate(urls)]
         return await self.controller.run_parallel(tasks)
 
     async def run_custom_task(
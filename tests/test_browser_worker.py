@@ -295,3 +295,26 @@ class TestBrowserWorker:
         )
         assert result.success is False
         assert result.error_type == ErrorType.VALIDATION
+
+    @pytest.mark.asyncio
+    async def test_new_context_without_start(self):
+        worker = BrowserWorker(worker_id="test")
+        with pytest.raises(RuntimeError):
+            await worker.new_context()
+
+    @pytest.mark.asyncio
+    async def test_new_context_replaces_context(self):
+        from unittest.mock import AsyncMock, MagicMock
+        worker = BrowserWorker(worker_id="test")
+        old_page, old_context = AsyncMock(), AsyncMock()
+        worker._page, worker._context = old_page, old_context
+        new_context = AsyncMock()
+        worker._browser = MagicMock()
+        worker._browser.new_context = AsyncMock(return_value=new_context)
+
+        await worker.new_context()
+
+        old_page.close.assert_awaited_once()
+        old_context.close.assert_awaited_once()
+        assert worker._context is new_context
+        assert worker._page is new_context.new_page.return_value
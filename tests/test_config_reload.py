@@ -5,6 +5,7 @@ import asyncio
 import os
 import tempfile
 import pytest
+from src import config_reload
 from src.config_reload import (
     ConfigReloader,
     ReloadPlan,
@@ -118,6 +119,27 @@ class TestConfigReloader:
         finally:
             os.unlink(path)
 
+    def test_detect_added_removed_and_empty_keys(self, tmp_path):
+        env = tmp_path / ".env"
+        env.write_text("SAME=1\nCHANGED=new\nADDED=x\nBLANK=\n")
+        reloader = ConfigReloader(env_path=str(env))
+        reloader._last_values = {"SAME": "1", "CHANGED": "old", "REMOVED": "y"}
+        # BLANK="" matches an absent key, as before
+        assert sorted(reloader._detect_changes()) == ["ADDED", "CHANGED", "REMOVED"]
+
+    def test_read_env_cached_until_file_changes(self, tmp_path):
+        env = tmp_path / ".env"
+        env.write_text("KEY1=value1\n")
+        reloader = ConfigReloader(env_path=str(env))
+        first = reloader._read_env()
+        assert reloader._read_env() is first
+        reloader._last_values = first
+        assert reloader._detect_changes() == []
+
+        env.write_text("KEY1=value22\n")
+        assert reloader._read_env() == {"KEY1": "value22"}
+        assert reloader._detect_changes() == ["KEY1"]
+
     def test_on_reload_callback(self):
         reloader = ConfigReloader()
         callbacks = []
@@ -127,3 +149,60 @@ class TestConfigReloader:
 
         reloader.on_reload(cb)
         assert len(reloader._callbacks) == 1
+
+    @pytest.mark.asyncio
+    async def test_notify_triggers_reload(self, tmp_path, monkeypatch):
+        env = tmp_path / ".env"
+        env.write_text("SLACK_BOT_TOKEN=old\n")
+        seen = {}
+
+        async def fake_awatch(path, watch_filter, debounce, stop_event):
+            seen["path"] = path
+            seen["accepts_env"] = watch_filter(None, str(env))
+            seen["debounce"] = debounce
+            env.write_text("SLACK_BOT_TOKEN=new\n")
+            yield {(2, str(env))}
+            await stop_event.wait()
+
+        monkeypatch.setattr(config_reload, "HAS_WATCHFILES", True)
+        monkeypatch.setattr(config_reload, "awatch", fake_awatch, raising=False)
+        plans = []
+
+        async def cb(plan):
+            plans.append(plan)
+
+        reloader = ConfigReloader(env_path=str(env))
+        reloader.on_reload(cb)
+        await reloader.start()
+        for _ in range(50):
+            if plans:
+                break
+            await asyncio.sleep(0.01)
+        await reloader.stop()
+
+        assert seen == {"path": str(tmp_path), "accepts_env": True, "debounce": 300}
+        assert plans[0].changed_keys == ["SLACK_BOT_TOKEN"]
+        assert plans[0].reload_channels
+
+    @pytest.mark.asyncio
+    async def test_notify_falls_back_to_polling(self, monkeypatch):
+        async def failing_awatch(*args, **kwargs):
+            raise FileNotFoundError("no such directory")
+            yield
+
+        polled = asyncio.Event()
+
+        async def fake_poll_loop():
+            polled.set()
+
+        monkeypatch.setattr(config_reload, "HAS_WATCHFILES", True)
+        monkeypatch.setattr(config_reload, "awatch", failing_awatch, raising=False)
+        reloader = ConfigReloader(env_path="/nonexistent/.env")
+        monkeypatch.setattr(reloader, "_poll_loop", fake_poll_loop)
+        await reloader.start()
+        await asyncio.wait_for(polled.wait(), 1)
+        await reloader.stop()
+
+    def test_notify_disabled(self, monkeypatch):
+        monkeypatch.setattr(config_reload, "HAS_WATCHFILES", True)
+        assert not ConfigReloader(use_notify=False)._use_notify
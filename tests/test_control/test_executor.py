@@ -23,6 +23,10 @@ class TestTask:
         d = task.to_dict()
         assert d["task_id"] == "t1"
 
+    def test_task_has_no_instance_dict(self):
+        task = Task(task_id="t1", task_type="nav", target="url")
+        assert not hasattr(task, "__dict__")
+
 
 class TestExecutionResult:
     """Tests for ExecutionResult dataclass"""
@@ -42,6 +46,10 @@ class TestExecutionResult:
         assert d["success"] is False
         assert d["error"] == "Failed"
 
+    def test_result_has_no_instance_dict(self):
+        result = ExecutionResult(task_id="t1", success=True, data="result")
+        assert not hasattr(result, "__dict__")
+
 
 class TestExecutor:
     """Tests for Executor"""
@@ -2,6 +2,7 @@
 Tests for Hook System
 """
 import asyncio
+import functools
 import pytest
 from src.hooks import (
     HookRunner,
@@ -88,6 +89,17 @@ class TestHookRunner:
         await runner.run_void(BEFORE_SENSE, {})
         assert "ok" in results
 
+    @pytest.mark.asyncio
+    async def test_run_void_single_hook_error_isolated(self):
+        runner = HookRunner()
+
+        async def bad_handler(event):
+            raise RuntimeError("boom")
+
+        runner.register(BEFORE_SENSE, bad_handler, plugin_id="bad")
+        # Single-hook fast path still swallows handler errors
+        await runner.run_void(BEFORE_SENSE, {})
+
     @pytest.mark.asyncio
     async def test_run_modifying_sequential(self):
         runner = HookRunner()
@@ -125,6 +137,58 @@ class TestHookRunner:
         result = await runner.run_modifying(BEFORE_THINK, {"data": "test"})
         assert result["processed"]
 
+    @pytest.mark.asyncio
+    async def test_run_modifying_mixed_sync_async(self):
+        runner = HookRunner()
+
+        def sync_add(event):
+            return {**event, "sync": True}
+
+        async def async_add(event):
+            return {**event, "async": True}
+
+        def sync_bad(event):
+            raise RuntimeError("fail")
+
+        runner.register(BEFORE_THINK, sync_add, priority=10)
+        runner.register(BEFORE_THINK, sync_bad, priority=5)
+        runner.register(BEFORE_THINK, async_add, priority=0)
+
+        result = await runner.run_modifying(BEFORE_THINK, {"original": True})
+        assert result == {"original": True, "sync": True, "async": True}
+
+    @pytest.mark.asyncio
+    async def test_run_void_sync_handler(self):
+        runner = HookRunner()
+        calls = []
+
+        runner.register(ON_CYCLE_START, lambda event: calls.append(event["n"]))
+        await runner.run_void(ON_CYCLE_START, {"n": 1})
+        assert calls == [1]
+
+    @pytest.mark.asyncio
+    async def test_async_callable_and_wrapped_handlers_are_awaited(self):
+        runner = HookRunner()
+        calls = []
+
+        class AsyncCallable:
+            async def __call__(self, event):
+                return {**event, "obj": True}
+
+        async def tagged(event, tag):
+            calls.append(tag)
+            return {**event, tag: True}
+
+        runner.register(BEFORE_THINK, AsyncCallable(), priority=10)
+        runner.register(BEFORE_THINK, functools.partial(tagged, tag="partial"), priority=5)
+        runner.register(BEFORE_THINK, lambda event: tagged(event, "lambda"), priority=0)
+        result = await runner.run_modifying(BEFORE_THINK, {})
+        assert result == {"obj": True, "partial": True, "lambda": True}
+
+        runner.register(ON_CYCLE_START, lambda event: tagged(event, "void"))
+        await runner.run_void(ON_CYCLE_START, {})
+        assert calls == ["partial", "lambda", "void"]
+
     @pytest.mark.asyncio
     async def test_run_modifying_no_hooks(self):
         runner = HookRunner()
@@ -150,6 +214,18 @@ class TestHookRunner:
         assert hooks[0].priority == 100
         assert hooks[1].priority == 0
 
+    def test_equal_priorities_keep_registration_order(self):
+        runner = HookRunner()
+        handlers = []
+        for priority in (0, 5, 0, 5, 10):
+            async def handler(event):
+                pass
+            handlers.append((priority, handler))
+            runner.register(ON_CYCLE_START, handler, priority=priority)
+
+        expected = [h for _, h in sorted(handlers, key=lambda p: p[0], reverse=True)]
+        assert [r.handler for r in runner._hooks[ON_CYCLE_START]] == expected
+
     def test_get_stats(self):
         runner = HookRunner()
 
@@ -1,4 +1,5 @@
 """Tests for human-likeness score module"""
+import json
 import time
 import pytest
 from src.human_score import HumanScoreTracker, HumanScoreReport, MetricResult
@@ -105,6 +106,27 @@ class TestHumanScoreTracker:
         assert h_t2.threshold_pass
         assert h_t2.points == 6
 
+    def test_h_t2_uses_supplied_now(self):
+        t = HumanScoreTracker(session_start=1_000_000.0)
+        report = t.compute(now=1_000_000.0 + 200 * 60)
+        h_t2 = next(m for m in report.metrics if m.metric_id == "H_T2")
+        assert h_t2.value == pytest.approx(200.0)
+        assert not h_t2.threshold_pass
+
+    def test_compute_reuses_metrics_until_new_event(self, monkeypatch):
+        t = HumanScoreTracker(session_start=1_000_000.0)
+        t.record_action("click", timestamp=1_000_000.0)
+        first = t.compute(now=1_000_060.0)
+        monkeypatch.setattr(t, "_h_g2", lambda: pytest.fail("recomputed"))
+        second = t.compute(now=1_000_000.0 + 200 * 60)
+        assert [m.metric_id for m in second.metrics] == [m.metric_id for m in first.metrics]
+        assert not next(m for m in second.metrics if m.metric_id == "H_T2").threshold_pass
+
+        monkeypatch.undo()
+        t.record_action("scroll", timestamp=1_000_005.0)
+        h_g2 = next(m for m in t.compute().metrics if m.metric_id == "H_G2")
+        assert h_g2.value == 1.0
+
     # -- H_T3: Night ratio --
 
     def test_h_t3_daytime_pass(self):
@@ -168,6 +190,35 @@ class TestHumanScoreTracker:
         h_n1 = next(m for m in report.metrics if m.metric_id == "H_N1")
         assert not h_n1.threshold_pass
 
+    def test_record_ip_explicit_timestamp(self):
+        t = HumanScoreTracker()
+        t.record_ip("1.2.3.4", "us", "fp", timestamp=123.0)
+        assert t._ips[0].timestamp == 123.0
+
+    def test_record_ips_matches_single_calls(self):
+        single = HumanScoreTracker(session_start=0.0)
+        bulk = HumanScoreTracker(session_start=0.0)
+        rows = [("1.2.3.4", "us", "fp1", 10.0), ("5.6.7.8", "jp", "fp2", 20.0)]
+        for row in rows:
+            single.record_ip(*row)
+        bulk.record_ips(rows)
+        assert bulk._ips == single._ips
+
+    def test_record_ips_defaults(self):
+        t = HumanScoreTracker()
+        t.record_ips([("1.2.3.4",)])
+        assert t._ips[0].country == ""
+        assert t._ips[0].timestamp > 0
+
+    def test_bulk_actions_and_outcomes(self):
+        t = HumanScoreTracker()
+        t.record_actions([("click", 100.0), ("scroll", None)])
+        t.record_outcomes(["success", "failure"])
+        assert t._action_types == ["click", "scroll"]
+        assert t._action_ts[0] == 100.0
+        assert t._action_ts[1] > 100.0
+        assert t._outcomes == ["success", "failure"]
+
     # -- H_N2: Geo jumps --
 
     def test_h_n2_rapid_jumps_fail(self):
@@ -259,6 +310,20 @@ class TestHumanScoreTracker:
         assert "metrics" in s
         assert "H_T1" in s["metrics"]
 
+    def test_summary_mutation_does_not_leak(self):
+        t = self._make_tracker_with_natural_data()
+        report = t.compute()
+        first = report.summary()
+        first["score"] = -1
+        first["metrics"]["H_T1"]["points"] = -1
+        del first["metrics"]["H_G1"]
+
+        again = report.summary()
+        assert again["score"] == report.total_score
+        assert again["metrics"]["H_T1"]["points"] != -1
+        assert "H_G1" in again["metrics"]
+        assert json.loads(report.to_json()) == again
+
     def test_str_output(self):
         t = self._make_tracker_with_natural_data()
         report = t.compute()
@@ -266,3 +331,8 @@ class TestHumanScoreTracker:
         assert "Human Score:" in text
         assert "H_T1" in text
         assert "H_S0" not in text  # H_S0 is composite, not in individual metrics
+
+    def test_to_json_matches_summary(self):
+        t = self._make_tracker_with_natural_data()
+        report = t.compute()
+        assert json.loads(report.to_json()) == report.summary()
@@ -0,0 +1,80 @@
+"""
+Tests for Logging Configuration
+"""
+import io
+import json
+import threading
+import time
+from loguru import logger
+from src.logging_config import AsyncLogSink, json_file_sink, _MAX_BATCH
+
+
+def _writer_threads() -> int:
+    return sum(t.name == "log-writer" for t in threading.enumerate())
+
+
+class SlowStream(io.BytesIO):
+    """In-memory stream whose writes stall like a slow stderr reader"""
+
+    def write(self, data):
+        time.sleep(0.001)
+        return super().write(data)
+
+
+class TestAsyncLogSink:
+    """Tests for AsyncLogSink"""
+
+    def test_flush_writes_more_than_one_batch(self):
+        stream = SlowStream()
+        sink = AsyncLogSink(stream)
+        count = _MAX_BATCH * 5 + 7
+        for i in range(count):
+            assert sink.put(b"%d\n" % i)
+
+        sink.flush()
+        lines = stream.getvalue().splitlines()
+        assert lines == [b"%d" % i for i in range(count)]
+        assert sink.dropped == 0
+        sink.close()
+
+    def test_close_drains_and_stops_writer(self):
+        stream = SlowStream()
+        sink = AsyncLogSink(stream)
+        count = _MAX_BATCH * 3
+        for i in range(count):
+            sink.put(b"x\n")
+
+        sink.close()
+        assert len(stream.getvalue().splitlines()) == count
+        assert not sink._thread.is_alive()
+
+        assert sink.put(b"late\n") is False
+        assert sink.dropped == 1
+        sink.close()
+
+    def test_full_queue_drops_and_counts(self):
+        stream = SlowStream()
+        sink = AsyncLogSink(stream, maxsize=1)
+        results = [sink.put(b"x\n") for _ in range(100)]
+        sink.close()
+
+        assert sink.dropped == results.count(False)
+        assert len(stream.getvalue().splitlines()) == results.count(True)
+
+
+class TestJsonFileSink:
+    """Tests for the JSON file sink"""
+
+    def test_remove_stops_writer_and_closes_file(self, tmp_path):
+        log_file = tmp_path / "app.jsonl"
+        writers_before = _writer_threads()
+        for i in range(3):
+            sink = json_file_sink(str(log_file))
+            handler_id = logger.add(sink, format="{message}", level="INFO")
+            logger.info("round {i}", i=i)
+            logger.remove(handler_id)
+            assert sink._file._file.closed
+
+        assert _writer_threads() == writers_before
+        lines = [json.loads(line)["message"] for line in log_file.read_text().splitlines()]
+        assert lines == ["round 0", "round 1", "round 2"]
@@ -3,6 +3,7 @@ Tests for ParallelController
 """
 import pytest
 import asyncio
+from contextlib import aclosing
 from unittest.mock import AsyncMock, MagicMock, patch
 from src.parallel_controller import ParallelController, TaskResult
 from src.browser_worker import WorkerResult, ErrorType
@@ -35,6 +36,13 @@ class TestTaskResult:
         assert result.success is False
         assert result.error_type == ErrorType.TIMEOUT
 
+    def test_result_is_immutable(self):
+        import dataclasses
+        result = TaskResult(worker_id="worker_1", success=True)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.success = False
+        assert not hasattr(result, "__dict__")
+
 
 class TestParallelController:
     """Tests for ParallelController"""
@@ -51,12 +59,20 @@ class TestParallelController:
         assert controller.proxy_manager is proxy_manager
 
     def test_calculate_delay(self):
+        import random
+        random.seed(1234)
+        controller = ParallelController()
+        for attempt in range(4):
+            cap = 1.0 * 2 ** attempt
+            for _ in range(50):
+                assert 0.0 <= controller._calculate_delay(attempt) <= cap
+        for _ in range(50):
+            assert controller._calculate_delay(10) <= 30.0  # MAX_DELAY
+
+    def test_calculate_delay_is_jittered(self):
         controller = ParallelController()
-        assert controller._calculate_delay(0) == 1.0  # BASE_DELAY
-        assert controller._calculate_delay(1) == 2.0
-        assert controller._calculate_delay(2) == 4.0
-        assert controller._calculate_delay(3) == 8.0
-        assert controller._calculate_delay(10) == 30.0  # MAX_DELAY
+        delays = {controller._calculate_delay(2) for _ in range(20)}
+        assert len(delays) > 1
 
     def test_is_retryable_success(self):
         controller = ParallelController()
@@ -106,6 +122,12 @@ class TestParallelController:
         assert controller._is_proxy_error_legacy("502 bad gateway") is True
         assert controller._is_proxy_error_legacy("element not found") is False
 
+    def test_proxy_error_regex_matches_every_pattern(self):
+        controller = ParallelController()
+        for pattern in ParallelController.PROXY_ERROR_PATTERNS:
+            assert controller._is_proxy_error_legacy(f"xx {pattern.upper()} yy") is True
+        assert controller._is_proxy_error_legacy("") is False
+
     def test_get_stats(self):
         controller = ParallelController(max_workers=5, max_retries=2)
         stats = controller.get_stats()
@@ -133,3 +155,351 @@ class TestParallelControllerAsync:
         controller = ParallelController()
         # Should not raise for non-existent worker
         await controller._cleanup_worker("non_existent")
+
+    @pytest.mark.asyncio
+    async def test_run_parallel_normalizes_exceptions(self):
+        controller = ParallelController()
+
+        async def fake_execute_task(task_id, task_fn, proxy_outcomes=None):
+            if task_id == "bad":
+                raise asyncio.TimeoutError("too slow")
+            return TaskResult(worker_id=f"worker_{task_id}", success=True)
+
+        controller._execute_task = fake_execute_task
+        results = await controller.run_parallel([("ok", None), ("bad", None)])
+        assert results[0].success is True
+        assert results[1].success is False
+        assert results[1].worker_id == "worker_bad"
+        assert results[1].error_type == ErrorType.TIMEOUT
+
+    @pytest.mark.asyncio
+    async def test_run_parallel_preserves_task_order(self):
+        controller = ParallelController()
+
+        async def fake_execute_task(task_id, task_fn, proxy_outcomes=None):
+            await asyncio.sleep(0.03 if task_id == "slow" else 0)
+            return TaskResult(worker_id=f"worker_{task_id}", success=True)
+
+        controller._execute_task = fake_execute_task
+        results = await controller.run_parallel([("slow", None), ("fast", None)])
+        assert [r.worker_id for r in results] == ["worker_slow", "worker_fast"]
+
+    @pytest.mark.asyncio
+    async def test_run_parallel_bounds_concurrency(self):
+        controller = ParallelController(max_workers=2)
+        running = 0
+        peak = 0
+
+        async def fake_execute_task(task_id, task_fn, proxy_outcomes=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return TaskResult(worker_id=f"worker_{task_id}", success=True)
+
+        controller._execute_task = fake_execute_task
+        results = await controller.run_parallel([(str(i), None) for i in range(6)])
+        assert len(results) == 6
+        assert all(r.success for r in results)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_iter_parallel_yields_in_completion_order(self):
+        controller = ParallelController()
+
+        async def fake_execute_task(task_id, task_fn, proxy_outcomes=None):
+            await asyncio.sleep(0.03 if task_id == "slow" else 0)
+            return TaskResult(worker_id=f"worker_{task_id}", success=True)
+
+        controller._execute_task = fake_execute_task
+        seen = [index async for index, _ in controller.iter_parallel([("slow", None), ("fast", None)])]
+        assert seen == [1, 0]
+
+    @pytest.mark.asyncio
+    async def test_iter_parallel_early_exit_cancels_remaining(self):
+        controller = ParallelController(max_workers=1)
+        started = []
+
+        async def fake_execute_task(task_id, task_fn, proxy_outcomes=None):
+            started.append(task_id)
+            await asyncio.sleep(0)
+            return TaskResult(worker_id=f"worker_{task_id}", success=True)
+
+        controller._execute_task = fake_execute_task
+        tasks = ((str(i), None) for i in range(100))
+        async with aclosing(controller.iter_parallel(tasks)) as results:
+            async for _ in results:
+                break
+        await asyncio.sleep(0)
+        assert len(started) < 100
+        assert controller.get_stats()["running_tasks"] == 0
+
+    @pytest.mark.asyncio
+    async def test_workers_are_pooled_between_tasks(self):
+        controller = ParallelController(max_workers=1, max_retries=0)
+        worker = MagicMock()
+        worker.proxy = None
+        worker.new_context = AsyncMock()
+        worker.stop = AsyncMock()
+
+        async def fake_create_worker(worker_id):
+            controller._workers[worker_id] = worker
+            return worker
+
+        controller._create_worker = AsyncMock(side_effect=fake_create_worker)
+
+        async def task_fn(w):
+            return WorkerResult(success=True)
+
+        results = await controller.run_parallel([("a", task_fn), ("b", task_fn)])
+        assert all(r.success for r in results)
+        assert controller._create_worker.await_count == 1
+        worker.new_context.assert_awaited_once()
+        assert controller.get_stats()["idle_workers"] == 1
+
+        await controller.cleanup_all()
+        worker.stop.assert_awaited_once()
+        assert controller.get_stats()["idle_workers"] == 0
+
+    def _pooled_controller(self, max_retries: int):
+        controller = ParallelController(max_workers=1, max_retries=max_retries)
+        controller.BASE_DELAY = 0
+
+        async def fake_create_worker(worker_id):
+            worker = MagicMock()
+            worker.proxy = None
+            worker.new_context = AsyncMock()
+            worker.stop = AsyncMock()
+            controller._workers[worker_id] = worker
+            return worker
+
+        controller._create_worker = AsyncMock(side_effect=fake_create_worker)
+        return controller
+
+    @pytest.mark.asyncio
+    async def test_timeout_retry_reuses_browser(self):
+        controller = self._pooled_controller(max_retries=1)
+        outcomes = [
+            WorkerResult(success=False, error="timeout", error_type=ErrorType.TIMEOUT),
+            WorkerResult(success=True),
+        ]
+
+        async def task_fn(w):
+            return outcomes.pop(0)
+
+        result = await controller.run_task("t", task_fn)
+        assert result.success is True
+        assert result.retries == 1
+        assert controller._create_worker.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_proxy_retry_rotates_session_on_same_browser(self):
+        controller = self._pooled_controller(max_retries=1)
+        controller.proxy_manager = MagicMock()
+        fresh_proxy = controller.proxy_manager.get_proxy.return_value
+        outcomes = [
+            WorkerResult(success=False, error="proxy", error_type=ErrorType.PROXY),
+            WorkerResult(success=True),
+        ]
+        seen = []
+
+        async def task_fn(w):
+            seen.append(w)
+            return outcomes.pop(0)
+
+        result = await controller.run_task("t", task_fn)
+        assert result.success is True
+        assert controller._create_worker.await_count == 1
+        assert seen[0] is seen[1]
+        assert seen[1].new_context.await_args.kwargs["proxy"] is fresh_proxy
+        controller.proxy_manager.get_proxy.assert_called_with(new_session=True)
+
+    @pytest.mark.asyncio
+    async def test_cancel_during_release_still_stops_browser(self):
+        controller = self._pooled_controller(max_retries=0)
+        stopped = asyncio.Event()
+
+        async def slow_stop():
+            await asyncio.sleep(0.02)
+            stopped.set()
+
+        async def task_fn(w):
+            w.stop.side_effect = slow_stop
+            return WorkerResult(success=False, error="closed", error_type=ErrorType.BROWSER_CLOSED)
+
+        task = asyncio.create_task(controller.run_task("t", task_fn))
+        await asyncio.sleep(0.005)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.wait_for(stopped.wait(), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_browser_closed_retry_relaunches_browser(self):
+        controller = self._pooled_controller(max_retries=1)
+        outcomes = [
+            WorkerResult(success=False, error="closed", error_type=ErrorType.BROWSER_CLOSED),
+            WorkerResult(success=True),
+        ]
+
+        async def task_fn(w):
+            return outcomes.pop(0)
+
+        controller.RETRYABLE_ERRORS = controller.RETRYABLE_ERRORS | {ErrorType.BROWSER_CLOSED}
+        result = await controller.run_task("t", task_fn)
+        assert result.success is True
+        assert controller._create_worker.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_run_parallel_records_proxy_stats_in_batch(self):
+        proxy_manager = MagicMock()
+        controller = ParallelController(proxy_manager=proxy_manager, max_workers=2, max_retries=0)
+
+        async def fake_create_worker(worker_id):
+            worker = MagicMock()
+            worker.proxy = MagicMock(session_id=worker_id, country="us")
+            worker.new_context = AsyncMock()
+            worker.stop = AsyncMock()
+            controller._workers[worker_id] = worker
+            return worker
+
+        controller._create_worker = AsyncMock(side_effect=fake_create_worker)
+
+        async def task_fn(w):
+            return WorkerResult(success=True)
+
+        await controller.run_parallel([("a", task_fn), ("b", task_fn)])
+        proxy_manager.record_success.assert_not_called()
+        proxy_manager.record_batch.assert_called_once()
+        outcomes = proxy_manager.record_batch.call_args[0][0]
+        assert len(outcomes) == 2
+        assert all(o.success for o in outcomes)
+
+    @pytest.mark.asyncio
+    async def test_task_logs_carry_task_id(self):
+        from loguru import logger
+        controller = ParallelController()
+        seen = []
+        handler_id = logger.add(lambda m: seen.append(m.record["extra"].get("task_id")), level="INFO")
+
+        async def fake_execute_task(task_id, task_fn, proxy_outcomes=None):
+            logger.info("inside task")
+            return TaskResult(worker_id=f"worker_{task_id}", success=True)
+
+        controller._execute_task = fake_execute_task
+        try:
+            await controller.run_parallel([("t1", None)])
+            await controller.run_task("t2", None)
+        finally:
+            logger.remove(handler_id)
+        assert "t1" in seen
+        assert "t2" in seen
+
+    @pytest.mark.asyncio
+    async def test_set_max_workers_shrinks_running_batch(self):
+        controller = ParallelController(max_workers=3)
+        running = 0
+        peak_after_shrink = 0
+        shrunk = False
+
+        async def fake_execute_task(task_id, task_fn, proxy_outcomes=None):
+            nonlocal running, peak_after_shrink
+            running += 1
+            if shrunk:
+                peak_after_shrink = max(peak_after_shrink, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return TaskResult(worker_id=f"worker_{task_id}", success=True)
+
+        controller._execute_task = fake_execute_task
+        batch = asyncio.create_task(controller.run_parallel([(str(i), None) for i in range(9)]))
+        await asyncio.sleep(0)
+        await controller.set_max_workers(1)
+        shrunk = True
+        results = await batch
+        assert all(r.success for r in results)
+        assert controller.get_stats()["running_tasks"] == 0
+        # Tasks started after the shrink wait for in-flight ones to drain
+        assert peak_after_shrink == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_run_task_callers_share_slots(self):
+        controller = ParallelController(max_workers=2)
+        running = 0
+        peak = 0
+
+        async def fake_execute_task(task_id, task_fn, proxy_outcomes=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.005)
+            running -= 1
+            return TaskResult(worker_id=f"worker_{task_id}", success=True)
+
+        controller._execute_task = fake_execute_task
+        results = await asyncio.gather(*(controller.run_task(str(i), None) for i in range(7)))
+        assert all(r.success for r in results)
+        assert peak == 2
+        assert controller.get_stats()["running_tasks"] == 0
+
+    @pytest.mark.asyncio
+    async def test_observers_receive_task_lifecycle(self):
+        event_bus = MagicMock()
+        event_bus.publish = AsyncMock()
+        metrics = MagicMock()
+        controller = self._pooled_controller(max_retries=1)
+        controller._event_bus = event_bus
+        controller._metrics = metrics
+        outcomes = [
+            WorkerResult(success=False, error="timeout", error_type=ErrorType.TIMEOUT),
+            WorkerResult(success=False, error="bad input", error_type=ErrorType.VALIDATION),
+        ]
+
+        async def task_fn(w):
+            return outcomes.pop(0)
+
+        result = await controller.run_task("t", task_fn)
+        await asyncio.sleep(0)
+        assert result.success is False
+        published = [call.args[0].event_type for call in event_bus.publish.await_args_list]
+        assert published == ["task.started", "task.retry", "task.failed"]
+        metrics.increment.assert_called_once_with("task.total_failure")
+        metrics.record.assert_any_call("task.failure", 1.0, {"task_id": "t", "error_type": "validation"})
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_passes_slot_on(self):
+        controller = ParallelController(max_workers=1)
+        release = asyncio.Event()
+        acquired = []
+        waiters = {}
+
+        async def hold():
+            async with controller._worker_slot():
+                await release.wait()
+            # Leaving the slot woke "first" with notify(1); cancel it before
+            # it gets to run
+            waiters["first"].cancel()
+
+        async def wait_for_slot(name):
+            async with controller._worker_slot():
+                acquired.append(name)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiters["first"] = asyncio.create_task(wait_for_slot("first"))
+        waiters["second"] = asyncio.create_task(wait_for_slot("second"))
+        await asyncio.sleep(0)
+
+        release.set()
+        await holder
+        await asyncio.wait_for(waiters["second"], timeout=1)
+        assert waiters["first"].cancelled()
+        assert acquired == ["second"]
+        assert controller._active == 0
+
+    @pytest.mark.asyncio
+    async def test_set_max_workers_rejects_zero(self):
+        controller = ParallelController()
+        with pytest.raises(ValueError):
+            await controller.set_max_workers(0)
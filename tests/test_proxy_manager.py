@@ -41,6 +41,14 @@ class TestProxyConfig:
         config = backend.create_proxy(session_duration=60)
         assert "-sessionduration-60" in config.get_url()
 
+    def test_immutable_and_hashable(self):
+        backend = SmartProxyISPBackend(username="test", password="pass")
+        a = backend.create_proxy(country="us", session_id="s1")
+        b = backend.create_proxy(country="us", session_id="s1")
+        assert {a: 1}[b] == 1
+        with pytest.raises(AttributeError):
+            a.country = "de"
+
 
 class TestSmartProxyISPBackend:
     """Tests for SmartProxyISPBackend"""
@@ -211,6 +219,21 @@ class TestProxyManager:
         assert stats["sess1"].consecutive_failures == 0
         assert stats["sess1"].is_healthy is True
 
+    def test_record_batch(self):
+        from src.proxy_manager import ProxyOutcome
+        manager = self._make_manager()
+        manager.record_batch([
+            ProxyOutcome("sess1", success=False, country="us"),
+            ProxyOutcome("sess1", success=True, response_time=2.0, country="us"),
+            ProxyOutcome("sess2", success=False),
+        ])
+        stats = manager.get_stats()
+        assert stats["sess1"].total_requests == 2
+        assert stats["sess1"].consecutive_failures == 0
+        assert stats["sess1"].total_response_time == 2.0
+        assert stats["sess2"].failed_requests == 1
+        assert stats["smartproxy_us"].total_requests == 2
+
     def test_get_health_summary(self):
         manager = self._make_manager()
         manager.record_success("sess1", country="us")
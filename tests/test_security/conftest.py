@@ -0,0 +1,22 @@
+"""Shared fixtures for security tests"""
+import pytest
+from src.security.pqc import PQCEngine
+
+
+# Key generation dominates these tests' runtime, so keypairs are made once per
+# session. Tests still get a fresh function-scoped `engine`, since several of
+# them inspect its per-instance caches.
+
+@pytest.fixture(scope="session")
+def pqc_engine():
+    return PQCEngine()
+
+
+@pytest.fixture(scope="session")
+def signing_keypair(pqc_engine):
+    return pqc_engine.generate_signing_keypair()
+
+
+@pytest.fixture(scope="session")
+def kem_keypair(pqc_engine):
+    return pqc_engine.generate_kem_keypair()
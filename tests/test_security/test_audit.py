@@ -1,4 +1,6 @@
 """Tests for Signed Audit Logger"""
+import json
+import math
 import os
 import time
 import pytest
@@ -11,11 +13,6 @@ def engine():
     return PQCEngine()
 
 
-@pytest.fixture
-def signing_keypair(engine):
-    return engine.generate_signing_keypair()
-
-
 @pytest.fixture
 def signed_logger(engine, signing_keypair):
     return AuditLogger(pqc_engine=engine, signing_keypair=signing_keypair)
@@ -84,6 +81,13 @@ class TestVerification:
         assert valid == 3
         assert invalid == 0
 
+    def test_verify_all_parallel_chunks(self, signed_logger, monkeypatch):
+        monkeypatch.setattr(AuditLogger, "_VERIFY_CHUNK", 2)
+        monkeypatch.setattr(os, "cpu_count", lambda: 2)
+        entries = [signed_logger.log_event("e", str(i), "out") for i in range(7)]
+        entries[3].output_hash = "tampered"
+        assert signed_logger.verify_all() == (6, 1)
+
     def test_unsigned_entry_passes(self, unsigned_logger):
         entry = unsigned_logger.log_event("test", "in", "out")
         assert unsigned_logger.verify_entry(entry)
@@ -104,6 +108,28 @@ class TestLogDecision:
         assert entry.input_hash == "state123"
         assert entry.metadata["session_id"] == "s1"
 
+    def test_decision_hash_independent_of_key_order(self, signed_logger):
+        class MockDecision:
+            def __init__(self, d):
+                self.d = d
+
+            def to_dict(self):
+                return self.d
+
+        a = signed_logger.log_decision(MockDecision({"action": "go", "confidence": 0.5}), "s", "s1")
+        b = signed_logger.log_decision(MockDecision({"confidence": 0.5, "action": "go"}), "s", "s1")
+        assert a.output_hash == b.output_hash
+        assert len(a.output_hash) == 64
+
+    def test_decision_hash_pinned(self, unsigned_logger):
+        class MockDecision:
+            def to_dict(self):
+                return {"action": "proceed", "confidence": 0.5, "big": 1e16, "text": "caf\u00e9"}
+
+        entry = unsigned_logger.log_decision(MockDecision(), "s", "s1")
+        # sha256 of json.dumps(decision, sort_keys=True), the historical format
+        assert entry.output_hash == "12bfdd06b1adcd9cd1dfe36096dbcd1e3b7d980022e17bc85ccd5b865e013507"
+
 
 class TestQuerying:
     def test_query_by_event_type(self, signed_logger):
@@ -124,6 +150,26 @@ class TestQuerying:
         assert len(results) >= 1
         assert all(e.timestamp <= after for e in results)
 
+    def test_query_type_and_range(self, unsigned_logger, monkeypatch):
+        clock = iter([10.0, 20.0, 30.0, 40.0, 50.0])
+        monkeypatch.setattr(time, "time", lambda: next(clock))
+        for event_type in ("a", "b", "a", "a", "b"):
+            unsigned_logger.log_event(event_type, "in", "out")
+
+        results = unsigned_logger.get_entries(event_type="a", since=20.0, until=40.0)
+        assert [e.timestamp for e in results] == [30.0, 40.0]
+        assert [e.timestamp for e in unsigned_logger.get_entries(since=35.0)] == [40.0, 50.0]
+        assert unsigned_logger.get_entries(event_type="missing") == []
+
+    def test_query_after_clock_steps_back(self, unsigned_logger, monkeypatch):
+        clock = iter([10.0, 30.0, 20.0])
+        monkeypatch.setattr(time, "time", lambda: next(clock))
+        for event_type in ("a", "a", "a"):
+            unsigned_logger.log_event(event_type, "in", "out")
+
+        results = unsigned_logger.get_entries(event_type="a", since=15.0)
+        assert sorted(e.timestamp for e in results) == [20.0, 30.0]
+
 
 class TestFilePersistence:
     def test_file_persistence(self, tmp_path, engine, signing_keypair):
@@ -143,3 +189,183 @@ class TestFilePersistence:
         assert len(logger2.entries) == 2
         assert logger2.entries[0].event_type == "test1"
         assert logger2.entries[1].event_type == "test2"
+
+
+class TestBatchSigning:
+    @pytest.fixture
+    def batch_logger(self, engine, signing_keypair):
+        return AuditLogger(pqc_engine=engine, signing_keypair=signing_keypair, batch_size=4)
+
+    def test_entries_signed_when_batch_fills(self, batch_logger):
+        entries = [batch_logger.log_event("e", str(i), "out") for i in range(4)]
+        assert all(e.signature is entries[0].signature for e in entries)
+        assert all(e.merkle_proof for e in entries)
+        assert all(batch_logger.verify_entry(e) for e in entries)
+
+    def test_pending_entries_unsigned_until_flush(self, batch_logger):
+        entry = batch_logger.log_event("e", "in", "out")
+        assert entry.signature is None
+        batch_logger.flush()
+        assert entry.signature is not None
+        assert batch_logger.verify_entry(entry)
+
+    def test_odd_batch_verifies(self, batch_logger):
+        for i in range(7):
+            batch_logger.log_event("e", str(i), "out")
+        valid, invalid = batch_logger.verify_all()
+        assert (valid, invalid) == (7, 0)
+
+    def test_tampered_batched_entry_fails(self, batch_logger):
+        entries = [batch_logger.log_event("e", str(i), "out") for i in range(4)]
+        tampered = AuditEntry(
+            entry_id=entries[1].entry_id,
+            timestamp=entries[1].timestamp,
+            event_type=entries[1].event_type,
+            input_hash="TAMPERED",
+            output_hash=entries[1].output_hash,
+            metadata=entries[1].metadata,
+            signature=entries[1].signature,
+            merkle_proof=entries[1].merkle_proof,
+        )
+        assert not batch_logger.verify_entry(tampered)
+
+    def test_log_events_signs_once(self, signed_logger):
+        entries = signed_logger.log_events(
+            {"event_type": "e", "input_hash": str(i), "output_hash": "out"} for i in range(5)
+        )
+        assert len(entries) == 5
+        assert all(e.signature is entries[0].signature for e in entries)
+        assert signed_logger.verify_all() == (5, 0)
+
+    def test_batched_file_roundtrip(self, tmp_path, engine, signing_keypair):
+        log_file = str(tmp_path / "audit.jsonl")
+        writer = AuditLogger(
+            pqc_engine=engine, signing_keypair=signing_keypair, log_file=log_file, batch_size=3,
+        )
+        for i in range(5):
+            writer.log_event("e", str(i), "out")
+        writer.close()
+
+        reader = AuditLogger(pqc_engine=engine, signing_keypair=signing_keypair, log_file=log_file)
+        assert len(reader.entries) == 5
+        assert reader.verify_all() == (5, 0)
+
+
+class TestFileHandle:
+    def test_close_flushes_pending_and_is_idempotent(self, tmp_path, engine, signing_keypair):
+        log_file = str(tmp_path / "audit.jsonl")
+        writer = AuditLogger(
+            pqc_engine=engine, signing_keypair=signing_keypair, log_file=log_file, batch_size=10,
+        )
+        writer.log_event("e", "in", "out")
+        writer.close()
+        writer.close()
+
+        reader = AuditLogger(pqc_engine=engine, signing_keypair=signing_keypair, log_file=log_file)
+        assert len(reader.entries) == 1
+        assert reader.verify_all() == (1, 0)
+
+    def test_logging_after_close_reopens_file(self, tmp_path):
+        log_file = str(tmp_path / "audit.jsonl")
+        writer = AuditLogger(log_file=log_file)
+        writer.log_event("a", "in", "out")
+        writer.close()
+        writer.log_event("b", "in", "out")
+        writer.log_events([{"event_type": "c", "input_hash": "in", "output_hash": "out"}])
+        writer.close()
+
+        with open(log_file) as f:
+            lines = [json.loads(line)["event_type"] for line in f]
+        assert lines == ["a", "b", "c"]
+
+    def test_context_manager_flushes_on_exit(self, tmp_path, engine, signing_keypair):
+        log_file = str(tmp_path / "audit.jsonl")
+        with AuditLogger(
+            pqc_engine=engine, signing_keypair=signing_keypair, log_file=log_file, batch_size=64,
+        ) as writer:
+            for i in range(3):
+                writer.log_event("e", str(i), "out")
+
+        reader = AuditLogger(pqc_engine=engine, signing_keypair=signing_keypair, log_file=log_file)
+        assert len(reader.entries) == 3
+        assert reader.verify_all() == (3, 0)
+
+    def test_appends_across_instances(self, tmp_path):
+        log_file = str(tmp_path / "audit.jsonl")
+        first = AuditLogger(log_file=log_file)
+        second = AuditLogger(log_file=log_file)
+        first.log_event("a", "in", "out")
+        second.log_event("b", "in", "out")
+        first.log_event("c", "in", "out")
+
+        with open(log_file) as f:
+            lines = [json.loads(line)["event_type"] for line in f]
+        assert lines == ["a", "b", "c"]
+
+    def test_file_roundtrip_with_unusual_metadata(self, tmp_path, engine, signing_keypair):
+        log_file = str(tmp_path / "audit.jsonl")
+        writer = AuditLogger(pqc_engine=engine, signing_keypair=signing_keypair, log_file=log_file)
+        writer.log_event("e", "in", "out", metadata={"big": 2**70 + 1, "text": "caf\u00e9"})
+        writer.close()
+
+        reader = AuditLogger(pqc_engine=engine, signing_keypair=signing_keypair, log_file=log_file)
+        (entry,) = reader.entries
+        assert entry.metadata["big"] == 2**70 + 1
+        assert entry.metadata["text"] == "caf\u00e9"
+        assert reader.verify_all() == (1, 0)
+
+
+    def test_non_finite_floats_verify_after_reload(self, tmp_path, engine, signing_keypair):
+        log_file = str(tmp_path / "audit.jsonl")
+        writer = AuditLogger(pqc_engine=engine, signing_keypair=signing_keypair, log_file=log_file)
+        writer.log_event("x", "i", "o", metadata={"v": float("nan"), "r": [float("inf"), None]})
+        assert writer.verify_all() == (1, 0)
+        writer.close()
+
+        reader = AuditLogger(pqc_engine=engine, signing_keypair=signing_keypair, log_file=log_file)
+        (entry,) = reader.entries
+        assert math.isnan(entry.metadata["v"])
+        assert entry.metadata["r"] == [float("inf"), None]
+        assert reader.verify_all() == (1, 0)
+
+
+class TestSignableBytes:
+    def test_cached_between_calls(self):
+        entry = AuditEntry("id", 1.0, "e", "in", "out")
+        assert entry.signable_bytes() is entry.signable_bytes()
+
+    def test_reassigning_signed_field_invalidates(self, signed_logger):
+        entry = signed_logger.log_event("test", "in", "out")
+        before = entry.signable_bytes()
+        entry.input_hash = "TAMPERED"
+        assert entry.signable_bytes() != before
+        assert not signed_logger.verify_entry(entry)
+
+
+class TestBoundedMemory:
+    def test_old_entries_evicted_but_queryable(self, tmp_path, monkeypatch):
+        clock = iter(float(t) for t in range(100))
+        monkeypatch.setattr(time, "time", lambda: next(clock))
+        audit = AuditLogger(log_file=str(tmp_path / "audit.jsonl"), max_entries=5)
+        for i in range(12):
+            audit.log_event("even" if i % 2 == 0 else "odd", str(i), "out")
+
+        assert len(audit.entries) < 12
+        assert [e.input_hash for e in audit.get_entries()] == [str(i) for i in range(12)]
+        assert [e.timestamp for e in audit.get_entries(event_type="even", until=4.0)] == [0.0, 2.0, 4.0]
+        assert [e.timestamp for e in audit.get_entries(since=10.0)] == [10.0, 11.0]
+        assert audit.verify_all() == (12, 0)
+
+    def test_startup_loads_only_tail(self, tmp_path, engine, signing_keypair):
+        log_file = str(tmp_path / "audit.jsonl")
+        writer = AuditLogger(pqc_engine=engine, signing_keypair=signing_keypair, log_file=log_file)
+        for i in range(8):
+            writer.log_event("e", str(i), "out")
+        writer.close()
+
+        reader = AuditLogger(
+            pqc_engine=engine, signing_keypair=signing_keypair, log_file=log_file, max_entries=3,
+        )
+        assert [e.input_hash for e in reader.entries] == ["5", "6", "7"]
+        assert len(reader.get_entries()) == 8
+        assert reader.verify_all() == (8, 0)
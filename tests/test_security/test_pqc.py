@@ -1,4 +1,6 @@
 """Tests for Post-Quantum Cryptography engine"""
+import base64
+
 import pytest
 from src.security.pqc import PQCEngine, PQCKeyPair, EncryptedPayload, Signature
 
@@ -8,16 +10,6 @@ def engine():
     return PQCEngine()
 
 
-@pytest.fixture
-def kem_keypair(engine):
-    return engine.generate_kem_keypair()
-
-
-@pytest.fixture
-def signing_keypair(engine):
-    return engine.generate_signing_keypair()
-
-
 class TestKeyGeneration:
     def test_kem_keypair_generated(self, engine):
         kp = engine.generate_kem_keypair()
@@ -109,5 +101,134 @@ class TestSerialization:
         assert restored.key_id == sig.key_id
         assert restored.signature == sig.signature
 
+    def test_legacy_split_tag_payload(self, engine, kem_keypair):
+        enc = engine.encrypt(b"legacy", kem_keypair)
+        assert enc.tag == b""
+        d = enc.to_dict()
+        ct = EncryptedPayload.from_dict(d).ciphertext
+        d["ciphertext"] = base64.b64encode(ct[:-16]).decode()
+        d["tag"] = base64.b64encode(ct[-16:]).decode()
+        assert engine.decrypt(EncryptedPayload.from_dict(d), kem_keypair) == b"legacy"
+
+        split = EncryptedPayload(
+            kem_ciphertext=enc.kem_ciphertext, nonce=enc.nonce,
+            ciphertext=ct[:-16], tag=ct[-16:],
+            algorithm=enc.algorithm, key_id=enc.key_id,
+        )
+        assert engine.decrypt(split, kem_keypair) == b"legacy"
+
+    def test_payload_bytes_roundtrip(self, engine, kem_keypair):
+        enc1 = engine.encrypt(b"first", kem_keypair)
+        enc2 = engine.encrypt(b"second", kem_keypair)
+        buf = b"prefix" + enc1.to_bytes() + enc2.to_bytes()
+        restored1, offset = EncryptedPayload.from_bytes(buf, len(b"prefix"))
+        restored2, end = EncryptedPayload.from_bytes(buf, offset)
+        assert end == len(buf)
+        assert restored1 == enc1
+        assert engine.decrypt(restored2, kem_keypair) == b"second"
+
+    def test_payload_bytes_truncated(self, engine, kem_keypair):
+        buf = engine.encrypt(b"data", kem_keypair).to_bytes()
+        with pytest.raises(ValueError, match="truncated"):
+            EncryptedPayload.from_bytes(buf[:-1])
+        with pytest.raises(ValueError, match="truncated"):
+            EncryptedPayload.from_bytes(buf[:5])
+
 
 import os
+
+
+class TestOqsObjectReuse:
+    class FakeOqsObject:
+        created = 0
+
+        def __init__(self, alg, secret_key=None):
+            type(self).created += 1
+            self.secret_key = secret_key
+            self.freed = False
+
+        def free(self):
+            self.freed = True
+
+    @pytest.fixture
+    def fake_oqs(self, monkeypatch):
+        from src.security import pqc
+        fake = type("FakeOqs", (), {
+            "KeyEncapsulation": self.FakeOqsObject,
+            "Signature": self.FakeOqsObject,
+        })
+        self.FakeOqsObject.created = 0
+        monkeypatch.setattr(pqc, "oqs", fake, raising=False)
+        return fake
+
+    def test_objects_reused_per_secret_key(self, engine, fake_oqs):
+        assert engine._oqs_kem() is engine._oqs_kem()
+        assert engine._oqs_sig() is engine._oqs_sig()
+        assert engine._oqs_kem(b"a") is engine._oqs_kem(b"a")
+        assert engine._oqs_kem(b"a") is not engine._oqs_kem(b"b")
+        assert self.FakeOqsObject.created == 4
+
+    def test_cache_bounded(self, engine, fake_oqs, monkeypatch):
+        monkeypatch.setattr(PQCEngine, "_MAX_CACHED_KEYS", 2)
+        first = engine._oqs_sig(b"1")
+        engine._oqs_sig(b"2")
+        engine._oqs_sig(b"3")
+        assert b"1" not in engine._sig_by_secret
+        assert len(engine._sig_by_secret) == 2
+
+    def test_evicted_object_not_freed_while_referenced(self, engine, fake_oqs, monkeypatch):
+        monkeypatch.setattr(PQCEngine, "_MAX_CACHED_KEYS", 1)
+        in_use = engine._oqs_kem(b"1")
+        engine._oqs_kem(b"2")
+        assert not in_use.freed
+
+
+class TestDerivedKeyCache:
+    def test_repeat_decrypt_hits_cache(self, engine, kem_keypair):
+        enc = engine.encrypt(b"payload", kem_keypair)
+        assert engine.decrypt(enc, kem_keypair) == b"payload"
+        assert len(engine._derived) == 1
+        assert engine.decrypt(enc, kem_keypair) == b"payload"
+        assert len(engine._derived) == 1
+
+    def test_cache_keyed_by_secret_key(self, engine, kem_keypair):
+        enc = engine.encrypt(b"payload", kem_keypair)
+        engine.decrypt(enc, kem_keypair)
+        other = engine.generate_kem_keypair()
+        forged = PQCKeyPair(
+            algorithm=other.algorithm,
+            public_key=kem_keypair.public_key,
+            secret_key=other.secret_key,
+            key_id=kem_keypair.key_id,
+        )
+        with pytest.raises(Exception):
+            engine.decrypt(enc, forged)
+
+    def test_cache_bounded(self, engine, kem_keypair, monkeypatch):
+        monkeypatch.setattr(PQCEngine, "_MAX_CACHED_DERIVED", 2)
+        for _ in range(4):
+            engine.decrypt(engine.encrypt(b"x", kem_keypair), kem_keypair)
+        assert len(engine._derived) == 2
+
+
+class TestSigningKeyReuse:
+    def test_signing_key_loaded_once(self, engine, signing_keypair):
+        if engine._use_pqc:
+            pytest.skip("classical fallback only")
+        sig1 = engine.sign(b"a", signing_keypair)
+        sig2 = engine.sign(b"b", signing_keypair)
+        assert len(engine._ed25519_by_secret) == 1
+        assert engine.verify(b"a", sig1, signing_keypair)
+        assert engine.verify(b"b", sig2, signing_keypair)
+
+
+class TestKeyDerivation:
+    @pytest.mark.parametrize("info", [b"ccp-pqc-kem", b"ccp-x25519-kem"])
+    def test_matches_cryptography_hkdf(self, info):
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+        from src.security.pqc import _derive_aes_key
+
+        shared = os.urandom(32)
+        expected = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=info).derive(shared)
+        assert _derive_aes_key(shared, info + b"\x01") == expected
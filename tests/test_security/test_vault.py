@@ -1,11 +1,14 @@
 """Tests for Encrypted Credential Vault"""
+import json
+
 import pytest
 from src.security.vault import SecureVault
 
 
 @pytest.fixture
-def vault(tmp_path):
-    v = SecureVault(vault_dir=str(tmp_path / "vault"))
+def vault(tmp_path, pqc_engine, kem_keypair):
+    # Shared session keys skip keygen; rotation still makes a fresh keypair
+    v = SecureVault(vault_dir=str(tmp_path / "vault"), pqc_engine=pqc_engine, kem_keypair=kem_keypair)
     v.init()
     return v
 
@@ -19,6 +22,17 @@ class TestVaultInit:
         assert (tmp_path / "new_vault").exists()
         assert (tmp_path / "new_vault" / "vault.keys").exists()
 
+    def test_provided_keypair_used_only_without_keys_file(self, tmp_path, pqc_engine, kem_keypair):
+        vault_dir = str(tmp_path / "vault")
+        v1 = SecureVault(vault_dir=vault_dir)
+        v1.init()
+        v1.set("KEY", "value")
+
+        v2 = SecureVault(vault_dir=vault_dir, pqc_engine=pqc_engine, kem_keypair=kem_keypair)
+        v2.init()
+        assert v2._kem_keypair.key_id == v1._kem_keypair.key_id != kem_keypair.key_id
+        assert v2.get("KEY") == "value"
+
     def test_not_initialized_raises(self, tmp_path):
         v = SecureVault(vault_dir=str(tmp_path / "vault"))
         with pytest.raises(RuntimeError, match="not initialized"):
@@ -79,6 +93,21 @@ class TestVaultPersistence:
         v2.init()
         assert v2.get("PERSIST_KEY") == "persist_value"
 
+    def test_load_memory_mapped(self, tmp_path, monkeypatch):
+        from src.security import vault as vault_module
+        monkeypatch.setattr(vault_module, "_MMAP_MIN_SIZE", 0)
+        vault_dir = str(tmp_path / "vault")
+
+        v1 = SecureVault(vault_dir=vault_dir)
+        v1.init()
+        v1.set("KEY_1", "value_1")
+        v1.set("KEY_2", "value_2")
+
+        v2 = SecureVault(vault_dir=vault_dir)
+        v2.init()
+        assert v2.get("KEY_1") == "value_1"
+        assert v2.get("KEY_2") == "value_2"
+
 
 class TestKeyRotation:
     def test_rotation_preserves_values(self, vault):
@@ -103,3 +132,87 @@ class TestVaultForSettings:
         vault.set("SECRET", "s3cret")
         settings = vault.get_for_settings()
         assert settings == {"API_KEY": "sk-123", "SECRET": "s3cret"}
+
+    def test_get_many_skips_missing(self, vault):
+        vault.set("A", "1")
+        vault.set("B", "2")
+        assert vault.get_many(["B", "missing"]) == {"B": "2"}
+        assert vault.get_many([]) == {}
+
+
+class TestSingleEncapsulation:
+    def test_writes_and_rotation_encapsulate_once(self, vault, monkeypatch):
+        calls = []
+        encapsulate = vault._engine.encapsulate
+        monkeypatch.setattr(vault._engine, "encapsulate", lambda pk: calls.append(pk) or encapsulate(pk))
+        for i in range(5):
+            vault.set(f"KEY_{i}", f"value_{i}")
+        assert calls == []
+        vault.rotate_keys()
+        assert len(calls) == 1
+        assert vault.get("KEY_3") == "value_3"
+
+    def test_entries_bound_to_their_key(self, vault):
+        vault.set("A", "1")
+        vault.set("B", "2")
+        vault._entries["A"].encrypted_value, vault._entries["B"].encrypted_value = (
+            vault._entries["B"].encrypted_value, vault._entries["A"].encrypted_value,
+        )
+        with pytest.raises(Exception):
+            vault.get("A")
+
+    def test_legacy_file_migrated(self, tmp_path):
+        vault_dir = tmp_path / "vault"
+        v1 = SecureVault(vault_dir=str(vault_dir))
+        v1.init()
+        legacy = {
+            key: {
+                "encrypted_value": v1._engine.encrypt(b"old_value", v1._kem_keypair).to_dict(),
+                "created_at": 1.0,
+                "updated_at": 2.0,
+            }
+            for key in ("OLD_KEY", "OLD_KEY_2", "OLD_KEY_3")
+        }
+        (vault_dir / "vault.enc").write_text(json.dumps(legacy))
+
+        v2 = SecureVault(vault_dir=str(vault_dir))
+        v2.init()
+        assert v2.get("OLD_KEY") == "old_value"
+        v2.set("NEW_KEY", "new_value")
+
+        v3 = SecureVault(vault_dir=str(vault_dir))
+        v3.init()
+        assert v3.get_for_settings() == {
+            "OLD_KEY": "old_value", "OLD_KEY_2": "old_value", "OLD_KEY_3": "old_value",
+            "NEW_KEY": "new_value",
+        }
+        assert v3._entries["OLD_KEY_2"].created_at == 1.0
+        assert (vault_dir / "vault.enc").read_bytes().startswith(b"CCPV")
+
+
+class TestVaultFiles:
+    def test_atomic_writes_leave_no_temp_files(self, vault, tmp_path):
+        vault.set("KEY", "value")
+        vault.rotate_keys()
+        assert sorted(p.name for p in (tmp_path / "vault").iterdir()) == ["vault.enc", "vault.keys"]
+
+    def test_keys_file_private(self, vault, tmp_path):
+        vault.rotate_keys()
+        assert (tmp_path / "vault" / "vault.keys").stat().st_mode & 0o777 == 0o600
+
+    def test_truncated_file_rejected(self, vault, tmp_path):
+        vault.set("KEY", "value")
+        path = tmp_path / "vault" / "vault.enc"
+        path.write_bytes(path.read_bytes()[:-5])
+        v2 = SecureVault(vault_dir=str(tmp_path / "vault"))
+        with pytest.raises(ValueError, match="truncated"):
+            v2.init()
+
+    @pytest.mark.parametrize("no_fsync, expected", [("", 1), ("1", 0)])
+    def test_fsync_before_rename(self, vault, monkeypatch, no_fsync, expected):
+        from src.security import vault as vault_module
+        calls = []
+        monkeypatch.setattr(vault_module.os, "fsync", calls.append)
+        monkeypatch.setenv("CCP_VAULT_NO_FSYNC", no_fsync)
+        vault.set("KEY", "value")
+        assert len(calls) == expected
@@ -71,6 +71,70 @@ class TestEventBus:
         count = await bus.publish(Event("unsubscribed", "test"))
         assert count == 0
 
+    @pytest.mark.asyncio
+    async def test_unsubscribe_during_dispatch(self):
+        bus = EventBus()
+        received = []
+
+        async def once(event: Event):
+            received.append("once")
+            bus.unsubscribe("test", once)
+
+        async def always(event: Event):
+            received.append("always")
+
+        bus.subscribe("test", once)
+        bus.subscribe("test", always)
+        bus.subscribe("*", always)
+        assert await bus.publish(Event("test", "test")) == 3
+        assert await bus.publish(Event("test", "test")) == 2
+        assert received == ["once", "always", "always", "always", "always"]
+
+    @pytest.mark.asyncio
+    async def test_self_unsubscribe_still_counted(self):
+        bus = EventBus()
+
+        async def once(event: Event):
+            bus.unsubscribe("test", once)
+
+        async def always(event: Event):
+            pass
+
+        bus.subscribe("test", once)
+        assert await bus.publish(Event("test", "test")) == 1
+        assert await bus.publish(Event("test", "test")) == 0
+
+        bus.subscribe("test", once)
+        bus.subscribe("test", always)
+        assert await bus.publish(Event("test", "test")) == 2
+
+        async def wildcard_once(event: Event):
+            bus.unsubscribe("*", wildcard_once)
+
+        bus.subscribe("*", wildcard_once)
+        assert await bus.publish(Event("other", "test")) == 1
+        assert await bus.publish(Event("other", "test")) == 0
+
+    @pytest.mark.asyncio
+    async def test_max_concurrent_handlers(self):
+        import asyncio
+        bus = EventBus(max_concurrent_handlers=2)
+        running = 0
+        peak = 0
+
+        async def slow(event: Event):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for _ in range(3):
+            bus.subscribe("test", slow)
+        counts = await asyncio.gather(*(bus.publish(Event("test", "test")) for _ in range(2)))
+        assert counts == [3, 3]
+        assert peak == 2
+
     def test_unsubscribe(self):
         bus = EventBus()
 
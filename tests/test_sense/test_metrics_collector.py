@@ -133,6 +133,28 @@ class TestMetricsCollector:
         latest = collector.get_latest("test", 10)
         assert len(latest) == 5
 
+    def test_aggregated_window_and_tags(self):
+        import time
+        collector = MetricsCollector()
+        collector.record("latency", 0.0)
+        collector._metrics["latency"][0].timestamp = time.time() - 600
+        for value, endpoint in ((3.0, "/a"), (-1.0, "/b"), (7.0, "/a"), (2.0, "/a")):
+            collector.record("latency", value, {"endpoint": endpoint})
+
+        stats = collector.get_aggregated("latency", timedelta(minutes=5))
+        assert (stats.count, stats.sum, stats.min, stats.max) == (4, 11.0, -1.0, 7.0)
+        tagged = collector.get_aggregated("latency", timedelta(minutes=5), {"endpoint": "/a"})
+        assert (tagged.count, tagged.min, tagged.max, tagged.avg) == (3, 2.0, 7.0, 4.0)
+        assert collector.get_aggregated("latency", timedelta(minutes=5), {"endpoint": "/c"}) is None
+
+    def test_record_evicts_expired_points(self):
+        import time
+        collector = MetricsCollector(retention_seconds=60)
+        collector.record("m", 1.0)
+        collector._metrics["m"][0].timestamp = time.time() - 120
+        collector.record("m", 2.0)
+        assert [m.value for m in collector.get_latest("m", 10)] == [2.0]
+
     def test_aggregated_rate(self):
         collector = MetricsCollector()
         collector.record("test", 1.0)
@@ -76,6 +76,12 @@ class TestRulesEngine:
         assert rules[1].name == "mid"
         assert rules[2].name == "low"
 
+    def test_equal_priority_rules_keep_insertion_order(self):
+        engine = RulesEngine()
+        for name, priority in (("a", 5), ("b", 10), ("c", 5), ("d", 10)):
+            engine.add_rule(Rule(name=name, condition=lambda x: True, action=name, priority=priority))
+        assert [r.name for r in engine.get_rules()] == ["b", "d", "a", "c"]
+
     def test_remove_rule(self):
         engine = RulesEngine()
         engine.add_rule(Rule(name="r1", condition=lambda x: True, action="a1"))
@@ -104,6 +104,16 @@ class TestBrowserProfile:
         assert context["locale"] == "en-US"
         assert context["timezone_id"] == "America/New_York"
 
+    def test_immutable_and_slotted(self):
+        profile = BrowserProfile("ua", 1920, 1080, "en-US", "UTC", "Windows")
+        assert not hasattr(profile, "__dict__")
+        with pytest.raises(AttributeError):
+            profile.locale = "de-DE"
+        # Callers add keys (e.g. proxy) to the context dict, so it stays a fresh dict
+        context = profile.to_playwright_context()
+        context["proxy"] = {"server": "http://p"}
+        assert "proxy" not in profile.to_playwright_context()
+
 
 class TestGoLoginClient:
     """Tests for GoLoginClient"""
@@ -369,3 +379,27 @@ class TestUserAgentManager:
         # Second call should hit cache, not API
         assert mock_get.call_count == 1
         assert p1.user_agent == p2.user_agent
+
+    def test_fallback_ua_candidates_filtered_once(self):
+        manager = UserAgentManager()
+        with patch.object(manager._ua, "_filter_useragents", wraps=manager._ua._filter_useragents) as spy:
+            agents = {manager.get_random_profile().user_agent for _ in range(20)}
+            chrome = manager.get_chrome_profile()
+        assert spy.call_count == 2
+        assert agents <= set(manager._ua_candidates[None])
+        assert chrome.user_agent in manager._ua_candidates[("Chrome", "Chrome Mobile", "Chrome Mobile iOS")]
+
+    def test_fake_useragent_dataset_shared(self):
+        assert UserAgentManager()._ua is UserAgentManager()._ua
+
+    def test_fallback_ua_without_filter_internals(self):
+        class PublicOnlyUserAgent:
+            random = "Mozilla/5.0 (X11; Linux x86_64) Firefox/120.0"
+
+            def __getitem__(self, browsers):
+                return "Mozilla/5.0 (Windows NT 10.0) Chrome/120.0"
+
+        manager = UserAgentManager()
+        manager._ua = PublicOnlyUserAgent()
+        assert manager.get_random_profile().platform == "Linux x86_64"
+        assert "Chrome" in manager.get_chrome_profile().user_agent
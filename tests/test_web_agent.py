@@ -56,11 +56,15 @@ class TestAgentConfig:
 class TestWebAgent:
     """Tests for WebAgent"""
 
-    def test_initialization_no_proxy(self):
-        agent = WebAgent()
-        assert agent.proxy_manager is None
-        assert agent.ua_manager is not None
-        assert agent.is_closed is False
+    @pytest.fixture(scope="class")
+    def shared_agent(self):
+        """One no-proxy agent for the read-only tests below (none close it)"""
+        return WebAgent()
+
+    def test_initialization_no_proxy(self, shared_agent):
+        assert shared_agent.proxy_manager is None
+        assert shared_agent.ua_manager is not None
+        assert shared_agent.is_closed is False
 
     def test_initialization_with_proxy(self):
         config = AgentConfig(
@@ -79,18 +83,15 @@ class TestWebAgent:
         agent = WebAgent(config)
         assert agent.proxy_manager is None
 
-    def test_is_closed_property(self):
-        agent = WebAgent()
-        assert agent.is_closed is False
+    def test_is_closed_property(self, shared_agent):
+        assert shared_agent.is_closed is False
 
-    def test_get_proxy_stats_no_proxy(self):
-        agent = WebAgent()
-        stats = agent.get_proxy_stats()
+    def test_get_proxy_stats_no_proxy(self, shared_agent):
+        stats = shared_agent.get_proxy_stats()
         assert stats == {}
 
-    def test_get_proxy_health_no_proxy(self):
-        agent = WebAgent()
-        health = agent.get_proxy_health()
+    def test_get_proxy_health_no_proxy(self, shared_agent):
+        health = shared_agent.get_proxy_health()
         assert health == {}
 
 
@@ -142,3 +143,28 @@ class TestWebAgentAsync:
         agent = WebAgent()
         result = await agent.health_check()
         assert result == {}
+
+    @pytest.mark.asyncio
+    async def test_parallel_navigate_merges_content(self):
+        from unittest.mock import AsyncMock
+        from src.browser_worker import WorkerResult
+
+        class FakeWorker:
+            async def navigate(self, url):
+                return WorkerResult(success=True, data={"status": 200, "url": url})
+
+            async def get_content(self):
+                return WorkerResult(success=True, data={"title": "t", "content": "c"})
+
+        agent = WebAgent()
+
+        async def run_parallel(tasks):
+            return [await fn(FakeWorker()) for _, fn in tasks]
+
+        agent.controller.run_parallel = AsyncMock(side_effect=run_parallel)
+        results = await agent.parallel_navigate(["https://a.test", "https://b.test"])
+        task_ids = [tid for tid, _ in agent.controller.run_parallel.call_args.args[0]]
+        assert task_ids == ["nav_0", "nav_1"]
+        assert [r.data["url"] for r in results] == ["https://a.test", "https://b.test"]
+        assert results[0].data["title"] == "t"
+        await agent.cleanup()